@@ -0,0 +1,80 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark columnar aggregation of WWT Constellations scene listings.
+
+Streams synthetic ``SceneInfo`` records into a table of NumPy arrays, then
+compares vectorized aggregations against the equivalent loops over Python
+objects. Run with::
+
+    python benchmarks/bench_columnar.py [--count N]
+"""
+
+import argparse
+import time
+
+from wwt_api_client.constellations.columnar import scene_info_to_numpy
+from wwt_api_client.constellations.compact import CompactSceneInfo
+from wwt_api_client.constellations.data import _decode
+
+
+def iter_scenes(count):
+    # Decode from JSON-style dicts, as when paging through the API
+    for i in range(count):
+        yield _decode(
+            CompactSceneInfo,
+            {
+                "_id": f"{i:024x}",
+                "creation_date": "2023-03-28T16:53:18.364Z",
+                "impressions": 10 * i,
+                "likes": i % 17,
+                "clicks": None if i % 5 == 0 else i % 11,
+                "shares": i % 3,
+                "text": "",
+                "published": i % 4 != 0,
+            },
+        )
+
+
+def python_aggregates(scenes):
+    impressions = sum(s.impressions for s in scenes)
+    clicks = [s.clicks for s in scenes if s.clicks is not None]
+    mean_clicks = sum(clicks) / len(clicks)
+    published_likes = sum(s.likes for s in scenes if s.published)
+    return impressions, mean_clicks, published_likes
+
+
+def numpy_aggregates(table):
+    impressions = table["impressions"].sum()
+    mean_clicks = table["clicks"][table.valid["clicks"]].mean()
+    published_likes = table["likes"][table["published"]].sum()
+    return impressions, mean_clicks, published_likes
+
+
+def timed(label, func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    print(f"{label:>32}: {(time.perf_counter() - t0) * 1e3:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1000000)
+    settings = parser.parse_args()
+
+    table = timed(
+        "stream into NumPy columns", scene_info_to_numpy, iter_scenes(settings.count)
+    )
+    scenes = list(iter_scenes(settings.count))
+
+    expected = timed("aggregate over Python objects", python_aggregates, scenes)
+    actual = timed("aggregate over NumPy columns", numpy_aggregates, table)
+
+    assert expected[0] == actual[0] and expected[2] == actual[2]
+    assert abs(expected[1] - actual[1]) < 1e-9
+
+
+if __name__ == "__main__":
+    main()
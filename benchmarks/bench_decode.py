@@ -0,0 +1,116 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark decoding of WWT Constellations API responses.
+
+Compares the precompiled decoders in ``wwt_api_client.constellations.data``
+against the generic ``dataclass_json`` / marshmallow path, and against lazy
+decoding where only top-level fields are read, using a synthetic timeline page
+of hydrated scenes. Run with::
+
+    python benchmarks/bench_decode.py [--scenes N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from wwt_api_client.constellations.data import (
+    SceneHydrated,
+    _decode,
+    _decode_lazy_scene,
+)
+
+
+def make_image(i):
+    return {
+        "id": f"{i:024x}",
+        "wwt": {
+            "base_degrees_per_tile": 0.1,
+            "bottoms_up": False,
+            "center_x": 10.0 + i,
+            "center_y": -5.0,
+            "file_type": ".png",
+            "offset_x": 0,
+            "offset_y": 0,
+            "projection": "tan",
+            "quad_tree_map": "",
+            "rotation": 0.0,
+            "tile_levels": 4,
+            "width_factor": 2,
+            "thumbnail_url": "https://example.com/thumb.jpg",
+        },
+        "permissions": {
+            "copyright": "Copyright Someone",
+            "license": "CC-BY-4.0",
+            "credits": "<strong>Someone</strong>",
+        },
+        "storage": {"legacy_url_template": f"https://example.com/{i}/{{1}}/{{2}}"},
+    }
+
+
+def make_scene(i):
+    return {
+        "id": f"{i:024x}",
+        "handle_id": "0123456789abcdef01234567",
+        "handle": {"handle": "bench", "display_name": "Benchmark"},
+        "creation_date": "2023-03-28T16:53:18.364Z",
+        "likes": i,
+        "liked": False,
+        "impressions": 10 * i,
+        "clicks": None,
+        "shares": 2,
+        "place": {
+            "ra_rad": 1.0,
+            "dec_rad": 0.5,
+            "roll_rad": 0.0,
+            "roi_height_deg": 1.0,
+            "roi_aspect_ratio": 1.5,
+        },
+        "content": {
+            "background": make_image(i),
+            "image_layers": [{"image": make_image(i + 1), "opacity": 1}],
+        },
+        "text": f"Scene number {i}",
+        "previews": {"thumbnail": "https://example.com/preview.jpg"},
+        "published": True,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenes", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    settings = parser.parse_args()
+
+    page = [make_scene(i) for i in range(settings.scenes)]
+
+    def schema_path():
+        return [SceneHydrated.schema().load(s) for s in page]
+
+    def fast_path():
+        return [_decode(SceneHydrated, s) for s in page]
+
+    def lazy_path():
+        # Typical read-mostly access: only top-level fields
+        scenes = [_decode_lazy_scene(s) for s in page]
+
+        for s in scenes:
+            s.id, s.text, s.place, s.likes
+
+        return scenes
+
+    assert schema_path() == fast_path() == lazy_path()
+
+    for name, func in [
+        ("schema().load", schema_path),
+        ("_decode", fast_path),
+        ("lazy", lazy_path),
+    ]:
+        best = min(timeit.repeat(func, number=1, repeat=settings.repeat))
+        per_scene = 1e6 * best / settings.scenes
+        print(f"{name:>14}: {best * 1e3:8.2f} ms/page  {per_scene:8.1f} us/scene")
+
+
+if __name__ == "__main__":
+    main()
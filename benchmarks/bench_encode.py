@@ -0,0 +1,120 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark encoding of WWT Constellations request bodies.
+
+Compares the single-pass encoder in ``wwt_api_client.constellations.data``,
+which omits None-valued fields as it builds the payload, against the two-pass
+``_strip_nulls_in_place(obj.to_dict())`` approach, for a batch of scene and
+image creation requests. Both are encoded all the way to request bytes. Run
+with::
+
+    python benchmarks/bench_encode.py [--count N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from wwt_api_client.constellations.data import (
+    ImageContentPermissions,
+    ImageStorage,
+    ImageWwt,
+    SceneContent,
+    SceneImageLayer,
+    ScenePlace,
+    SceneUpdate,
+    _strip_nulls_in_place,
+)
+from wwt_api_client.constellations.handles import AddImageRequest, AddSceneRequest
+from wwt_api_client.constellations.serialization import (
+    _encode_body,
+    get_json_backend,
+)
+
+
+def make_requests(count):
+    reqs = []
+
+    for i in range(count):
+        reqs.append(
+            AddImageRequest(
+                wwt=ImageWwt(
+                    base_degrees_per_tile=0.1,
+                    bottoms_up=False,
+                    center_x=10.0 + i,
+                    center_y=-5.0,
+                    file_type=".png",
+                    offset_x=0,
+                    offset_y=0,
+                    projection="tan",
+                    quad_tree_map="",
+                    rotation=0.0,
+                    tile_levels=4,
+                    width_factor=2,
+                    thumbnail_url="https://example.com/thumb.jpg",
+                ),
+                permissions=ImageContentPermissions(
+                    copyright="Copyright Someone",
+                    license="CC-BY-4.0",
+                ),
+                storage=ImageStorage(
+                    legacy_url_template=f"https://example.com/{i}/{{1}}/{{2}}"
+                ),
+                note=f"Image {i}",
+            )
+        )
+        reqs.append(
+            AddSceneRequest(
+                place=ScenePlace(0.1 * i, 0.2, 0.0, 1.0, 1.5),
+                content=SceneContent(
+                    image_layers=[
+                        SceneImageLayer(image_id=f"{j:024x}", opacity=1.0)
+                        for j in range(4)
+                    ]
+                ),
+                text=f"Scene {i}",
+                published=True,
+            )
+        )
+        reqs.append(SceneUpdate(text=f"Updated scene {i}"))
+
+    return reqs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    settings = parser.parse_args()
+
+    reqs = make_requests(settings.count)
+
+    for name in ["json", "orjson"]:
+        try:
+            backend = get_json_backend(name)
+        except ValueError:
+            print(f"note: {name} is not installed; skipping")
+            continue
+
+        def two_pass():
+            return [backend.dumps(_strip_nulls_in_place(r.to_dict())) for r in reqs]
+
+        def single_pass():
+            return [_encode_body(backend, r) for r in reqs]
+
+        assert two_pass() == single_pass()
+
+        t_old = timeit.timeit(two_pass, number=settings.repeat)
+        t_new = timeit.timeit(single_pass, number=settings.repeat)
+        scale = 1e6 / (settings.repeat * len(reqs))
+
+        print(
+            f"{name:>8}: two-pass {t_old * scale:7.2f} us/request, "
+            f"single-pass {t_new * scale:7.2f} us/request "
+            f"({t_old / t_new:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
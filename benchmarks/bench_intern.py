@@ -0,0 +1,101 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark interned decoding of WWT Constellations timelines.
+
+Decodes a synthetic crawl of timeline pages in which scenes come from a few
+handles and use a few builtin backgrounds, as on the real home timeline, with
+and without an ``Interner``. Reports decoding time and the memory retained by
+the decoded scenes. Run with::
+
+    python benchmarks/bench_intern.py [--pages N] [--page-size S]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from wwt_api_client.constellations import _decode_timeline
+from wwt_api_client.constellations.data import Interner
+
+from bench_decode import make_image, make_scene
+
+N_HANDLES = 5
+N_BACKGROUNDS = 8
+
+
+def make_pages(n_pages, page_size):
+    backgrounds = [make_image(1000000 + i) for i in range(N_BACKGROUNDS)]
+    pages = []
+
+    for p in range(n_pages):
+        page = []
+
+        for i in range(p * page_size, (p + 1) * page_size):
+            scene = make_scene(i)
+            h = i % N_HANDLES
+            scene["handle_id"] = f"{h:024x}"
+            scene["handle"] = {"handle": f"handle{h}", "display_name": f"Handle {h}"}
+            scene["content"]["background"] = backgrounds[i % N_BACKGROUNDS]
+            page.append(scene)
+
+        pages.append(page)
+
+    return pages
+
+
+def decode_crawl(pages, interner):
+    scenes = []
+
+    for page in pages:
+        scenes += _decode_timeline({"results": page}, False, interner)
+
+    return scenes
+
+
+def measure(pages, make_interner):
+    elapsed = min(
+        timeit.repeat(lambda: decode_crawl(pages, make_interner()), number=1, repeat=5)
+    )
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    scenes = decode_crawl(pages, make_interner())
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return scenes, elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=100)
+    settings = parser.parse_args()
+
+    pages = make_pages(settings.pages, settings.page_size)
+    n = settings.pages * settings.page_size
+
+    plain, t_plain, m_plain = measure(pages, lambda: None)
+    interned, t_interned, m_interned = measure(pages, Interner)
+    assert plain == interned
+
+    for label, t, m in [
+        ("plain", t_plain, m_plain),
+        ("interned", t_interned, m_interned),
+    ]:
+        print(
+            f"{label:>9}: {1e6 * t / n:7.1f} us/scene, "
+            f"{m / n:8.0f} B/scene retained"
+        )
+
+    print(
+        f"interning is {t_plain / t_interned:.1f}x faster and uses "
+        f"{100 * (1 - m_interned / m_plain):.0f}% less memory"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark the JSON backends used for WWT Constellations API traffic.
+
+Parses a synthetic timeline page of hydrated scenes from its raw response bytes,
+and encodes it back to bytes, with each available backend in
+``wwt_api_client.constellations.serialization``. Run with::
+
+    python benchmarks/bench_json.py [--scenes N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from wwt_api_client.constellations.serialization import (
+    _parse_response,
+    get_json_backend,
+)
+
+from bench_decode import make_scene
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    settings = parser.parse_args()
+
+    backends = [get_json_backend("json")]
+
+    try:
+        backends.append(get_json_backend("orjson"))
+    except ValueError:
+        print("note: orjson is not installed; only benchmarking the stdlib")
+
+    payload = {
+        "error": False,
+        "results": [make_scene(i) for i in range(settings.scenes)],
+    }
+    content = backends[0].dumps(payload)
+    print(f"timeline page: {settings.scenes} scenes, {len(content)} bytes")
+
+    baseline = None
+
+    for backend in backends:
+        assert _parse_response(backend, content) == {"results": payload["results"]}
+
+        t_parse = timeit.timeit(
+            lambda: _parse_response(backend, content), number=settings.repeat
+        )
+        t_encode = timeit.timeit(lambda: backend.dumps(payload), number=settings.repeat)
+        t_parse *= 1e3 / settings.repeat
+        t_encode *= 1e3 / settings.repeat
+
+        if baseline is None:
+            baseline = (t_parse, t_encode)
+
+        print(
+            f"{backend.name:>8}: parse {t_parse:8.2f} ms "
+            f"({baseline[0] / t_parse:4.1f}x), "
+            f"encode {t_encode:8.2f} ms ({baseline[1] / t_encode:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark the cost of SPDX license handling in WWT Constellations data classes.
+
+Measures how long ``import wwt_api_client.constellations`` takes in a fresh
+interpreter, how long the license index takes to build on first use, and the
+cost of validating the same license expression repeatedly with and without
+memoization. Run with::
+
+    python benchmarks/bench_licensing.py [--count N] [--baseline DIR]
+
+If *DIR* is given, it should contain another version of the package, such as a
+``git worktree`` of an earlier commit. The import time of that version is
+measured as well, so that regressions in import time can be spotted.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+IMPORT_CODE = """
+import time
+t0 = time.perf_counter()
+import wwt_api_client.constellations
+print(time.perf_counter() - t0)
+"""
+
+
+def report(label, seconds):
+    print(f"{label:>40}: {seconds * 1e3:8.1f} ms")
+
+
+def time_import(path=None):
+    env = dict(os.environ)
+
+    if path is not None:
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in [os.path.abspath(path), env.get("PYTHONPATH")] if p
+        )
+
+    # Run from a neutral directory, so that the package in the current
+    # directory doesn't shadow the one being measured
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_CODE], text=True, env=env, cwd=os.sep
+    )
+    return float(output.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--baseline", metavar="DIR")
+    settings = parser.parse_args()
+
+    # Alternate between the versions, so that both see the same system noise
+    import_times = []
+    baseline_times = []
+
+    for _ in range(settings.repeat):
+        import_times.append(time_import())
+
+        if settings.baseline is not None:
+            baseline_times.append(time_import(settings.baseline))
+
+    report("import wwt_api_client.constellations", min(import_times))
+
+    if baseline_times:
+        report("... baseline", min(baseline_times))
+        report("... difference", min(import_times) - min(baseline_times))
+
+    from wwt_api_client.constellations import data
+
+    t0 = time.perf_counter()
+    licensing = data._get_licensing()
+    report("build license index on first use", time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(settings.count):
+        licensing.validate("CC-BY-4.0", strict=True)
+    raw = time.perf_counter() - t0
+
+    data._license_errors.cache_clear()
+    t0 = time.perf_counter()
+    for _ in range(settings.count):
+        data._license_errors("CC-BY-4.0")
+    memo = time.perf_counter() - t0
+
+    report(f"{settings.count} validations, uncached", raw)
+    report(f"{settings.count} validations, memoized", memo)
+
+
+if __name__ == "__main__":
+    main()
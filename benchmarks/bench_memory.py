@@ -0,0 +1,84 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark the memory used by WWT Constellations data objects.
+
+Decodes synthetic ``SceneInfo``, ``ImageSummary`` and ``SceneHydrated`` records
+into the standard data classes and their compact variants, and reports the
+memory allocated per object as measured by ``tracemalloc``. Run with::
+
+    python benchmarks/bench_memory.py [--count N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from wwt_api_client.constellations.compact import compact_class
+from wwt_api_client.constellations.data import (
+    ImageSummary,
+    SceneHydrated,
+    SceneInfo,
+    _decode,
+)
+
+from bench_decode import make_scene
+
+
+def make_scene_info(i):
+    return {
+        "_id": f"{i:024x}",
+        "creation_date": "2023-03-28T16:53:18.364Z",
+        "impressions": 10 * i,
+        "likes": i,
+        "clicks": None,
+        "shares": i % 7,
+        "text": f"Scene number {i}",
+        "published": True,
+    }
+
+
+def make_image_summary(i):
+    return {
+        "_id": f"{i:024x}",
+        "handle_id": "0123456789abcdef01234567",
+        "creation_date": "2023-03-28T16:53:18.364Z",
+        "note": f"Image number {i}",
+        "storage": {"legacy_url_template": f"https://example.com/{i}/{{1}}/{{2}}"},
+    }
+
+
+def measure(cls, records):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [_decode(cls, r) for r in records]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20000)
+    settings = parser.parse_args()
+
+    for cls, make in [
+        (SceneInfo, make_scene_info),
+        (ImageSummary, make_image_summary),
+        (SceneHydrated, make_scene),
+    ]:
+        records = [make(i) for i in range(settings.count)]
+        regular = measure(cls, records)
+        compact = measure(compact_class(cls), records)
+        saved = 100 * (1 - compact / regular)
+        print(
+            f"{cls.__name__:>14}: {regular:8.0f} B/object regular, "
+            f"{compact:8.0f} B/object compact ({saved:.0f}% smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark syncing a local mirror of a WWT Constellations handle.
+
+Serves the image info of a synthetic handle from memory, in place of the API,
+and reports the number of page fetches and the time needed for an initial sync
+of a ``HandleMirror``, a resync when nothing has changed, and a resync after a
+few new images have been added. Run with::
+
+    python benchmarks/bench_mirror.py [--images N]
+"""
+
+import argparse
+import os.path
+import tempfile
+import time
+
+from wwt_api_client.constellations import ClientConfig, CxClient
+from wwt_api_client.constellations.mirror import HandleMirror
+
+from bench_decode import make_image
+
+
+def make_summaries(start, stop):
+    summaries = []
+
+    for i in reversed(range(start, stop)):
+        image = make_image(i)
+        summaries.append(
+            {
+                "_id": image["id"],
+                "handle_id": "89abcdef0123456789abcdef",
+                "creation_date": f"2023-01-01T00:00:00.{i:09d}Z",
+                "note": f"Image {i}",
+                "storage": image["storage"],
+            }
+        )
+
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=50000)
+    settings = parser.parse_args()
+
+    images = make_summaries(0, settings.images)
+    client = CxClient(
+        ClientConfig(
+            id_provider_url="http://idp.invalid", client_id="bench", api_url="http://x"
+        )
+    )
+
+    def fake_send_and_parse(rel_url, http_method="POST", params=None, **kwargs):
+        n = params["pagesize"]
+        page = images[params["page"] * n : (params["page"] + 1) * n]
+        return {"total_count": len(images), "results": page}
+
+    client._send_and_parse = fake_send_and_parse
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mirror = HandleMirror(
+            client.handle_client("bench"), os.path.join(tmpdir, "mirror.sqlite")
+        )
+
+        for label in ["initial sync", "unchanged", "5 new images"]:
+            if label == "5 new images":
+                images[:0] = make_summaries(settings.images, settings.images + 5)
+
+            t0 = time.perf_counter()
+            stats = mirror.sync(["image_info"])
+            elapsed = time.perf_counter() - t0
+            print(
+                f"{label:>13}: {stats.pages:4d} pages, {stats.stored:6d} stored, "
+                f"{elapsed * 1e3:8.1f} ms"
+            )
+
+        t0 = time.perf_counter()
+        n = sum(1 for _ in mirror.iter_image_info())
+        elapsed = time.perf_counter() - t0
+        print(f"local listing of {n} images: {elapsed * 1e3:.1f} ms")
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Benchmark streaming decoding of WWT Constellations timeline pages.
+
+Compares the peak memory used while processing a page of fully hydrated
+scenes when the whole response is parsed and decoded at once, versus when it
+is parsed incrementally and each scene is decoded and discarded in turn. Run
+with::
+
+    python benchmarks/bench_stream.py [--scenes N]
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+from wwt_api_client.constellations import _decode_scene, _decode_timeline
+from wwt_api_client.constellations.serialization import (
+    _iter_response_items,
+    _parse_response,
+    get_json_backend,
+    ijson,
+)
+
+from bench_decode import make_scene
+
+
+def whole_page(backend, content):
+    scenes = _decode_timeline(_parse_response(backend, content), False)
+    return sum(s.likes for s in scenes)
+
+
+def streamed(backend, content):
+    items = _iter_response_items(backend, io.BytesIO(content))
+    return sum(_decode_scene(item, False).likes for item in items)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenes", type=int, default=100)
+    settings = parser.parse_args()
+
+    if ijson is None:
+        print("note: ijson is not installed, so streaming can't save memory")
+
+    backend = get_json_backend()
+    payload = {
+        "error": False,
+        "results": [make_scene(i) for i in range(settings.scenes)],
+    }
+    content = backend.dumps(payload)
+    del payload
+    print(f"timeline page: {settings.scenes} scenes, {len(content)} bytes")
+
+    # Warm up the decoders and licensing index outside of the measurements
+    whole_page(backend, content)
+
+    expected = None
+
+    for label, func in [("whole page", whole_page), ("streamed", streamed)]:
+        result, elapsed, peak = measure(func, backend, content)
+        assert expected is None or result == expected
+        expected = result
+        print(f"{label:>10}: {peak / 1024:8.0f} KiB peak, {elapsed * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
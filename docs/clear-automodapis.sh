@@ -13,12 +13,20 @@ cd "$apidir"
 for f in *.rst; do
     case "$f" in
     wwt_api_client.rst|\
+    wwt_api_client.caching.rst|\
     wwt_api_client.communities.rst|\
     wwt_api_client.constellations.rst|\
+    wwt_api_client.constellations.aio.rst|\
+    wwt_api_client.constellations.columnar.rst|\
+    wwt_api_client.constellations.compact.rst|\
     wwt_api_client.constellations.data.rst|\
     wwt_api_client.constellations.handles.rst|\
+    wwt_api_client.constellations.httpcache.rst|\
     wwt_api_client.constellations.images.rst|\
+    wwt_api_client.constellations.mirror.rst|\
     wwt_api_client.constellations.scenes.rst|\
+    wwt_api_client.constellations.serialization.rst|\
+    wwt_api_client.constellations.transport.rst|\
     wwt_api_client.enums.rst) ;;
 
     *) rm -f "$f"
@@ -41,6 +41,7 @@ intersphinx_mapping = {
         "https://docs.python.org/3/",
         (None, "http://data.astropy.org/intersphinx/python3.inv"),
     ),
+    "numpy": ("https://numpy.org/doc/stable/", None),
     "requests": ("https://requests.readthedocs.io/en/stable/", None),
     "wwt_data_formats": ("https://wwt-data-formats.readthedocs.io/en/stable/", None),
 }
@@ -68,9 +68,23 @@ setup_args = dict(
         "license-expression >=21.6",
         "openidc_client >=0.6",
         "requests >=2.10",
+        "traitlets >=4",
         "wwt_data_formats >=0.16",
     ],
     extras_require={
+        "async": [
+            "httpx >=0.23",
+        ],
+        "columnar": [
+            "numpy >=1.20",
+            "pyarrow >=6",
+        ],
+        "fast-json": [
+            "orjson >=3",
+        ],
+        "streaming": [
+            "ijson >=3.1",
+        ],
         "test": [
             "httpretty",
             "mock",
@@ -7,6 +7,8 @@ from urllib import parse as url_parse
 from xml.sax.saxutils import escape as xml_escape
 import warnings
 
+from .caching import DiskCache
+
 __all__ = """
 APIRequest
 APIResponseError
@@ -54,18 +56,40 @@ class Client(object):
        "http://www.worldwidetelescope.org". The API base is configurable to
        make it possible to access testing servers, etc. This value should not
        end in a slash.
+    cache_path : path string or None
+       If specified, the results of :ref:`ShowImage <endpoint-ShowImage>` and
+       :ref:`TileImage <endpoint-TileImage>` requests are saved in an SQLite
+       database at this path, and repeated requests with the same parameters
+       return the saved results rather than contacting the server. The
+       TileImage API is expensive, since the server must download and tile the
+       image each time, so this can save a great deal of time. Defaults to
+       None, meaning that no cache is kept.
+    cache_ttl : number or None
+       If specified, cached results expire after this many seconds. Defaults to
+       None, meaning that they never expire.
+    cache_max_entries : int
+       The maximum number of results to cache. Once it is exceeded, the
+       least-recently-used results are discarded. Defaults to 10,000.
 
     """
 
     _api_base = None
     _session = None
+    _cache = None
 
-    def __init__(self, api_base=None):
+    def __init__(
+        self, api_base=None, cache_path=None, cache_ttl=None, cache_max_entries=10000
+    ):
         if api_base is None:
             api_base = DEFAULT_API_BASE
 
         self._api_base = api_base
 
+        if cache_path is not None:
+            self._cache = DiskCache(
+                cache_path, max_entries=cache_max_entries, ttl=cache_ttl
+            )
+
     @property
     def session(self):
         """A ``requests.Session`` object used to talk to the WWT API server."""
@@ -74,6 +98,12 @@ class Client(object):
 
         return self._session
 
+    @property
+    def cache(self):
+        """The :class:`~wwt_api_client.caching.DiskCache` holding the results of
+        cached requests, or None if caching is disabled."""
+        return self._cache
+
     def login(
         self,
         user_guid="00000000-0000-0000-0000-000000000000",
@@ -317,6 +347,21 @@ def _is_scalar(obj, none_ok=False):
     )  # math.isfinite() only available in 3.x
 
 
+def _normalize_request_url(url):
+    """Normalize the URL of a prepared request for use as a cache key.
+
+    The scheme and host are case-insensitive, and the order of the query
+    parameters doesn't matter.
+
+    """
+    parts = url_parse.urlsplit(url)
+    query = url_parse.parse_qsl(parts.query, keep_blank_values=True)
+    query = url_parse.urlencode(sorted(query))
+    return url_parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+
+
 class APIRequest(object):
     """A base class represent various WWT API requests.
 
@@ -337,6 +382,10 @@ class APIRequest(object):
 
     _client = None
 
+    _cacheable = False
+    """Whether the results of this kind of request may be saved in the client's
+    cache. If so, the request's processed result must be its response text."""
+
     def __init__(self, client):
         self._client = client
 
@@ -392,7 +441,7 @@ class APIRequest(object):
         return it as text."""
         return resp.text
 
-    def send(self, raw_response=False):
+    def send(self, raw_response=False, refresh=False):
         """Issue the request and return its result.
 
         The request’s validity will be checked before sending.
@@ -410,7 +459,11 @@ class APIRequest(object):
         ----------
         raw_response : bool, optional, default False
             If True, the raw ``requests`` response will be returned rather than
-            the processed version.
+            the processed version. The server is always contacted in this case.
+        refresh : bool, optional, default False
+            If True, and the client has a cache, the server is contacted even
+            if this request's result has been cached, and the cached result is
+            replaced with the new one.
 
         Returns
         -------
@@ -430,10 +483,24 @@ class APIRequest(object):
         if invalid is not None:
             raise InvalidRequestError(invalid)
 
-        resp = self._client.session.send(self.make_request().prepare())
+        prepared = self.make_request().prepare()
+        cache = self._client._cache if self._cacheable else None
+
+        if cache is not None:
+            key = _normalize_request_url(prepared.url)
+
+            if not (raw_response or refresh):
+                text = cache.get(key)
+                if text is not None:
+                    return text
+
+        resp = self._client.session.send(prepared)
         if not resp.ok:
             raise APIResponseError(resp.text)
 
+        if cache is not None:
+            cache.put(key, resp.text)
+
         if raw_response:
             return resp
         return self._process_response(resp)
@@ -522,6 +589,8 @@ class ShowImageRequest(APIRequest):
 
     """
 
+    _cacheable = True
+
     credits = None
     "Free text describing where the image came from."
 
@@ -702,6 +771,8 @@ class TileImageRequest(APIRequest):
 
     """
 
+    _cacheable = True
+
     credits = None
     "Free text describing where the image came from."
 
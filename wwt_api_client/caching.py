@@ -0,0 +1,265 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Simple caches used to avoid repeating expensive WWT web service calls.
+
+:class:`LRUCache` is an in-memory, size-bounded cache with optional entry
+expiration. :class:`DiskCache` is a persistent cache backed by an SQLite
+database file, with the same expiration and eviction behaviors. Both are safe
+to use from multiple threads.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import os.path
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+__all__ = """
+CacheStats
+DiskCache
+LRUCache
+""".split()
+
+
+@dataclass
+class CacheStats:
+    """
+    Statistics about the usage of a cache.
+    """
+
+    hits: int
+    "The number of lookups that found a valid entry."
+
+    misses: int
+    "The number of lookups that did not find a valid entry."
+
+    entries: int
+    "The number of entries currently stored in the cache."
+
+
+class LRUCache:
+    """
+    An in-memory cache that discards its least-recently-used entries once it
+    grows too large.
+
+    Parameters
+    ----------
+    max_entries : int
+        The maximum number of entries to hold.
+    ttl : optional float
+        If specified, entries expire this many seconds after they are stored.
+        If None, entries never expire.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key => (expiration time, value)
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry in the cache.
+
+        Returns *default* if there is no valid entry for *key*.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store an entry in the cache.
+
+        If *ttl* is specified, it overrides the cache's default expiration time
+        for this entry.
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        expires_at = None if ttl is None else time.time() + ttl
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """
+        Remove an entry from the cache, if it exists.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Get statistics about this cache's usage.
+
+        Returns
+        -------
+        A :class:`CacheStats` object.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits, misses=self._misses, entries=len(self._entries)
+            )
+
+
+class DiskCache:
+    """
+    A persistent cache of text values, stored in an SQLite database file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the database file. It will be created if it does not exist.
+    max_entries : optional int
+        The maximum number of entries to hold. Once it is exceeded, the
+        least-recently-used entries are evicted. Defaults to 10,000.
+    ttl : optional float
+        If specified, entries expire this many seconds after they are stored.
+        If None, entries never expire.
+    """
+
+    def __init__(
+        self, path: str, max_entries: int = 10000, ttl: Optional[float] = None
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        # Imported here to keep importing this module fast
+        import sqlite3
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "expires_at REAL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+            )
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Look up an entry in the cache.
+
+        Returns *default* if there is no valid entry for *key*.
+        """
+        now = time.time()
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def put(self, key: str, value: str, ttl: Optional[float] = None):
+        """
+        Store an entry in the cache.
+
+        If *ttl* is specified, it overrides the cache's default expiration time
+        for this entry.
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, key: str):
+        """
+        Remove an entry from the cache, if it exists.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def stats(self) -> CacheStats:
+        """
+        Get statistics about this cache's usage.
+
+        Returns
+        -------
+        A :class:`CacheStats` object.
+        """
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return CacheStats(hits=self._hits, misses=self._misses, entries=n)
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._conn.close()
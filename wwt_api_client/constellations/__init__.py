@@ -21,33 +21,87 @@ You'll probably wish to use one of the following values:
 - ``http://localhost:7000`` for a standard local testing environment
 """
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
+import functools
+import json
 import os
+import requests
 from requests import RequestException, Response
-from typing import List, Optional
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+import urllib.parse
 
 from openidc_client import OpenIDCClient
 
-from .data import ImageSummary, SceneHydrated, _strip_nulls_in_place
+from .data import (
+    ImageSummary,
+    Interner,
+    SceneHydrated,
+    _decode,
+    _decode_lazy_scene,
+)
+
+# The client's supporting modules, and the libraries that they use, are imported
+# where they're needed, so that importing this package stays fast.
+if TYPE_CHECKING:
+    from wwt_data_formats.folder import Folder
+
+    from ..caching import CacheStats, DiskCache, LRUCache
+    from .httpcache import (
+        HttpCacheStats,
+        MetadataCacheConfig,
+        _HttpCache,
+        _MetadataCache,
+    )
+    from .serialization import JsonBackend
+    from .transport import (
+        PoolStats,
+        RetryPolicy,
+        TransportConfig,
+        _CircuitBreaker,
+        _PooledAdapter,
+        _SingleFlight,
+    )
 
 __all__ = """
 ClientConfig
 CxClient
+TokenStats
 """.split()
 
+T = TypeVar("T")
+
 
 @dataclass
 class ClientConfig:
     """
     Configuration settings for a WWT Constellations client.
 
-    These influence which instance of the API the client actually connects to.
+    These influence which instance of the API the client actually connects to,
+    and optionally how it manages its HTTP connections.
     """
 
     id_provider_url: str
     client_id: str
     api_url: str
+    transport: Optional["TransportConfig"] = None
+    retry: Optional["RetryPolicy"] = None
 
     @classmethod
     def new_default(cls) -> "ClientConfig":
@@ -175,12 +229,389 @@ class TimelineResponse:
 BuiltinBackgroundsResponse = FindImagesByLegacyResponse
 
 
+def _decode_timeline(
+    resp: dict, lazy: bool, interner: Optional[Interner] = None
+) -> List[SceneHydrated]:
+    if lazy:
+        return [_decode_lazy_scene(s, interner=interner) for s in resp["results"]]
+
+    return _decode(TimelineResponse, resp, interner=interner).results
+
+
+def _decode_scene(
+    data: dict, lazy: bool, interner: Optional[Interner] = None
+) -> SceneHydrated:
+    if lazy:
+        return _decode_lazy_scene(data, interner=interner)
+
+    return _decode(SceneHydrated, data, interner=interner)
+
+
 # I think this is unlikely to ever need to be configurable?
 _ID_PROVIDER_MAPPING = {
     "Authorization": "/protocol/openid-connect/auth",
     "Token": "/protocol/openid-connect/token",
 }
 
+_DEFAULT_SCOPES = ["profile", "offline_access"]
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _coalescing_key(rel_url: str, kwargs: dict) -> Optional[tuple]:
+    """
+    Compute a key identifying a request to be sent with
+    :meth:`CxClient._send_and_check`, or None if it cannot be computed.
+
+    Every argument that affects the request is part of the key, so that calls
+    made with different scopes or headers are never merged.
+    """
+    kwargs = dict(kwargs)
+    kwargs["http_method"] = kwargs.get("http_method", "POST").upper()
+    kwargs["scopes"] = tuple(sorted(kwargs.get("scopes", _DEFAULT_SCOPES)))
+    kwargs.pop("idempotent", None)
+
+    headers = kwargs.get("headers")
+    if headers:
+        kwargs["headers"] = {k.lower(): v for k, v in headers.items()}
+
+    key = ("parse", rel_url, _freeze(kwargs))
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+def _check_page_num(page_num) -> int:
+    try:
+        use_page_num = int(page_num)
+        assert use_page_num >= 0
+    except Exception:
+        raise ValueError(f"invalid page_num argument {page_num!r}")
+
+    return use_page_num
+
+
+def _check_page_size(page_size) -> int:
+    try:
+        use_page_size = int(page_size)
+        assert use_page_size >= 1 and use_page_size <= 100
+    except Exception:
+        raise ValueError(f"invalid page_size argument {page_size!r}")
+
+    return use_page_size
+
+
+def _iter_paginated(fetch_page: Callable, page_size: int, prefetch: bool) -> Iterator:
+    """
+    Iterate over all of the items of a paginated API.
+
+    *fetch_page* is called with a page number and should return an object with
+    ``total_count`` and ``results`` attributes. If *prefetch* is true, page N+1
+    is fetched in a background thread while the caller processes the items of
+    page N.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page_num = 0
+        page = fetch_page(page_num)
+
+        while True:
+            n_pages = (page.total_count + page_size - 1) // page_size
+            has_next = bool(page.results) and page_num + 1 < n_pages
+            future = None
+
+            if has_next and prefetch:
+                future = executor.submit(fetch_page, page_num + 1)
+
+            for item in page.results:
+                yield item
+
+            if not has_next:
+                return
+
+            page_num += 1
+
+            if future is not None:
+                page = future.result()
+            else:
+                page = fetch_page(page_num)
+
+
+def _crawl_timeline(
+    fetch_page: Callable[[int], List[SceneHydrated]],
+    max_workers: int,
+    max_pages: Optional[int],
+) -> Iterator[SceneHydrated]:
+    """
+    Iterate over the scenes of a timeline API, fetching up to *max_workers*
+    pages in parallel.
+
+    Scenes are yielded in timeline order. Because the timeline can shift while
+    it is being crawled, the same scene may appear on more than one page; only
+    the first appearance of each scene ID is yielded. Crawling stops at the
+    first empty page, or after *max_pages* pages if that is not None.
+    """
+    try:
+        use_max_workers = int(max_workers)
+        assert use_max_workers >= 1
+    except Exception:
+        raise ValueError(f"invalid max_workers argument {max_workers!r}")
+
+    seen_ids = set()
+    pending = deque()
+    next_page_num = 0
+
+    with ThreadPoolExecutor(max_workers=use_max_workers) as executor:
+        try:
+            while True:
+                while len(pending) < use_max_workers and (
+                    max_pages is None or next_page_num < max_pages
+                ):
+                    pending.append(executor.submit(fetch_page, next_page_num))
+                    next_page_num += 1
+
+                if not pending:
+                    return
+
+                page = pending.popleft().result()
+                if not page:
+                    return
+
+                for scene in page:
+                    if scene.id not in seen_ids:
+                        seen_ids.add(scene.id)
+                        yield scene
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _normalize_wwt_url(url: str) -> str:
+    """
+    Normalize a legacy WWT data URL for use as a cache key. The scheme and host
+    are case-insensitive; everything else is left alone, since the URLs are
+    often templates.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    return urllib.parse.urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path,
+            parts.query,
+            parts.fragment,
+        )
+    )
+
+
+def _copy_wtml(obj):
+    """
+    Make a deep copy of a parsed WTML object, such as a Folder. The objects
+    don't support :func:`copy.deepcopy`, and copying their trait values
+    directly is much faster than parsing the XML again.
+    """
+    from traitlets import HasTraits
+
+    if isinstance(obj, list):
+        return [_copy_wtml(o) for o in obj]
+
+    if isinstance(obj, HasTraits):
+        copied = type(obj).__new__(type(obj))
+        copied._trait_values.update(
+            (name, _copy_wtml(value)) for name, value in obj._trait_values.items()
+        )
+        return copied
+
+    return obj
+
+
+@dataclass
+class TokenStats:
+    """
+    Statistics about how a :class:`CxClient` has obtained its access tokens.
+    """
+
+    hits: int
+    "The number of API calls that reused a still-valid cached token."
+
+    refreshes: int
+    """The number of times that a token was obtained from the identity
+    provider because the cached one was missing or about to expire."""
+
+    forced_refreshes: int
+    """The number of times that a token was refreshed because the API rejected
+    it with a 401 error."""
+
+
+class _TokenCache:
+    """
+    An in-process cache of OpenID Connect access tokens, keyed by scope set.
+
+    The ``openidc_client`` library will happily hand out tokens that it knows
+    to have expired, leaving it to the API server to reject them. We track
+    expiration times ourselves so that we can refresh tokens shortly *before*
+    they expire, and so that the common case of reusing a valid token doesn't
+    involve the library at all.
+    """
+
+    def __init__(self, oidcc: OpenIDCClient, refresh_margin: float):
+        self._oidcc = oidcc
+        self._refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        # scope key => (access token, oidcc token UUID, expiration time)
+        self._entries: Dict[Tuple[str, ...], Tuple[str, str, float]] = {}
+        self.hits = 0
+        self.refreshes = 0
+        self.forced_refreshes = 0
+
+    def stats(self) -> TokenStats:
+        with self._lock:
+            return TokenStats(
+                hits=self.hits,
+                refreshes=self.refreshes,
+                forced_refreshes=self.forced_refreshes,
+            )
+
+    def peek(self, scopes: Sequence[str]) -> Optional[str]:
+        """
+        Get a cached token if one is available and fresh, without contacting
+        the identity provider. Returns None otherwise.
+        """
+        key = tuple(sorted(scopes))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry[2]):
+                self.hits += 1
+                return entry[0]
+
+        return None
+
+    def get(self, scopes: Sequence[str]) -> str:
+        """
+        Get an access token with the specified scopes, refreshing it if needed.
+
+        This may block for a long time if the user needs to go through an
+        interactive login flow.
+        """
+        key = tuple(sorted(scopes))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry[2]):
+                self.hits += 1
+                return entry[0]
+
+            entry = self._load(list(scopes))
+            self._entries[key] = entry
+            return entry[0]
+
+    def force_refresh(self, scopes: Sequence[str], rejected: str) -> Optional[str]:
+        """
+        Refresh the token for the specified scopes after the API server
+        rejected the token *rejected*. Returns None if no replacement token
+        could be obtained.
+        """
+        key = tuple(sorted(scopes))
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] != rejected:
+                # Another thread already replaced the token.
+                return entry[0]
+
+            self._entries.pop(key, None)
+            self.forced_refreshes += 1
+
+            if entry is None:
+                return None
+
+            uuid = entry[1]
+            entry = self._refresh(uuid)
+            if entry is None:
+                self._oidcc._delete_token(uuid)
+                return None
+
+            self._entries[key] = entry
+            return entry[0]
+
+    def _is_fresh(self, expires_at: float) -> bool:
+        return expires_at - self._refresh_margin > time.time()
+
+    def _load(self, scopes: List[str]) -> Tuple[str, str, float]:
+        """
+        Obtain a token from the ``openidc_client`` store, refreshing it if the
+        stored version is stale. Requires that the lock is held.
+        """
+        token = self._oidcc.get_token(scopes, new_token=True)
+        if token is None:
+            raise Exception("unable to obtain a WWT Constellations access token")
+
+        uuid = self._oidcc.last_returned_uuid
+        expires_at = self._token_info(uuid).get("expires_at", 0)
+
+        if self._is_fresh(expires_at):
+            return (token, uuid, expires_at)
+
+        entry = self._refresh(uuid)
+        if entry is not None:
+            return entry
+
+        # The refresh token is no good either. Start over from scratch, which
+        # may trigger an interactive login.
+        self._oidcc._delete_token(uuid)
+        token = self._oidcc.get_token(scopes, new_token=True)
+        if token is None:
+            raise Exception("unable to obtain a WWT Constellations access token")
+
+        self.refreshes += 1
+        uuid = self._oidcc.last_returned_uuid
+        return (token, uuid, self._token_info(uuid).get("expires_at", 0))
+
+    def _refresh(self, uuid: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Use the refresh token associated with *uuid* to get a new access token.
+        Requires that the lock is held. Returns None if the refresh token has
+        been rejected.
+        """
+        self.refreshes += 1
+
+        # The identity provider rejects expired or revoked refresh tokens with a
+        # 400 error, which ``openidc_client`` raises rather than reporting.
+        try:
+            if not self._oidcc._refresh_token(uuid):
+                return None
+        except requests.HTTPError:
+            return None
+
+        info = self._token_info(uuid)
+        if "access_token" not in info:
+            return None
+
+        return (info["access_token"], uuid, info.get("expires_at", 0))
+
+    def _token_info(self, uuid: str) -> dict:
+        """
+        Get a snapshot of the ``openidc_client`` cache entry for *uuid*, or an
+        empty dict if there is none.
+
+        The library's own cache methods, such as ``_refresh_token`` and
+        ``_delete_token``, take its cache lock themselves, so they must be
+        called without it. Reads of the cache must take it.
+        """
+        with self._oidcc._cache_lock:
+            return dict(self._oidcc._cache.get(uuid) or {})
+
 
 class CxClient:
     """
@@ -199,16 +630,144 @@ class CxClient:
         The identifier to use for caching this client's state in the
         ``openidc_client`` cache. Defaults to ``"wwt_api_client"``. You are
         unlikely to need to change this setting.
+    token_refresh_margin: optional :class:`float`
+        Access tokens are proactively refreshed when they are within this many
+        seconds of expiring. Defaults to 60.
+    transport: optional :class:`~wwt_api_client.constellations.transport.TransportConfig`
+        Connection pooling settings for the client's HTTP session. Defaults to
+        the ``transport`` setting of *config*, or the default
+        :class:`~wwt_api_client.constellations.transport.TransportConfig` if
+        that is unset.
+    retry: optional :class:`~wwt_api_client.constellations.transport.RetryPolicy`
+        The policy for retrying API calls that fail for transient reasons.
+        Defaults to the ``retry`` setting of *config*, or the default
+        :class:`~wwt_api_client.constellations.transport.RetryPolicy` if that
+        is unset. Pass ``RetryPolicy(max_retries=0)`` to disable retries.
+    wwt_url_cache_size: optional :class:`int`
+        The maximum number of legacy WWT URL lookups to remember in memory. See
+        :meth:`find_images_by_wwt_urls`. Defaults to 4096.
+    wwt_url_cache_ttl: optional :class:`float`
+        The number of seconds for which legacy WWT URL lookups that found images
+        are remembered. If None, they are remembered indefinitely. Defaults to
+        one hour.
+    wwt_url_cache_path: optional :class:`str`
+        If specified, legacy WWT URL lookups are also saved in an SQLite
+        database at this path, so that they are remembered across program
+        invocations.
+    wwt_url_miss_ttl: optional :class:`float`
+        The number of seconds for which legacy WWT URL lookups that found no
+        images are remembered. An image registered by someone else during this
+        time won't be found. Set to zero to not remember such lookups at all. If
+        None, they are remembered as long as *wwt_url_cache_ttl*. Defaults to
+        60.
+    json_backend: optional :class:`str` or :class:`~wwt_api_client.constellations.serialization.JsonBackend`
+        The JSON implementation used to parse responses and encode request
+        bodies: ``"orjson"``, ``"json"``, or ``"auto"``. Defaults to
+        ``"auto"``, which uses ``orjson`` if it is installed. See
+        :mod:`wwt_api_client.constellations.serialization`.
+    http_cache_size: optional :class:`int`
+        The maximum number of metadata responses, such as the results of
+        :meth:`~wwt_api_client.constellations.handles.HandleClient.get`, and
+        WTML documents, such as those fetched by
+        :meth:`~wwt_api_client.constellations.images.ImageClient.imageset_folder`,
+        to remember in memory so that they can be revalidated rather than
+        downloaded again. Set to zero to disable this caching. Defaults to 1024.
+        See :mod:`wwt_api_client.constellations.httpcache`.
+    http_cache_ttl: optional :class:`float`
+        The number of seconds for which metadata responses that carry no
+        ``ETag`` or ``Last-Modified`` validator are reused without contacting
+        the server. During this time, changes made by others won't be seen. If
+        None, they are reused indefinitely. Defaults to zero, so that such
+        responses are never reused.
+    http_cache_path: optional :class:`str`
+        If specified, cached metadata responses are also saved in an SQLite
+        database at this path, so that they are remembered across program
+        invocations.
+    wtml_cache_ttl: optional :class:`float`
+        The number of seconds for which WTML documents, such as those fetched
+        by
+        :meth:`~wwt_api_client.constellations.images.ImageClient.imageset_folder`,
+        are reused without contacting the server. During this time, changes
+        made by others won't be seen. Afterwards, the document is revalidated,
+        and only parsed again if it has changed. If None, documents are reused
+        until they are evicted. Set to zero to revalidate on every call.
+        Defaults to 60. Has no effect if *http_cache_size* is zero.
+    metadata_cache: optional :class:`~wwt_api_client.constellations.httpcache.MetadataCacheConfig`
+        If specified, decoded handle, image, and scene information is cached
+        according to these settings, so that repeated lookups need not contact
+        the server at all. By default, no such cache is kept.
+    coalesce_requests: optional :class:`bool`
+        If true, which is the default, concurrent identical read-only API calls
+        made from different threads are coalesced into a single request, and
+        its result is shared among all of the callers. See
+        :attr:`coalesced_requests`.
+
+    Notes
+    -----
+    Access tokens are cached in-process and reused until they are about to
+    expire, so that most API calls do not need to consult the identity
+    provider. If the API rejects a token with a 401 error, the token is
+    refreshed and the call is retried once. See :attr:`token_stats`.
+
+    Calls that fail with connection errors or transient HTTP errors, such as
+    503 Service Unavailable, are retried according to the client's
+    :class:`~wwt_api_client.constellations.transport.RetryPolicy`. See
+    :attr:`retry_stats`.
+
+    Metadata lookups are cached, and repeated lookups send conditional requests
+    so that unchanged data need not be downloaded again. Every lookup still
+    contacts the server, so it always returns current information, unless
+    *http_cache_ttl* is set. See :attr:`http_cache_stats`. An additional cache
+    of decoded metadata can be enabled with the *metadata_cache* parameter; see
+    :attr:`metadata_cache_stats`.
     """
 
     _config: ClientConfig
     _oidcc: OpenIDCClient
+    _tokens: _TokenCache
+    _session: requests.Session
+    _adapter: "_PooledAdapter"
+    _retry: "RetryPolicy"
+    _breaker: "_CircuitBreaker"
+    _retry_counts: Dict[str, int]
+    _wwt_url_cache: "LRUCache"
+    _wwt_url_disk_cache: Optional["DiskCache"]
+    _json: "JsonBackend"
+    _http_cache: Optional["_HttpCache"]
+    _wtml_memo: Optional["LRUCache"]
+    _metadata_cache: Optional["_MetadataCache"]
+    _flights: Optional["_SingleFlight"]
 
     def __init__(
         self,
         config: Optional[ClientConfig] = None,
         oidcc_cache_identifier: Optional[str] = "wwt_api_client",
+        token_refresh_margin: float = 60.0,
+        transport: Optional["TransportConfig"] = None,
+        retry: Optional["RetryPolicy"] = None,
+        wwt_url_cache_size: int = 4096,
+        wwt_url_cache_ttl: Optional[float] = 3600.0,
+        wwt_url_cache_path: Optional[str] = None,
+        wwt_url_miss_ttl: Optional[float] = 60.0,
+        json_backend: Union[str, "JsonBackend", None] = None,
+        http_cache_size: int = 1024,
+        http_cache_ttl: Optional[float] = 0.0,
+        http_cache_path: Optional[str] = None,
+        wtml_cache_ttl: Optional[float] = 60.0,
+        metadata_cache: Optional["MetadataCacheConfig"] = None,
+        coalesce_requests: bool = True,
     ):
+        from ..caching import DiskCache, LRUCache
+        from .httpcache import _HttpCache, _MetadataCache
+        from .serialization import get_json_backend
+        from .transport import (
+            RetryPolicy,
+            TransportConfig,
+            _CircuitBreaker,
+            _SingleFlight,
+            _make_session,
+        )
+
         if config is None:
             config = ClientConfig.new_default()
 
@@ -219,16 +778,216 @@ class CxClient:
             _ID_PROVIDER_MAPPING,
             config.client_id,
         )
+        self._tokens = _TokenCache(self._oidcc, token_refresh_margin)
+
+        if transport is None:
+            transport = config.transport
+        if transport is None:
+            transport = TransportConfig()
+
+        self._session, self._adapter = _make_session(transport)
+
+        if retry is None:
+            retry = config.retry
+        if retry is None:
+            retry = RetryPolicy()
+
+        self._retry = retry
+        self._breaker = _CircuitBreaker(retry.breaker_threshold, retry.breaker_cooldown)
+        self._retry_lock = threading.Lock()
+        self._retry_counts = {}
+
+        self._wwt_url_cache = LRUCache(wwt_url_cache_size, ttl=wwt_url_cache_ttl)
+        self._wwt_url_miss_ttl = wwt_url_miss_ttl
+
+        if wwt_url_cache_path is None:
+            self._wwt_url_disk_cache = None
+        else:
+            self._wwt_url_disk_cache = DiskCache(
+                wwt_url_cache_path, ttl=wwt_url_cache_ttl
+            )
+
+        self._json = get_json_backend(json_backend)
+
+        if http_cache_size > 0:
+            self._http_cache = _HttpCache(
+                http_cache_size, http_cache_ttl, http_cache_path
+            )
+            # url => (text, Folder, time fetched or revalidated)
+            self._wtml_memo = LRUCache(http_cache_size)
+        else:
+            self._http_cache = None
+            self._wtml_memo = None
+
+        self._wtml_cache_ttl = wtml_cache_ttl
+
+        if metadata_cache is None:
+            self._metadata_cache = None
+        else:
+            self._metadata_cache = _MetadataCache(metadata_cache)
+
+        self._flights = _SingleFlight() if coalesce_requests else None
+
+    @property
+    def token_stats(self) -> TokenStats:
+        """
+        Statistics about this client's use of cached access tokens.
+
+        Returns
+        -------
+        A :class:`TokenStats` object.
+        """
+        return self._tokens.stats()
+
+    @property
+    def pool_stats(self) -> "PoolStats":
+        """
+        Statistics about this client's pool of HTTP connections.
+
+        Returns
+        -------
+        A :class:`~wwt_api_client.constellations.transport.PoolStats` object.
+        """
+        return self._adapter.counters.snapshot()
+
+    @property
+    def retry_stats(self) -> Dict[str, int]:
+        """
+        The number of times that this client has retried calls to each API
+        endpoint.
+
+        Returns
+        -------
+        A dictionary mapping endpoint labels, such as
+        ``"GET /handle/:id/timeline"``, to retry counts. Endpoints that have
+        never been retried are omitted.
+        """
+        with self._retry_lock:
+            return dict(self._retry_counts)
+
+    @property
+    def http_cache_stats(self) -> Optional["HttpCacheStats"]:
+        """
+        Statistics about this client's cache of metadata responses.
+
+        Returns
+        -------
+        A :class:`~wwt_api_client.constellations.httpcache.HttpCacheStats`
+        object, or None if the cache is disabled.
+        """
+        if self._http_cache is None:
+            return None
+
+        return self._http_cache.stats()
+
+    @property
+    def metadata_cache_stats(self) -> Optional["CacheStats"]:
+        """
+        Statistics about this client's cache of decoded metadata.
+
+        Returns
+        -------
+        A :class:`~wwt_api_client.caching.CacheStats` object, or None if the
+        cache is disabled.
+        """
+        if self._metadata_cache is None:
+            return None
+
+        return self._metadata_cache.stats()
+
+    @property
+    def coalesced_requests(self) -> int:
+        """
+        The number of API calls that did not send a request of their own,
+        because an identical call was already in progress in another thread.
+        """
+        if self._flights is None:
+            return 0
+
+        return self._flights.coalesced
+
+    def _send_with_token(
+        self, http_method: str, url: str, token: str, kwargs: dict
+    ) -> Response:
+        headers = dict(kwargs.get("headers") or {})
+        headers["Authorization"] = "Bearer " + token
+        return self._session.request(http_method, url, **dict(kwargs, headers=headers))
+
+    def _send_authorized(
+        self, http_method: str, url: str, scopes, kwargs: dict
+    ) -> Response:
+        token = self._tokens.get(scopes)
+        resp = self._send_with_token(http_method, url, token, kwargs)
+
+        if resp.status_code == 401:
+            token = self._tokens.force_refresh(scopes, token)
+            if token is not None:
+                # Release the connection, which is held open if streaming
+                resp.close()
+                resp = self._send_with_token(http_method, url, token, kwargs)
+
+        return resp
 
     def _send_and_check(
-        self, rel_url: str, scopes=["profile", "offline_access"], **kwargs
+        self,
+        rel_url: str,
+        scopes=_DEFAULT_SCOPES,
+        http_method: str = "POST",
+        idempotent: Optional[bool] = None,
+        **kwargs,
     ) -> Response:
-        resp = self._oidcc.send_request(
-            self._config.api_url + rel_url,
-            new_token=True,
-            scopes=scopes,
-            **kwargs,
-        )
+        from .serialization import _encode_json_kwarg
+        from .transport import _BREAKER_STATUSES, _endpoint_key
+
+        url = self._config.api_url + rel_url
+        kwargs = _encode_json_kwarg(self._json, kwargs)
+        policy = self._retry
+
+        if idempotent is None:
+            idempotent = http_method.upper() in policy.retry_methods
+
+        attempt = 0
+
+        while True:
+            self._breaker.check()
+
+            try:
+                resp = self._send_authorized(http_method, url, scopes, kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                tripped = self._breaker.record_failure()
+                delay = policy._delay(attempt, None) if idempotent else None
+                if tripped or delay is None:
+                    raise
+            except BaseException:
+                self._breaker.record_abandoned()
+                raise
+            else:
+                tripped = False
+
+                if resp.status_code in _BREAKER_STATUSES:
+                    tripped = self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+
+                if (
+                    tripped
+                    or not idempotent
+                    or resp.status_code not in policy.retry_statuses
+                ):
+                    break
+
+                delay = policy._delay(attempt, resp)
+                if delay is None:
+                    break
+
+                resp.close()
+
+            key = _endpoint_key(http_method, rel_url)
+            with self._retry_lock:
+                self._retry_counts[key] = self._retry_counts.get(key, 0) + 1
+
+            time.sleep(delay)
+            attempt += 1
 
         try:
             resp.raise_for_status()
@@ -239,6 +998,193 @@ class CxClient:
 
         return resp
 
+    def _coalesce(self, key: tuple, func: Callable[[], T]) -> T:
+        if self._flights is None:
+            return func()
+
+        return self._flights.do(key, func)
+
+    def _send_and_parse(self, rel_url: str, **kwargs) -> dict:
+        """
+        Send a request and parse its response.
+
+        Identical concurrent read-only requests are coalesced, in which case the
+        returned dictionary is shared among the callers, so it must not be
+        modified.
+        """
+        from .serialization import _encode_json_kwarg, _parse_response
+
+        http_method = kwargs.get("http_method", "POST").upper()
+        idempotent = kwargs.get("idempotent")
+
+        if idempotent is None:
+            idempotent = http_method in self._retry.retry_methods
+
+        def send():
+            resp = self._send_and_check(rel_url, **kwargs)
+            return _parse_response(self._json, resp.content)
+
+        if not idempotent:
+            return send()
+
+        # Encode any body now, so that it can be part of the key
+        kwargs = _encode_json_kwarg(self._json, kwargs)
+        key = _coalescing_key(rel_url, kwargs)
+
+        if key is None:
+            return send()
+
+        return self._coalesce(key, send)
+
+    def _get_and_parse(self, rel_url: str, params: Optional[dict] = None) -> dict:
+        """
+        Send a GET request and parse its response, using the conditional-request
+        cache.
+
+        The returned dictionary may be shared with the cache, so it must not be
+        modified.
+        """
+        cache = self._http_cache
+
+        if cache is None:
+            return self._send_and_parse(rel_url, http_method="GET", params=params)
+
+        key = cache.key(self._config.api_url + rel_url, params)
+        return self._coalesce(
+            ("cached", key), lambda: self._revalidate_and_parse(rel_url, params, key)
+        )
+
+    def _revalidate_and_parse(self, rel_url: str, params: Optional[dict], key: str):
+        from .httpcache import _HttpCacheEntry
+        from .serialization import _parse_response
+
+        cache = self._http_cache
+        entry, fresh = cache.get(key)
+
+        if fresh:
+            return entry.body
+
+        headers = {} if entry is None else entry.conditional_headers()
+        resp = self._send_and_check(
+            rel_url, http_method="GET", params=params, headers=headers
+        )
+
+        if resp.status_code == 304 and entry is not None:
+            cache.record_revalidated()
+            return entry.body
+
+        cache.record_miss()
+        body = _parse_response(self._json, resp.content)
+        entry = _HttpCacheEntry(
+            body, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        )
+        cache.put(key, entry)
+        return body
+
+    def _get_metadata(self, kind: str, cls: type, rel_url: str):
+        """
+        Get and decode information about a handle, image, or scene, using the
+        metadata cache. *kind* is ``"handle"``, ``"image"``, or ``"scene"``.
+        """
+        if self._metadata_cache is None:
+            return _decode(cls, self._get_and_parse(rel_url))
+
+        return self._metadata_cache.lookup(
+            kind, rel_url, lambda: _decode(cls, self._get_and_parse(rel_url))
+        )
+
+    def _get_wtml_folder(self, url: str) -> "Folder":
+        """
+        Get and parse a WTML folder, using the conditional-request cache.
+
+        The parsed folder is remembered, and shared among coalesced callers,
+        but each call returns a copy of it that the caller is free to modify.
+        """
+        from wwt_data_formats.folder import Folder
+
+        if self._http_cache is None:
+            fetch = functools.partial(Folder.from_url, url, session=self._session)
+        else:
+            fetch = functools.partial(self._revalidate_wtml, url)
+
+        return _copy_wtml(self._coalesce(("wtml", url), fetch))
+
+    def _revalidate_wtml(self, url: str) -> "Folder":
+        from wwt_data_formats.folder import Folder
+
+        from .httpcache import _HttpCacheEntry
+
+        cache = self._http_cache
+        ttl = self._wtml_cache_ttl
+        memo = self._wtml_memo.get(url)
+
+        if memo is not None and (ttl is None or time.time() < memo[2] + ttl):
+            cache.record_fresh_hit()
+            return memo[1]
+
+        entry, fresh = cache.get(url)
+
+        if not fresh:
+            # The WTML endpoints are public, so no token is needed
+            headers = {} if entry is None else entry.conditional_headers()
+            resp = self._session.get(url, headers=headers)
+
+            if resp.status_code == 304 and entry is not None:
+                cache.record_revalidated()
+            else:
+                resp.raise_for_status()
+                cache.record_miss()
+
+                # Ignore any Unicode byte-order mark, as Folder.from_url does
+                resp.encoding = "utf-8-sig"
+                entry = _HttpCacheEntry(
+                    resp.text,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                )
+                cache.put(url, entry)
+
+        if memo is not None and memo[0] == entry.body:
+            folder = memo[1]
+        else:
+            folder = Folder.from_text(entry.body)
+
+        self._wtml_memo.put(url, (entry.body, folder, time.time()))
+        return folder
+
+    def _invalidate_cached(self, rel_url: str, *extra_rel_urls: str):
+        """
+        Discard all cached information about the item at *rel_url*, after it has
+        been modified. Any *extra_rel_urls* are discarded from the
+        conditional-request cache as well.
+        """
+        rel_urls = (rel_url, rel_url + "/permissions")
+
+        if self._metadata_cache is not None:
+            self._metadata_cache.invalidate(*rel_urls)
+
+        if self._http_cache is not None:
+            for u in rel_urls + extra_rel_urls:
+                key = self._http_cache.key(self._config.api_url + u, None)
+                self._http_cache.invalidate(key)
+                self._wtml_memo.invalidate(key)
+
+    def _send_and_stream(self, rel_url: str, **kwargs) -> Iterator:
+        """
+        Send a request and iterate over the ``results`` of its response as they
+        are received. The request is only sent once iteration begins.
+        """
+        from .serialization import _iter_response_items
+
+        resp = self._send_and_check(rel_url, stream=True, **kwargs)
+
+        try:
+            # Have urllib3 undo any gzip or deflate Content-Encoding for us
+            resp.raw.decode_content = True
+            yield from _iter_response_items(self._json, resp.raw)
+        finally:
+            resp.close()
+
     def handle_client(self, handle: str) -> "handles.HandleClient":
         """
         Return a client class for making API calls specific to the given handle.
@@ -299,16 +1245,126 @@ class CxClient:
         :ref:`endpoint-POST-images-find-by-legacy-url` API endpoint.
         """
         req = FindImagesByLegacyRequest(wwt_legacy_url=wwt_url)
-        resp = self._send_and_check(
+        resp = self._send_and_parse(
             "/images/find-by-legacy-url",
-            json=_strip_nulls_in_place(req.to_dict()),
+            idempotent=True,
+            json=req,
         )
-        resp = resp.json()
-        resp.pop("error")
-        resp = FindImagesByLegacyResponse.schema().load(resp)
+        resp = _decode(FindImagesByLegacyResponse, resp)
         return resp.results
 
-    def get_home_timeline(self, page_num: int) -> List[SceneHydrated]:
+    def find_images_by_wwt_urls(
+        self, wwt_urls: Iterable[str], max_workers: int = 8
+    ) -> Dict[str, List[ImageSummary]]:
+        """
+        Find images in the database associated with a batch of "legacy" WWT
+        data URLs.
+
+        Parameters
+        ----------
+        wwt_urls : iterable of str
+            The URLs to look up.
+        max_workers : optional int, defaults to 8
+            The maximum number of lookups to issue simultaneously.
+
+        Returns
+        -------
+        A dictionary mapping each input URL to a list of
+        :class:`~wwt_api_client.constellations.data.ImageSummary` items, which
+        will be empty if no images are associated with the URL.
+
+        Notes
+        -----
+        The URLs are normalized and de-duplicated before lookup, and the results
+        are cached. Lookups that found nothing are cached too, but only briefly,
+        so that images registered by others are soon noticed. The cache is
+        configured when the :class:`CxClient` is created. Adding an image with
+        :meth:`~wwt_api_client.constellations.handles.HandleClient.add_image`
+        invalidates any cached result for its URL.
+
+        This method calls the :ref:`endpoint-POST-images-find-by-legacy-url` API
+        endpoint for each URL that is not already cached. If any of these
+        lookups fails, the error is raised only once all of the others have
+        finished, and the results of those that succeeded are cached, so that
+        retrying the call only repeats the lookups that failed.
+        """
+        wwt_urls = list(wwt_urls)
+        originals = {}
+
+        for url in wwt_urls:
+            originals.setdefault(_normalize_wwt_url(url), url.strip())
+
+        resolved = {}
+        todo = []
+
+        for key in originals.keys():
+            hits = self._get_cached_wwt_url(key)
+
+            if hits is None:
+                todo.append(key)
+            else:
+                resolved[key] = hits
+
+        if todo:
+            errors = {}
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(todo))) as ex:
+                futures = {
+                    ex.submit(self.find_images_by_wwt_url, originals[key]): key
+                    for key in todo
+                }
+
+                for future in as_completed(futures):
+                    key = futures[future]
+
+                    try:
+                        hits = future.result()
+                    except Exception as e:
+                        errors[key] = e
+                    else:
+                        self._put_cached_wwt_url(key, hits)
+                        resolved[key] = hits
+
+            if errors:
+                # Report the first failure in input order, for consistency
+                raise next(errors[key] for key in todo if key in errors)
+
+        return {url: resolved[_normalize_wwt_url(url)] for url in wwt_urls}
+
+    def _get_cached_wwt_url(self, key: str) -> Optional[List[ImageSummary]]:
+        hits = self._wwt_url_cache.get(key)
+
+        if hits is None and self._wwt_url_disk_cache is not None:
+            text = self._wwt_url_disk_cache.get(key)
+
+            if text is not None:
+                hits = [_decode(ImageSummary, h) for h in json.loads(text)]
+                self._wwt_url_cache.put(key, hits)
+
+        return hits
+
+    def _put_cached_wwt_url(self, key: str, hits: List[ImageSummary]):
+        # A TTL of None means to use the caches' default
+        ttl = None if hits else self._wwt_url_miss_ttl
+        if ttl is not None and ttl <= 0:
+            return
+
+        self._wwt_url_cache.put(key, hits, ttl)
+
+        if self._wwt_url_disk_cache is not None:
+            text = json.dumps([h.to_dict() for h in hits])
+            self._wwt_url_disk_cache.put(key, text, ttl)
+
+    def _invalidate_wwt_url(self, wwt_url: str):
+        key = _normalize_wwt_url(wwt_url)
+        self._wwt_url_cache.invalidate(key)
+
+        if self._wwt_url_disk_cache is not None:
+            self._wwt_url_disk_cache.invalidate(key)
+
+    def get_home_timeline(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> List[SceneHydrated]:
         """
         Get information about a group of scenes on the home timeline.
 
@@ -317,6 +1373,16 @@ class CxClient:
         page_num : int
             Which page to retrieve. Page zero gives the top items on the
             timeline, page one gives the next set, etc.
+        lazy : optional bool, defaults to False
+            If true, the nested content of each scene (its handle, content,
+            previews, and AstroPix information) is only decoded when it is
+            first accessed. This makes decoding faster for callers that only
+            look at top-level fields such as ``id``, ``text``, ``place``, and
+            ``likes``.
+        interner : optional :class:`~wwt_api_client.constellations.data.Interner`
+            If specified, identical handle and image information objects are
+            shared among the returned scenes, and with any other scenes decoded
+            using the same interner.
 
         Returns
         -------
@@ -329,21 +1395,77 @@ class CxClient:
         stable from one page to the next. If you care, look at the length of the
         list that you get back from an API.
         """
-        try:
-            use_page_num = int(page_num)
-            assert use_page_num >= 0
-        except Exception:
-            raise ValueError(f"invalid page_num argument {page_num!r}")
+        use_page_num = _check_page_num(page_num)
 
-        resp = self._send_and_check(
+        resp = self._send_and_parse(
             "/scenes/home-timeline",
             http_method="GET",
             params={"page": use_page_num},
         )
-        resp = resp.json()
-        resp.pop("error")
-        resp = TimelineResponse.schema().load(resp)
-        return resp.results
+        return _decode_timeline(resp, lazy, interner)
+
+    def get_home_timeline_stream(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> Iterator[SceneHydrated]:
+        """
+        Get information about a group of scenes on the home timeline, decoding
+        each scene as soon as it is received.
+
+        This is the same as :meth:`get_home_timeline`, except that it returns a
+        generator. The API call is made when iteration begins, and the
+        response is parsed incrementally, so that the whole page never needs
+        to be held in memory. See
+        :mod:`wwt_api_client.constellations.serialization`.
+        """
+        use_page_num = _check_page_num(page_num)
+        items = self._send_and_stream(
+            "/scenes/home-timeline",
+            http_method="GET",
+            params={"page": use_page_num},
+        )
+        return (_decode_scene(item, lazy, interner) for item in items)
+
+    def crawl_home_timeline(
+        self,
+        max_workers: int = 4,
+        max_pages: Optional[int] = None,
+        lazy: bool = False,
+        interner: Optional[Interner] = None,
+    ) -> Iterator[SceneHydrated]:
+        """
+        Iterate over the scenes on the home timeline, fetching several pages
+        in parallel.
+
+        Parameters
+        ----------
+        max_workers : optional int, defaults to 4
+            The maximum number of timeline pages to request simultaneously.
+        max_pages : optional int, defaults to None
+            If specified, stop after this many pages of the timeline. Otherwise,
+            the crawl continues until the server returns an empty page.
+        lazy : optional bool, defaults to False
+            If true, decode scenes lazily. See :meth:`get_home_timeline`.
+        interner : optional :class:`~wwt_api_client.constellations.data.Interner`
+            If specified, share identical nested objects among the scenes. If
+            you crawl the whole timeline, this can save a great deal of memory.
+            See :meth:`get_home_timeline`.
+
+        Returns
+        -------
+        A generator of
+        :class:`~wwt_api_client.constellations.data.SceneHydrated` items, in
+        timeline order.
+
+        Notes
+        -----
+        Each scene is yielded at most once, even if it appears on more than one
+        page of the timeline. See :meth:`get_home_timeline`.
+        """
+        return _crawl_timeline(
+            functools.partial(self.get_home_timeline, lazy=lazy, interner=interner),
+            max_workers,
+            max_pages,
+        )
 
     def get_builtin_backgrounds(self) -> List[ImageSummary]:
         """
@@ -352,8 +1474,6 @@ class CxClient:
         This method corresponds to the
         :ref:`endpoint-GET-images-builtin-backgrounds` API endpoint.
         """
-        resp = self._send_and_check("/images/builtin-backgrounds", http_method="GET")
-        resp = resp.json()
-        resp.pop("error")
-        resp = BuiltinBackgroundsResponse.schema().load(resp)
+        resp = self._get_and_parse("/images/builtin-backgrounds")
+        resp = _decode(BuiltinBackgroundsResponse, resp)
         return resp.results
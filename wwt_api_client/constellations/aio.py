@@ -0,0 +1,719 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Asynchronous (``asyncio``) API clients for WWT Constellations.
+
+These classes mirror :class:`~wwt_api_client.constellations.CxClient`,
+:class:`~wwt_api_client.constellations.handles.HandleClient`,
+:class:`~wwt_api_client.constellations.images.ImageClient`, and
+:class:`~wwt_api_client.constellations.scenes.SceneClient`, but their API
+methods are coroutines. All of the clients derived from one
+:class:`AsyncCxClient` share a single pool of HTTP connections and a single
+access token, so that one event loop can keep many requests in flight at once.
+
+This module requires the `httpx <https://www.python-httpx.org/>`_ package,
+which you can install with the ``async`` extra of this package.
+"""
+
+import asyncio
+import functools
+from typing import AsyncIterator, Callable, List, Optional, TypeVar, Union
+import urllib.parse
+
+import httpx
+from openidc_client import OpenIDCClient
+from wwt_data_formats.imageset import ImageSet
+from wwt_data_formats.place import Place
+
+from . import (
+    BuiltinBackgroundsResponse,
+    ClientConfig,
+    FindImagesByLegacyRequest,
+    FindImagesByLegacyResponse,
+    TokenStats,
+    _DEFAULT_SCOPES,
+    _ID_PROVIDER_MAPPING,
+    _TokenCache,
+    _check_page_num,
+    _check_page_size,
+    _decode_scene,
+    _decode_timeline,
+)
+from .data import (
+    HandleInfo,
+    HandlePermissions,
+    HandleStats,
+    HandleUpdate,
+    ImageApiPermissions,
+    ImageInfo,
+    ImageSummary,
+    ImageUpdate,
+    Interner,
+    SceneHydrated,
+    SceneInfo,
+    ScenePermissions,
+    SceneUpdate,
+    _decode,
+)
+from .handles import (
+    AddImageRequest,
+    AddImageResponse,
+    AddSceneRequest,
+    AddSceneResponse,
+    ImageInfoResponse,
+    SceneInfoResponse,
+    _image_request_from_set,
+    _place_imagesets,
+    _scene_request_from_place,
+)
+from .serialization import (
+    JsonBackend,
+    _aiter_response_items,
+    _encode_json_kwarg,
+    _parse_response,
+    get_json_backend,
+)
+
+__all__ = """
+AsyncCxClient
+AsyncHandleClient
+AsyncImageClient
+AsyncSceneClient
+""".split()
+
+T = TypeVar("T")
+
+
+async def _adecode_items(
+    items: AsyncIterator, decode: Callable[[dict], T]
+) -> AsyncIterator[T]:
+    async for item in items:
+        yield decode(item)
+
+
+class AsyncCxClient:
+    """
+    An asynchronous client for the WWT Constellations APIs.
+
+    This is the ``asyncio`` counterpart of
+    :class:`~wwt_api_client.constellations.CxClient`. It should be closed with
+    :meth:`aclose` when you are done with it, or used as an asynchronous
+    context manager.
+
+    Parameters
+    ----------
+    config : optional :class:`~wwt_api_client.constellations.ClientConfig`
+        If specified, the client configuration to use. Defaults to calling
+        :meth:`~wwt_api_client.constellations.ClientConfig.new_default`.
+    oidcc_cache_identifier: optional :class:`str`
+        The identifier to use for caching this client's state in the
+        ``openidc_client`` cache. Defaults to ``"wwt_api_client"``.
+    token_refresh_margin: optional :class:`float`
+        Access tokens are proactively refreshed when they are within this many
+        seconds of expiring. Defaults to 60.
+    max_connections: optional :class:`int`
+        The maximum number of simultaneous connections to the API server.
+        Defaults to 100.
+    json_backend: optional :class:`str` or :class:`~wwt_api_client.constellations.serialization.JsonBackend`
+        The JSON implementation used to parse responses and encode request
+        bodies. Defaults to ``"auto"``, which uses ``orjson`` if it is
+        installed.
+
+    Notes
+    -----
+    Obtaining a brand-new access token may involve an interactive login, which
+    is a blocking operation. When that happens, it is run in the event loop's
+    default executor so that it does not stall the loop.
+    """
+
+    _config: ClientConfig
+    _oidcc: OpenIDCClient
+    _tokens: _TokenCache
+    _http: httpx.AsyncClient
+    _json: JsonBackend
+
+    def __init__(
+        self,
+        config: Optional[ClientConfig] = None,
+        oidcc_cache_identifier: Optional[str] = "wwt_api_client",
+        token_refresh_margin: float = 60.0,
+        max_connections: int = 100,
+        json_backend: Union[str, JsonBackend, None] = None,
+    ):
+        if config is None:
+            config = ClientConfig.new_default()
+
+        self._config = config
+        self._oidcc = OpenIDCClient(
+            oidcc_cache_identifier,
+            config.id_provider_url,
+            _ID_PROVIDER_MAPPING,
+            config.client_id,
+        )
+        self._tokens = _TokenCache(self._oidcc, token_refresh_margin)
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._json = get_json_backend(json_backend)
+
+    async def __aenter__(self) -> "AsyncCxClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close this client's HTTP connections.
+        """
+        await self._http.aclose()
+
+    @property
+    def token_stats(self) -> TokenStats:
+        """
+        Statistics about this client's use of cached access tokens.
+
+        Returns
+        -------
+        A :class:`~wwt_api_client.constellations.TokenStats` object.
+        """
+        return self._tokens.stats()
+
+    async def _get_token(self, scopes) -> str:
+        token = self._tokens.peek(scopes)
+        if token is not None:
+            return token
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._tokens.get, scopes)
+
+    async def _send_with_token(
+        self, http_method: str, url: str, token: str, kwargs: dict, stream: bool
+    ) -> httpx.Response:
+        headers = dict(kwargs.get("headers") or {})
+        headers["Authorization"] = "Bearer " + token
+        request = self._http.build_request(
+            http_method, url, **dict(kwargs, headers=headers)
+        )
+        return await self._http.send(request, stream=stream)
+
+    async def _send_and_check(
+        self,
+        rel_url: str,
+        scopes=_DEFAULT_SCOPES,
+        http_method: str = "POST",
+        stream: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        url = self._config.api_url + rel_url
+        kwargs = _encode_json_kwarg(self._json, kwargs, body_key="content")
+        token = await self._get_token(scopes)
+        resp = await self._send_with_token(http_method, url, token, kwargs, stream)
+
+        if resp.status_code == 401:
+            loop = asyncio.get_running_loop()
+            token = await loop.run_in_executor(
+                None, self._tokens.force_refresh, scopes, token
+            )
+            if token is not None:
+                await resp.aclose()
+                resp = await self._send_with_token(
+                    http_method, url, token, kwargs, stream
+                )
+
+        if resp.is_error:
+            await resp.aread()
+            await resp.aclose()
+
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            # digest the response into the message
+            e.args = (f"{e}: {e.response.text}",)
+            raise
+
+        return resp
+
+    async def _send_and_parse(self, rel_url: str, **kwargs) -> dict:
+        resp = await self._send_and_check(rel_url, **kwargs)
+        return _parse_response(self._json, resp.content)
+
+    async def _send_and_stream(self, rel_url: str, **kwargs) -> AsyncIterator:
+        resp = await self._send_and_check(rel_url, stream=True, **kwargs)
+
+        try:
+            async for item in _aiter_response_items(self._json, resp.aiter_bytes()):
+                yield item
+        finally:
+            await resp.aclose()
+
+    def handle_client(self, handle: str) -> "AsyncHandleClient":
+        """
+        Return a client class for making API calls specific to the given handle.
+
+        Parameters
+        ----------
+        handle : :class:`str`
+            The handle of interest.
+
+        Returns
+        -------
+        :class:`AsyncHandleClient`
+        """
+        return AsyncHandleClient(self, handle)
+
+    def image_client(self, id: str) -> "AsyncImageClient":
+        """
+        Return a client class for making API calls specific to the given image.
+
+        Parameters
+        ----------
+        id : :class:`str`
+            The ID of the image of interest.
+
+        Returns
+        -------
+        :class:`AsyncImageClient`
+        """
+        return AsyncImageClient(self, id)
+
+    def scene_client(self, id: str) -> "AsyncSceneClient":
+        """
+        Return a client class for making API calls specific to the given scene.
+
+        Parameters
+        ----------
+        id : :class:`str`
+            The ID of the scene of interest.
+
+        Returns
+        -------
+        :class:`AsyncSceneClient`
+        """
+        return AsyncSceneClient(self, id)
+
+    async def find_images_by_wwt_url(self, wwt_url: str) -> List[ImageSummary]:
+        """
+        Find images in the database associated with a particular "legacy" WWT
+        data URL.
+
+        See :meth:`wwt_api_client.constellations.CxClient.find_images_by_wwt_url`.
+        """
+        req = FindImagesByLegacyRequest(wwt_legacy_url=wwt_url)
+        resp = await self._send_and_parse(
+            "/images/find-by-legacy-url",
+            json=req,
+        )
+        return _decode(FindImagesByLegacyResponse, resp).results
+
+    async def get_home_timeline(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> List[SceneHydrated]:
+        """
+        Get information about a group of scenes on the home timeline.
+
+        See :meth:`wwt_api_client.constellations.CxClient.get_home_timeline`.
+        """
+        use_page_num = _check_page_num(page_num)
+
+        resp = await self._send_and_parse(
+            "/scenes/home-timeline",
+            http_method="GET",
+            params={"page": use_page_num},
+        )
+        return _decode_timeline(resp, lazy, interner)
+
+    def get_home_timeline_stream(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> AsyncIterator[SceneHydrated]:
+        """
+        Get information about a group of scenes on the home timeline, decoding
+        each scene as soon as it is received.
+
+        This returns an asynchronous generator. See
+        :meth:`wwt_api_client.constellations.CxClient.get_home_timeline_stream`.
+        """
+        use_page_num = _check_page_num(page_num)
+        items = self._send_and_stream(
+            "/scenes/home-timeline",
+            http_method="GET",
+            params={"page": use_page_num},
+        )
+        return _adecode_items(items, lambda d: _decode_scene(d, lazy, interner))
+
+    async def get_builtin_backgrounds(self) -> List[ImageSummary]:
+        """
+        Get the list of builtin background imagery options.
+
+        See :meth:`wwt_api_client.constellations.CxClient.get_builtin_backgrounds`.
+        """
+        resp = await self._send_and_parse(
+            "/images/builtin-backgrounds", http_method="GET"
+        )
+        return _decode(BuiltinBackgroundsResponse, resp).results
+
+
+class AsyncHandleClient:
+    """
+    An asynchronous client for the WWT Constellations APIs calls related to a
+    specific handle.
+
+    This is the ``asyncio`` counterpart of
+    :class:`~wwt_api_client.constellations.handles.HandleClient`; see that
+    class for documentation of the individual methods.
+
+    Parameters
+    ----------
+    client : :class:`AsyncCxClient`
+        The parent client for making API calls.
+    handle: :class:`str`
+        The handle to use for the API calls.
+    """
+
+    client: AsyncCxClient
+    _url_base: str
+
+    def __init__(
+        self,
+        client: AsyncCxClient,
+        handle: str,
+    ):
+        self.client = client
+        self._url_base = "/handle/" + urllib.parse.quote(handle)
+
+    async def get(self) -> HandleInfo:
+        """
+        Get basic information about this handle.
+        """
+        resp = await self.client._send_and_parse(self._url_base, http_method="GET")
+        return _decode(HandleInfo, resp)
+
+    async def permissions(self) -> HandlePermissions:
+        """
+        Get information about the logged-in user's permissions with regards to
+        this handle.
+        """
+        resp = await self.client._send_and_parse(
+            self._url_base + "/permissions", http_method="GET"
+        )
+        return _decode(HandlePermissions, resp)
+
+    async def stats(self) -> HandleStats:
+        """
+        Get some statistics about this handle.
+        """
+        resp = await self.client._send_and_parse(
+            self._url_base + "/stats", http_method="GET"
+        )
+        return _decode(HandleStats, resp)
+
+    async def scene_info(
+        self, page_num: int, page_size: Optional[int] = 10
+    ) -> List[SceneInfo]:
+        """
+        Get administrative info about scenes belonging to this handle.
+        """
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+
+        resp = await self.client._send_and_parse(
+            self._url_base + "/sceneinfo",
+            http_method="GET",
+            params={"page": use_page_num, "pagesize": use_page_size},
+        )
+        return _decode(SceneInfoResponse, resp).results
+
+    def scene_info_stream(
+        self, page_num: int, page_size: Optional[int] = 10
+    ) -> AsyncIterator[SceneInfo]:
+        """
+        Get administrative info about scenes belonging to this handle, decoding
+        each item as soon as it is received.
+
+        This returns an asynchronous generator. See
+        :meth:`wwt_api_client.constellations.handles.HandleClient.scene_info_stream`.
+        """
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+        items = self.client._send_and_stream(
+            self._url_base + "/sceneinfo",
+            http_method="GET",
+            params={"page": use_page_num, "pagesize": use_page_size},
+        )
+        return _adecode_items(items, functools.partial(_decode, SceneInfo))
+
+    async def image_info(
+        self, page_num: int, page_size: Optional[int] = 10
+    ) -> List[ImageSummary]:
+        """
+        Get administrative info about images belonging to this handle.
+        """
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+
+        resp = await self.client._send_and_parse(
+            self._url_base + "/imageinfo",
+            http_method="GET",
+            params={"page": use_page_num, "pagesize": use_page_size},
+        )
+        return _decode(ImageInfoResponse, resp).results
+
+    def image_info_stream(
+        self, page_num: int, page_size: Optional[int] = 10
+    ) -> AsyncIterator[ImageSummary]:
+        """
+        Get administrative info about images belonging to this handle, decoding
+        each item as soon as it is received.
+
+        This returns an asynchronous generator. See
+        :meth:`wwt_api_client.constellations.handles.HandleClient.image_info_stream`.
+        """
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+        items = self.client._send_and_stream(
+            self._url_base + "/imageinfo",
+            http_method="GET",
+            params={"page": use_page_num, "pagesize": use_page_size},
+        )
+        return _adecode_items(items, functools.partial(_decode, ImageSummary))
+
+    async def update(self, updates: HandleUpdate):
+        """
+        Update various attributes of this handle.
+        """
+        return await self.client._send_and_parse(
+            self._url_base,
+            http_method="PATCH",
+            json=updates,
+        )
+
+    async def add_image(self, image: AddImageRequest) -> str:
+        """
+        Add a new image owned by this handle.
+        """
+        resp = await self.client._send_and_parse(
+            self._url_base + "/image",
+            http_method="POST",
+            json=image,
+        )
+        return _decode(AddImageResponse, resp).id
+
+    async def add_image_from_set(
+        self,
+        imageset: ImageSet,
+        copyright: str,
+        license_spdx_id: str,
+        note: Optional[str] = None,
+        credits: Optional[str] = None,
+        alt_text: Optional[str] = None,
+    ) -> str:
+        """
+        Add a new Constellations image derived from a
+        :class:`wwt_data_formats.imageset.ImageSet` object.
+        """
+        req = _image_request_from_set(
+            imageset,
+            copyright,
+            license_spdx_id,
+            note=note,
+            credits=credits,
+            alt_text=alt_text,
+        )
+        return await self.add_image(req)
+
+    async def add_scene(self, scene: AddSceneRequest) -> str:
+        """
+        Add a new scene owned by this handle.
+        """
+        resp = await self.client._send_and_parse(
+            self._url_base + "/scene",
+            http_method="POST",
+            json=scene,
+        )
+        return _decode(AddSceneResponse, resp).id
+
+    async def add_scene_from_place(self, place: Place, publish=True) -> str:
+        """
+        Add a new scene derived from a :class:`wwt_data_formats.place.Place`
+        object.
+
+        The lookups of the place's imagesets are issued concurrently.
+        """
+        isets = _place_imagesets(place)
+        all_hits = await asyncio.gather(
+            *[self.client.find_images_by_wwt_url(iset.url) for iset in isets]
+        )
+
+        for iset, hits in zip(isets, all_hits):
+            if not hits:
+                raise Exception(
+                    f"unable to find Constellations record for image URL `{iset.url}`"
+                )
+
+        image_ids = [hits[0].id for hits in all_hits]
+        req = _scene_request_from_place(place, image_ids, publish)
+        return await self.add_scene(req)
+
+    async def get_timeline(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> List[SceneHydrated]:
+        """
+        Get information about a group of scenes on this handle's timeline.
+
+        See :meth:`wwt_api_client.constellations.handles.HandleClient.get_timeline`.
+        """
+        use_page_num = _check_page_num(page_num)
+
+        resp = await self.client._send_and_parse(
+            self._url_base + "/timeline",
+            http_method="GET",
+            params={"page": use_page_num},
+        )
+        return _decode_timeline(resp, lazy, interner)
+
+    def get_timeline_stream(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> AsyncIterator[SceneHydrated]:
+        """
+        Get information about a group of scenes on this handle's timeline,
+        decoding each scene as soon as it is received.
+
+        This returns an asynchronous generator. See
+        :meth:`wwt_api_client.constellations.handles.HandleClient.get_timeline_stream`.
+        """
+        use_page_num = _check_page_num(page_num)
+        items = self.client._send_and_stream(
+            self._url_base + "/timeline",
+            http_method="GET",
+            params={"page": use_page_num},
+        )
+        return _adecode_items(items, lambda d: _decode_scene(d, lazy, interner))
+
+
+class AsyncImageClient:
+    """
+    An asynchronous client for the WWT Constellations APIs calls related to a
+    specific image.
+
+    This is the ``asyncio`` counterpart of
+    :class:`~wwt_api_client.constellations.images.ImageClient`; see that class
+    for documentation of the individual methods.
+
+    Parameters
+    ----------
+    client : :class:`AsyncCxClient`
+        The parent client for making API calls.
+    id: str
+        The ID of the image of interest.
+    """
+
+    client: AsyncCxClient
+    _url_base: str
+
+    def __init__(
+        self,
+        client: AsyncCxClient,
+        id: str,
+    ):
+        self.client = client
+        self._url_base = "/image/" + urllib.parse.quote(id)
+
+    async def get(self) -> ImageInfo:
+        """
+        Get information about this image.
+        """
+        resp = await self.client._send_and_parse(self._url_base, http_method="GET")
+        return _decode(ImageInfo, resp)
+
+    async def permissions(self) -> ImageApiPermissions:
+        """
+        Get information about the logged-in user's permissions with regards to
+        this image.
+        """
+        resp = await self.client._send_and_parse(
+            self._url_base + "/permissions", http_method="GET"
+        )
+        return _decode(ImageApiPermissions, resp)
+
+    def imageset_wtml_url(self) -> str:
+        """
+        Get a URL that will yield a WTML folder containing this image as an imageset.
+        """
+        return f"{self.client._config.api_url}{self._url_base}/img.wtml"
+
+    async def update(self, updates: ImageUpdate):
+        """
+        Update various attributes of this image.
+        """
+        return await self.client._send_and_parse(
+            self._url_base,
+            http_method="PATCH",
+            json=updates,
+        )
+
+
+class AsyncSceneClient:
+    """
+    An asynchronous client for the WWT Constellations APIs calls related to a
+    specific scene.
+
+    This is the ``asyncio`` counterpart of
+    :class:`~wwt_api_client.constellations.scenes.SceneClient`; see that class
+    for documentation of the individual methods.
+
+    Parameters
+    ----------
+    client : :class:`AsyncCxClient`
+        The parent client for making API calls.
+    id: str
+        The ID of the scene of interest.
+    """
+
+    client: AsyncCxClient
+    _url_base: str
+
+    def __init__(
+        self,
+        client: AsyncCxClient,
+        id: str,
+    ):
+        self.client = client
+        self._url_base = "/scene/" + urllib.parse.quote(id)
+
+    async def get(self) -> SceneHydrated:
+        """
+        Get information about this scene.
+        """
+        resp = await self.client._send_and_parse(self._url_base, http_method="GET")
+        return _decode(SceneHydrated, resp)
+
+    async def permissions(self) -> ScenePermissions:
+        """
+        Get information about the logged-in user's permissions with regards to
+        this scene.
+        """
+        resp = await self.client._send_and_parse(
+            self._url_base + "/permissions", http_method="GET"
+        )
+        return _decode(ScenePermissions, resp)
+
+    def place_wtml_url(self) -> str:
+        """
+        Get a URL that will yield a WTML folder representing this scene as a WWT
+        Place, if possible.
+        """
+        return f"{self.client._config.api_url}{self._url_base}/place.wtml"
+
+    async def update(self, updates: SceneUpdate):
+        """
+        Update various attributes of this scene.
+        """
+        return await self.client._send_and_parse(
+            self._url_base,
+            http_method="PATCH",
+            json=updates,
+        )
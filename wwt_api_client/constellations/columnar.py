@@ -0,0 +1,320 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Columnar export of WWT Constellations listings.
+
+The functions in this module convert sequences of scene and image records into
+tables of NumPy arrays or, optionally, `Apache Arrow`_ tables, which are much
+better suited to bulk analysis than lists of Python objects. Inputs are
+consumed in chunks, so they can be lazy iterators, such as those returned by
+:meth:`~wwt_api_client.constellations.handles.HandleClient.iter_scene_info`,
+and the full list of objects never needs to exist in memory::
+
+    from wwt_api_client.constellations.columnar import scene_info_to_numpy
+
+    scenes = scene_info_to_numpy(handle_client.iter_scene_info())
+    clicks = scenes["clicks"][scenes.valid["clicks"]]
+    print(scenes["impressions"].sum(), clicks.mean())
+
+Each column of a :class:`ColumnTable` is a plain, contiguous NumPy array, so
+that aggregations over it run at full speed. Integer fields that the API may
+leave unset, such as ``clicks`` and ``shares``, are stored as zero where they
+are missing, and :attr:`ColumnTable.valid` records which values are present.
+Timestamps are converted to ``datetime64[ms]`` values in UTC.
+
+This module requires NumPy. The Arrow functions additionally require
+``pyarrow``.
+
+.. _Apache Arrow: https://arrow.apache.org/
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from .data import ImageSummary, SceneHydrated, SceneInfo
+
+__all__ = """
+ColumnTable
+image_info_to_arrow
+image_info_to_numpy
+scene_info_to_arrow
+scene_info_to_numpy
+timeline_to_arrow
+timeline_to_numpy
+""".split()
+
+
+@dataclass
+class ColumnTable:
+    """
+    A table of records stored as one NumPy array per field.
+
+    Index the table with a field name to get the corresponding column. For
+    example, ``table["likes"].sum()`` adds up the likes of all of the records.
+    """
+
+    columns: Dict[str, np.ndarray]
+    "The columns of the table, keyed by field name."
+
+    valid: Dict[str, np.ndarray]
+    """For each field that may be missing, a boolean array that is true where
+    the value is present. Missing values are stored in :attr:`columns` as
+    zero."""
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+
+class _Column(NamedTuple):
+    name: str
+    dtype: str
+    get: Callable
+    nullable: bool = False
+
+
+def _creation_date(item) -> str:
+    # NumPy warns about parsing timezone-aware timestamps, but the API always
+    # reports UTC.
+    value = item.creation_date
+
+    if value.endswith("Z"):
+        value = value[:-1]
+
+    return value
+
+
+_SCENE_INFO_COLUMNS = [
+    _Column("id", "U24", attrgetter("_id")),
+    _Column("creation_date", "datetime64[ms]", _creation_date),
+    _Column("impressions", "i8", attrgetter("impressions")),
+    _Column("likes", "i8", attrgetter("likes")),
+    _Column("clicks", "i8", attrgetter("clicks"), True),
+    _Column("shares", "i8", attrgetter("shares"), True),
+    _Column("published", "?", attrgetter("published")),
+]
+
+_IMAGE_INFO_COLUMNS = [
+    _Column("id", "U24", attrgetter("id")),
+    _Column("handle_id", "U24", attrgetter("handle_id")),
+    _Column("creation_date", "datetime64[ms]", _creation_date),
+]
+
+_TIMELINE_COLUMNS = [
+    _Column("id", "U24", attrgetter("id")),
+    _Column("handle_id", "U24", attrgetter("handle_id")),
+    _Column("creation_date", "datetime64[ms]", _creation_date),
+    _Column("impressions", "i8", attrgetter("impressions")),
+    _Column("likes", "i8", attrgetter("likes")),
+    _Column("clicks", "i8", attrgetter("clicks"), True),
+    _Column("shares", "i8", attrgetter("shares"), True),
+    _Column("published", "?", attrgetter("published")),
+    _Column("ra_rad", "f8", attrgetter("place.ra_rad")),
+    _Column("dec_rad", "f8", attrgetter("place.dec_rad")),
+    _Column("roll_rad", "f8", attrgetter("place.roll_rad")),
+    _Column("roi_height_deg", "f8", attrgetter("place.roi_height_deg")),
+    _Column("roi_aspect_ratio", "f8", attrgetter("place.roi_aspect_ratio")),
+]
+
+
+_Chunk = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+
+def _iter_chunks(
+    items: Iterable, columns: List[_Column], chunk_size: int
+) -> Iterator[_Chunk]:
+    """
+    Convert *items* into columns, *chunk_size* records at a time.
+
+    Yields dictionaries mapping each column name to a tuple of ``(values,
+    mask)``, where the mask is true for missing values.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive; got {chunk_size!r}")
+
+    items = iter(items)
+
+    while True:
+        batch = list(islice(items, chunk_size))
+        if not batch:
+            break
+
+        yield _convert_chunk(columns, batch)
+
+
+def _convert_chunk(columns: List[_Column], batch: list) -> _Chunk:
+    chunk = {}
+
+    for col in columns:
+        values = list(map(col.get, batch))
+
+        if col.nullable:
+            mask = np.fromiter(
+                (v is None for v in values), dtype=bool, count=len(values)
+            )
+
+            if mask.any():
+                values = [0 if v is None else v for v in values]
+        else:
+            mask = np.zeros(len(values), dtype=bool)
+
+        chunk[col.name] = (np.array(values, dtype=col.dtype), mask)
+
+    return chunk
+
+
+def _concatenate(pieces: List[np.ndarray], dtype) -> np.ndarray:
+    if not pieces:
+        return np.empty(0, dtype=dtype)
+
+    if len(pieces) == 1:
+        return pieces[0]
+
+    return np.concatenate(pieces)
+
+
+def _to_numpy(items: Iterable, columns: List[_Column], chunk_size: int):
+    values = {c.name: [] for c in columns}
+    masks = {c.name: [] for c in columns if c.nullable}
+
+    for chunk in _iter_chunks(items, columns, chunk_size):
+        for name, (col_values, col_mask) in chunk.items():
+            values[name].append(col_values)
+
+            if name in masks:
+                masks[name].append(~col_mask)
+
+    return ColumnTable(
+        columns={c.name: _concatenate(values[c.name], c.dtype) for c in columns},
+        valid={name: _concatenate(pieces, bool) for name, pieces in masks.items()},
+    )
+
+
+def _to_arrow(items: Iterable, columns: List[_Column], chunk_size: int):
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [
+            pa.field(c.name, pa.from_numpy_dtype(np.dtype(c.dtype)), c.nullable)
+            for c in columns
+        ]
+    )
+    batches = []
+
+    for chunk in _iter_chunks(items, columns, chunk_size):
+        arrays = []
+
+        for col in columns:
+            values, mask = chunk[col.name]
+            arrays.append(pa.array(values, mask=mask if col.nullable else None))
+
+        batches.append(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+    return pa.Table.from_batches(batches, schema=schema)
+
+
+def scene_info_to_numpy(scenes: Iterable[SceneInfo], chunk_size: int = 4096):
+    """
+    Convert a sequence of scene summaries into a table of NumPy arrays.
+
+    Parameters
+    ----------
+    scenes : iterable of :class:`~wwt_api_client.constellations.data.SceneInfo`
+        The scene summaries, as returned by
+        :meth:`~wwt_api_client.constellations.handles.HandleClient.scene_info`
+        or :meth:`~wwt_api_client.constellations.handles.HandleClient.iter_scene_info`.
+        Compact variants are also accepted.
+    chunk_size : optional int
+        The number of records to convert at a time. Defaults to 4096.
+
+    Returns
+    -------
+    A :class:`ColumnTable` with fields ``id``, ``creation_date``,
+    ``impressions``, ``likes``, ``clicks``, ``shares``, and ``published``.
+    The ``clicks`` and ``shares`` fields may be missing.
+    """
+    return _to_numpy(scenes, _SCENE_INFO_COLUMNS, chunk_size)
+
+
+def scene_info_to_arrow(scenes: Iterable[SceneInfo], chunk_size: int = 4096):
+    """
+    Convert a sequence of scene summaries into an Arrow table.
+
+    This is the same as :func:`scene_info_to_numpy`, except that it returns a
+    ``pyarrow.Table`` in which missing values are nulls.
+    """
+    return _to_arrow(scenes, _SCENE_INFO_COLUMNS, chunk_size)
+
+
+def image_info_to_numpy(images: Iterable[ImageSummary], chunk_size: int = 4096):
+    """
+    Convert a sequence of image summaries into a table of NumPy arrays.
+
+    Parameters
+    ----------
+    images : iterable of :class:`~wwt_api_client.constellations.data.ImageSummary`
+        The image summaries, as returned by
+        :meth:`~wwt_api_client.constellations.handles.HandleClient.image_info`
+        or :meth:`~wwt_api_client.constellations.handles.HandleClient.iter_image_info`.
+        Compact variants are also accepted.
+    chunk_size : optional int
+        The number of records to convert at a time. Defaults to 4096.
+
+    Returns
+    -------
+    A :class:`ColumnTable` with fields ``id``, ``handle_id``, and
+    ``creation_date``.
+    """
+    return _to_numpy(images, _IMAGE_INFO_COLUMNS, chunk_size)
+
+
+def image_info_to_arrow(images: Iterable[ImageSummary], chunk_size: int = 4096):
+    """
+    Convert a sequence of image summaries into an Arrow table.
+
+    This is the same as :func:`image_info_to_numpy`, except that it returns a
+    ``pyarrow.Table``.
+    """
+    return _to_arrow(images, _IMAGE_INFO_COLUMNS, chunk_size)
+
+
+def timeline_to_numpy(scenes: Iterable[SceneHydrated], chunk_size: int = 4096):
+    """
+    Convert a sequence of hydrated scenes into a table of NumPy arrays.
+
+    Parameters
+    ----------
+    scenes : iterable of :class:`~wwt_api_client.constellations.data.SceneHydrated`
+        The scenes, as returned by
+        :meth:`~wwt_api_client.constellations.handles.HandleClient.get_timeline`
+        or :meth:`~wwt_api_client.constellations.handles.HandleClient.crawl_timeline`.
+        Compact variants are also accepted.
+    chunk_size : optional int
+        The number of records to convert at a time. Defaults to 4096.
+
+    Returns
+    -------
+    A :class:`ColumnTable` with fields ``id``, ``handle_id``,
+    ``creation_date``, ``impressions``, ``likes``, ``clicks``, ``shares``,
+    ``published``, ``ra_rad``, ``dec_rad``, ``roll_rad``, ``roi_height_deg``,
+    and ``roi_aspect_ratio``. The ``clicks`` and ``shares`` fields may be
+    missing.
+    """
+    return _to_numpy(scenes, _TIMELINE_COLUMNS, chunk_size)
+
+
+def timeline_to_arrow(scenes: Iterable[SceneHydrated], chunk_size: int = 4096):
+    """
+    Convert a sequence of hydrated scenes into an Arrow table.
+
+    This is the same as :func:`timeline_to_numpy`, except that it returns a
+    ``pyarrow.Table`` in which missing values are nulls.
+    """
+    return _to_arrow(scenes, _TIMELINE_COLUMNS, chunk_size)
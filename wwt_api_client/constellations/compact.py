@@ -0,0 +1,211 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Compact, slotted variants of the WWT Constellations data classes.
+
+The classes in :mod:`wwt_api_client.constellations.data` are ordinary
+dataclasses, so each instance carries its own attribute dictionary. That is
+wasteful for programs that hold very many of them, such as a local mirror of a
+large handle. This module provides a variant of each class that uses
+``__slots__`` instead. For instance, :class:`CompactSceneInfo` has the same
+fields and JSON serialization as
+:class:`~wwt_api_client.constellations.data.SceneInfo`, but uses substantially
+less memory per instance. Nested fields use compact variants as well.
+
+Use :func:`to_compact` to convert existing objects, or
+``CompactSceneInfo.from_dict(...)`` to construct new ones directly from JSON
+data.
+"""
+
+import dataclasses
+import typing
+from typing import Dict, List, Union
+
+from dataclasses_json import dataclass_json
+
+from . import data
+
+__all__ = """
+CompactHandleImageStats
+CompactHandleInfo
+CompactHandlePermissions
+CompactHandleSceneStats
+CompactHandleStats
+CompactHandleUpdate
+CompactImageApiPermissions
+CompactImageContentPermissions
+CompactImageDisplayInfo
+CompactImageInfo
+CompactImageStorage
+CompactImageSummary
+CompactImageUpdate
+CompactImageWwt
+CompactSceneAstroPix
+CompactSceneContent
+CompactSceneContentHydrated
+CompactSceneContentUpdate
+CompactSceneHydrated
+CompactSceneImageLayer
+CompactSceneImageLayerHydrated
+CompactSceneInfo
+CompactScenePermissions
+CompactScenePlace
+CompactScenePreviews
+CompactSceneUpdate
+compact_class
+to_compact
+""".split()
+
+_COMPACT_CLASSES: Dict[type, type] = {}
+
+
+def _compact_type(tp):
+    if tp in _COMPACT_CLASSES:
+        return _COMPACT_CLASSES[tp]
+
+    origin = data._get_origin(tp)
+    args = data._get_args(tp)
+
+    if origin is Union:
+        return Union[tuple(_compact_type(a) for a in args)]
+
+    if origin is list and args:
+        return List[_compact_type(args[0])]
+
+    return tp
+
+
+def _add_slots(cls: type) -> type:
+    # Like ``dataclass(slots=True)``, which requires Python 3.10. The class
+    # must be recreated, since __slots__ only takes effect at creation time.
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    ns = dict(cls.__dict__)
+
+    for name in names + ("__dict__", "__weakref__"):
+        ns.pop(name, None)
+
+    ns["__slots__"] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, ns)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def _make_compact_class(cls: type) -> type:
+    hints = typing.get_type_hints(cls)
+    name = "Compact" + cls.__name__
+    ns = {
+        "__module__": __name__,
+        "__qualname__": name,
+        "__doc__": f"A compact variant of "
+        f":class:`~wwt_api_client.constellations.data.{cls.__name__}`.",
+        "__annotations__": {},
+    }
+
+    for f in dataclasses.fields(cls):
+        ns["__annotations__"][f.name] = _compact_type(hints[f.name])
+        ns[f.name] = dataclasses.field(
+            default=f.default,
+            default_factory=f.default_factory,
+            init=f.init,
+            repr=f.repr,
+            compare=f.compare,
+            metadata=f.metadata,
+        )
+
+    post_init = cls.__dict__.get("__post_init__")
+    if post_init is not None:
+        ns["__post_init__"] = post_init
+
+    compact = dataclasses.dataclass(type(name, (), ns))
+    compact = _add_slots(compact)
+    compact = dataclass_json(undefined="EXCLUDE")(compact)
+    _COMPACT_CLASSES[cls] = compact
+    return compact
+
+
+# Classes must be converted after the classes that they reference, so that
+# references can be updated to point to the compact variants.
+
+for _name in """
+HandleImageStats
+HandleInfo
+HandlePermissions
+HandleSceneStats
+HandleStats
+HandleUpdate
+ImageApiPermissions
+ImageContentPermissions
+ImageStorage
+ImageWwt
+ImageDisplayInfo
+ImageInfo
+ImageSummary
+ImageUpdate
+SceneAstroPix
+SceneContentUpdate
+SceneImageLayer
+SceneContent
+SceneImageLayerHydrated
+SceneContentHydrated
+ScenePermissions
+ScenePlace
+ScenePreviews
+SceneHydrated
+SceneInfo
+SceneUpdate
+""".split():
+    _compact = _make_compact_class(getattr(data, _name))
+    globals()[_compact.__name__] = _compact
+
+del _name, _compact
+
+
+def compact_class(cls: type) -> type:
+    """
+    Get the compact variant of a WWT Constellations data class.
+
+    Parameters
+    ----------
+    cls : type
+        One of the classes in :mod:`wwt_api_client.constellations.data`, such
+        as :class:`~wwt_api_client.constellations.data.SceneInfo`.
+
+    Returns
+    -------
+    The corresponding compact class, such as :class:`CompactSceneInfo`.
+    """
+    return _COMPACT_CLASSES[cls]
+
+
+def _data_class(obj) -> type:
+    # Lazily decoded and shared read-only objects are instances of private
+    # subclasses of the data classes.
+    for cls in type(obj).__mro__:
+        if cls in _COMPACT_CLASSES:
+            return cls
+
+    raise TypeError(f"not a WWT Constellations data object: {obj!r}")
+
+
+def to_compact(obj):
+    """
+    Convert a WWT Constellations data object to its compact variant.
+
+    Parameters
+    ----------
+    obj
+        An instance of one of the classes in
+        :mod:`wwt_api_client.constellations.data`, or a list of them. Lists are
+        converted element-by-element.
+
+    Returns
+    -------
+    An equivalent instance of the corresponding compact class, or a list of
+    them.
+    """
+    if isinstance(obj, list):
+        return [to_compact(o) for o in obj]
+
+    compact = _COMPACT_CLASSES[_data_class(obj)]
+    return data._decode(compact, obj.to_dict(encode_json=False))
@@ -5,8 +5,15 @@
 Data classes for WWT Constellations APIs.
 """
 
-from typing import List, Optional
-
+from contextvars import ContextVar
+import functools
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+import typing
+import unicodedata
+
+import dataclasses
 from dataclasses import dataclass, field
 from dataclasses_json import config, dataclass_json
 
@@ -33,6 +40,7 @@ ImageStorage
 ImageSummary
 ImageUpdate
 ImageWwt
+Interner
 SceneAstroPix
 SceneContent
 SceneContentHydrated
@@ -55,13 +63,96 @@ def _make_constellations_licensing():
     return build_spdx_licensing(index)
 
 
-CX_LICENSING = _make_constellations_licensing()
+# Loading the license index takes a substantial fraction of a second, so we
+# don't build ``CX_LICENSING`` until it's actually needed. It is still
+# available as a module attribute thanks to the module ``__getattr__`` below.
+
+_licensing = None
+_licensing_lock = threading.Lock()
+
+
+def _get_licensing():
+    global _licensing
+
+    if _licensing is None:
+        with _licensing_lock:
+            if _licensing is None:
+                _licensing = _make_constellations_licensing()
+
+    return _licensing
+
+
+def __getattr__(name):
+    if name == "CX_LICENSING":
+        return _get_licensing()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _license_errors(expression: str) -> Tuple[str, ...]:
+    """
+    Validate an SPDX license expression, returning a tuple of error messages.
+
+    Bulk uploads tend to use the same handful of licenses over and over, so the
+    results are memoized.
+    """
+    return tuple(_get_licensing().validate(expression, strict=True).errors)
+
+
 CX_SANITIZER_SETTINGS = DEFAULT_SETTINGS.copy()
 CX_SANITIZER_SETTINGS.update(
     tags={"b", "strong", "i", "em", "a", "br"}, empty=set(), separate=set()
 )
 CX_SANITIZER = Sanitizer(settings=CX_SANITIZER_SETTINGS)
 
+# Running the full sanitizer means parsing the text with lxml, which is
+# expensive. Most credits are plain text, though, and for those the sanitizer
+# only normalizes Unicode and whitespace, which we can do ourselves. Characters
+# that might be interpreted as markup, or that lxml treats specially, send the
+# text down the full path.
+
+_UNSAFE_TEXT_CHARS = re.compile(r"[<>&\x00-\x08\x0E-\x1F\x7F\uD800-\uDFFF\uFFFE\uFFFF]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _sanitize_plain_text(text: str) -> Optional[str]:
+    """
+    Sanitize *text* the same way that ``CX_SANITIZER`` would, if it is plain
+    text. Returns None if it needs the full sanitizer.
+    """
+    if _UNSAFE_TEXT_CHARS.search(text):
+        return None
+
+    text = unicodedata.normalize("NFKC", text)
+
+    # Normalization can turn things like fullwidth brackets into markup
+    if _UNSAFE_TEXT_CHARS.search(text):
+        return None
+
+    return _WHITESPACE.sub(" ", text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_credits(credits: str) -> str:
+    """
+    Sanitize HTML credits text, with results identical to ``CX_SANITIZER``.
+
+    Results are memoized, since bulk uploads often reuse the same credits.
+    """
+    text = _sanitize_plain_text(credits)
+
+    if text is None:
+        text = CX_SANITIZER.sanitize(credits)
+
+    return text
+
+
+# When this is true, ImageContentPermissions assumes that its credits have
+# already been sanitized. We set it while decoding API responses, since the
+# server only stores sanitized credits.
+_TRUSTED_CREDITS: ContextVar[bool] = ContextVar("_TRUSTED_CREDITS", default=False)
+
 
 def _strip_nulls_in_place(d: dict):
     """
@@ -88,6 +179,308 @@ def _strip_nulls_in_place(d: dict):
     return d
 
 
+# Fast decoding of API responses.
+#
+# ``SomeClass.schema().load(data)`` builds a fresh marshmallow schema on every
+# call and then walks the data generically, which is slow for large responses
+# like timeline pages. Instead, ``_decode`` compiles a decoder function for
+# each class the first time it is needed. The decoders only handle data that
+# are already in exactly the expected form; anything else, including missing
+# required fields, is handed off to the marshmallow path so that coercion and
+# error reporting stay the same.
+
+T = TypeVar("T")
+
+_NoneType = type(None)
+_MISSING = dataclasses.MISSING
+
+
+# typing.get_origin() and typing.get_args() require Python 3.8.
+
+
+def _get_origin(tp):
+    return getattr(tp, "__origin__", None)
+
+
+def _get_args(tp) -> tuple:
+    return getattr(tp, "__args__", ())
+
+
+class _NeedsSlowPath(Exception):
+    pass
+
+
+def _identity(value):
+    return value
+
+
+def _exact_type_converter(tp: type) -> Callable[[Any], Any]:
+    def convert(value):
+        if type(value) is not tp:
+            raise _NeedsSlowPath()
+        return value
+
+    return convert
+
+
+def _convert_float(value):
+    t = type(value)
+    if t is float:
+        return value
+    if t is int:
+        return float(value)
+    raise _NeedsSlowPath()
+
+
+def _make_converter(tp) -> Callable[[Any], Any]:
+    if tp is float:
+        return _convert_float
+
+    if tp in (str, int, bool):
+        return _exact_type_converter(tp)
+
+    if dataclasses.is_dataclass(tp) and hasattr(tp, "schema"):
+        return lambda value: _get_decoder(tp)(value)
+
+    origin = _get_origin(tp)
+    args = _get_args(tp)
+
+    if origin is Union and len(args) == 2 and _NoneType in args:
+        inner = _make_converter(args[0] if args[1] is _NoneType else args[1])
+
+        if inner is _identity:
+            return _identity
+
+        return lambda value: None if value is None else inner(value)
+
+    if origin is list and args:
+        inner = _make_converter(args[0])
+
+        def convert_list(value):
+            if type(value) is not list:
+                raise _NeedsSlowPath()
+            if inner is _identity:
+                return list(value)
+            return [inner(v) for v in value]
+
+        return convert_list
+
+    return _identity
+
+
+def _make_field_converter(name: str, tp) -> Callable[[Any], Any]:
+    if name in _INTERNED_FIELDS:
+        args = _get_args(tp)
+
+        if _get_origin(tp) is Union and len(args) == 2 and _NoneType in args:
+            inner = args[0] if args[1] is _NoneType else args[1]
+        else:
+            inner = tp
+
+        if inner in _INTERNED_CLASSES:
+            return lambda value: (
+                None if value is None else _decode_interned(inner, value)
+            )
+
+    convert = _make_converter(tp)
+
+    if name in _INTERNED_STRING_FIELDS:
+        return lambda value: _intern_string(convert(value))
+
+    return convert
+
+
+def _compile_decoder(cls: Type[T]) -> Callable[[dict], T]:
+    hints = typing.get_type_hints(cls)
+    specs = []
+
+    for f in dataclasses.fields(cls):
+        if not f.init:
+            continue
+
+        key = f.name
+        override = f.metadata.get("dataclasses_json", {}).get("letter_case")
+        if override is not None:
+            key = override(f.name)
+
+        if f.default is not _MISSING:
+            default = lambda d=f.default: d
+        elif f.default_factory is not _MISSING:
+            default = f.default_factory
+        else:
+            default = None
+
+        specs.append(
+            (f.name, key, _make_field_converter(f.name, hints[f.name]), default)
+        )
+
+    # With undefined="EXCLUDE", dataclass_json wraps __init__ in a function
+    # that uses inspect to filter out unknown arguments. That is slow, and we
+    # only ever pass known arguments, so call the original __init__ directly.
+    init = getattr(cls.__init__, "__wrapped__", cls.__init__)
+    new = cls.__new__
+
+    def decode(data: dict) -> T:
+        try:
+            kwargs = {}
+
+            for name, key, convert, default in specs:
+                value = data.get(key, _MISSING)
+
+                if value is _MISSING:
+                    if default is None:
+                        raise _NeedsSlowPath()
+                    kwargs[name] = default()
+                else:
+                    kwargs[name] = convert(value)
+        except (_NeedsSlowPath, AttributeError, TypeError, ValueError):
+            return cls.schema().load(data)
+
+        obj = new(cls)
+        init(obj, **kwargs)
+        return obj
+
+    return decode
+
+
+_DECODERS: Dict[type, Callable[[dict], Any]] = {}
+
+
+def _get_decoder(cls: Type[T]) -> Callable[[dict], T]:
+    decoder = _DECODERS.get(cls)
+
+    if decoder is None:
+        decoder = _DECODERS[cls] = _compile_decoder(cls)
+
+    return decoder
+
+
+def _decode(
+    cls: Type[T],
+    data: dict,
+    trusted: bool = True,
+    interner: Optional["Interner"] = None,
+) -> T:
+    """
+    Decode a JSON dictionary into an instance of the ``dataclass_json`` class
+    *cls*.
+
+    This is equivalent to ``cls.schema().load(data)``, but much faster. If
+    *trusted* is true, as is appropriate for data received from the API
+    server, HTML credits are assumed to already be sanitized. If *interner* is
+    specified, nested objects are shared through it; see :class:`Interner`.
+    """
+    decoder = _get_decoder(cls)
+
+    if interner is not None:
+        if cls in _INTERNED_CLASSES:
+            decoder = functools.partial(_decode_interned, cls)
+
+        decoder = functools.partial(_call_with_interner, interner, decoder)
+
+    return _call_with_trust(trusted, decoder, data)
+
+
+def _call_with_trust(trusted: bool, func: Callable, arg):
+    if _TRUSTED_CREDITS.get() == trusted:
+        return func(arg)
+
+    token = _TRUSTED_CREDITS.set(trusted)
+
+    try:
+        return func(arg)
+    finally:
+        _TRUSTED_CREDITS.reset(token)
+
+
+# Fast encoding of request bodies.
+#
+# ``_strip_nulls_in_place(obj.to_dict())`` builds the complete dictionary and
+# then walks it a second time to delete the nulls, and doesn't look inside
+# lists. ``_encode`` instead compiles an encoder function for each class that
+# skips None-valued fields as it goes, including in dataclasses nested inside
+# lists.
+
+
+def _encode_value(value):
+    if dataclasses.is_dataclass(value):
+        return _get_encoder(type(value))(value)
+
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+
+    if isinstance(value, dict):
+        return {k: _encode_value(v) for k, v in value.items() if v is not None}
+
+    return value
+
+
+def _make_encoder_converter(tp) -> Optional[Callable[[Any], Any]]:
+    """
+    Get a function to encode values of type *tp*, or None if they can be used
+    as-is.
+    """
+    if tp in (str, int, float, bool):
+        return None
+
+    origin = _get_origin(tp)
+    args = _get_args(tp)
+
+    if origin is Union and len(args) == 2 and _NoneType in args:
+        return _make_encoder_converter(args[0] if args[1] is _NoneType else args[1])
+
+    return _encode_value
+
+
+def _compile_encoder(cls: type) -> Callable[[Any], dict]:
+    hints = typing.get_type_hints(cls)
+    specs = []
+
+    for f in dataclasses.fields(cls):
+        key = f.name
+        override = f.metadata.get("dataclasses_json", {}).get("letter_case")
+        if override is not None:
+            key = override(f.name)
+
+        specs.append((f.name, key, _make_encoder_converter(hints[f.name])))
+
+    def encode(obj) -> dict:
+        d = {}
+
+        for name, key, convert in specs:
+            value = getattr(obj, name)
+
+            if value is not None:
+                d[key] = value if convert is None else convert(value)
+
+        return d
+
+    return encode
+
+
+_ENCODERS: Dict[type, Callable[[Any], dict]] = {}
+
+
+def _get_encoder(cls: type) -> Callable[[Any], dict]:
+    encoder = _ENCODERS.get(cls)
+
+    if encoder is None:
+        encoder = _ENCODERS[cls] = _compile_encoder(cls)
+
+    return encoder
+
+
+def _encode(obj) -> dict:
+    """
+    Encode the ``dataclass_json`` object *obj* into a JSON dictionary for
+    sending to the API.
+
+    This is equivalent to ``_strip_nulls_in_place(obj.to_dict())``, except
+    that it is faster and also removes None values from objects inside lists.
+    """
+    return _get_encoder(type(obj))(obj)
+
+
 @dataclass_json(undefined="EXCLUDE")
 @dataclass
 class HandleInfo:
@@ -180,12 +573,12 @@ class ImageContentPermissions:
     credits: Optional[str] = None
 
     def __post_init__(self):
-        license_info = CX_LICENSING.validate(self.license, strict=True)
-        if license_info.errors:
-            msg = "\n".join(license_info.errors)
+        errors = _license_errors(self.license)
+        if errors:
+            msg = "\n".join(errors)
             raise ExpressionError(f"Invalid SPDX license:\n{msg}")
-        if self.credits:
-            self.credits = CX_SANITIZER.sanitize(self.credits)
+        if self.credits and not _TRUSTED_CREDITS.get():
+            self.credits = _sanitize_credits(self.credits)
 
 
 @dataclass_json(undefined="EXCLUDE")
@@ -302,6 +695,416 @@ class SceneHydrated:
     astropix: Optional[SceneAstroPix] = None
 
 
+# Interning of repeated objects.
+#
+# Timeline pages repeat the same handle information, and the same builtin
+# background images, in scene after scene. When decoding with an ``Interner``,
+# each distinct value of those fields is decoded once and then shared. The
+# shared instances are made read-only, since a modification through one scene
+# would otherwise silently show up in all of the others. Image layers are not
+# interned, since they rarely repeat and hashing them costs about as much as
+# decoding them.
+
+# Interned classes and the fields that identify their instances.
+_INTERNED_CLASSES = {HandleInfo: "handle", ImageDisplayInfo: "id"}
+_INTERNED_FIELDS = frozenset(["handle", "background"])
+_INTERNED_STRING_FIELDS = frozenset(["handle_id"])
+
+_INTERNER: ContextVar[Optional["Interner"]] = ContextVar("_INTERNER", default=None)
+
+
+class Interner:
+    """
+    A pool of shared objects for decoding API responses.
+
+    Pass an interner to timeline methods such as
+    :meth:`~wwt_api_client.constellations.handles.HandleClient.get_timeline` or
+    :meth:`~wwt_api_client.constellations.handles.HandleClient.crawl_timeline`
+    to have identical scene handles (:class:`HandleInfo`) and backgrounds
+    (:class:`ImageDisplayInfo`) be decoded only once, and then shared among all
+    of the scenes that contain them. Repeated strings, such as ``handle_id``,
+    are shared as well. Reusing
+    the same interner across calls extends this sharing across pages. This
+    saves both decoding time and memory when crawling long timelines.
+
+    Objects are identified by their complete contents, so an object that
+    changes between API calls is not merged with its earlier version. Shared
+    objects are read-only: assigning to their fields raises
+    :exc:`dataclasses.FrozenInstanceError`. Use :func:`dataclasses.replace` or
+    :func:`copy.copy` to obtain a regular, modifiable copy.
+
+    An interner holds on to every distinct object that it has seen until it is
+    cleared or discarded.
+    """
+
+    def __init__(self):
+        self._objects = {}
+        self._strings = {}
+
+    def __len__(self) -> int:
+        """
+        The number of distinct objects in the pool.
+        """
+        return len(self._objects)
+
+    def clear(self):
+        """
+        Remove all objects from the pool.
+        """
+        self._objects.clear()
+        self._strings.clear()
+
+    def _intern(self, cls: type, data: dict):
+        # The frozen data is part of the key, rather than just its hash, so that
+        # objects whose hashes collide are never confused.
+        key = (
+            cls,
+            data.get(_INTERNED_CLASSES[cls]),
+            _TRUSTED_CREDITS.get(),
+            _freeze_json(data),
+        )
+        obj = self._objects.get(key)
+
+        if obj is None:
+            obj = _make_read_only(_get_decoder(cls)(data))
+            obj = self._objects.setdefault(key, obj)
+
+        return obj
+
+
+def _freeze_json(value):
+    """
+    Convert a JSON value into a hashable equivalent.
+
+    Scalars are left alone, so values like ``1`` and ``True`` are equivalent.
+    That's OK, since they decode to the same thing wherever one of them is
+    valid.
+    """
+    t = type(value)
+
+    if t is dict:
+        return tuple(
+            [
+                (k, _freeze_json(v) if type(v) in _CONTAINER_TYPES else v)
+                for k, v in value.items()
+            ]
+        )
+    if t is list:
+        return (list,) + tuple([_freeze_json(v) for v in value])
+
+    return value
+
+
+_CONTAINER_TYPES = (dict, list)
+
+
+def _intern_string(value):
+    interner = _INTERNER.get()
+
+    if interner is None or type(value) is not str:
+        return value
+
+    return interner._strings.setdefault(value, value)
+
+
+def _decode_interned(cls: type, data):
+    interner = _INTERNER.get()
+
+    if interner is None:
+        return _get_decoder(cls)(data)
+
+    return interner._intern(cls, data)
+
+
+def _call_with_interner(interner: Optional[Interner], func: Callable, arg):
+    if _INTERNER.get() is interner:
+        return func(arg)
+
+    token = _INTERNER.set(interner)
+
+    try:
+        return func(arg)
+    finally:
+        _INTERNER.reset(token)
+
+
+class _ReadOnlyList(list):
+    """
+    A list inside a shared, read-only object. It compares equal to regular
+    lists, but can't be modified. Copies of it are regular lists.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("cannot modify a list inside a shared object")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _rebuild_dataclass(cls: type, state: dict):
+    obj = object.__new__(cls)
+    obj.__dict__.update(state)
+    return obj
+
+
+_READ_ONLY_CLASSES: Dict[type, Tuple[type, Tuple[str, ...], Tuple[str, ...]]] = {}
+_READ_ONLY_TYPES = set()
+
+
+def _read_only_class(cls: type) -> Tuple[type, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Get the read-only variant of *cls*, the names of its fields that can
+    contain nested dataclass objects, and the names of its fields that can
+    contain lists.
+    """
+    info = _READ_ONLY_CLASSES.get(cls)
+    if info is not None:
+        return info
+
+    hints = typing.get_type_hints(cls)
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    nested = []
+    lists = []
+
+    for name in names:
+        tp = hints[name]
+        args = _get_args(tp)
+
+        if _get_origin(tp) is Union and len(args) == 2 and _NoneType in args:
+            tp = args[0] if args[1] is _NoneType else args[1]
+
+        if dataclasses.is_dataclass(tp):
+            nested.append(name)
+        elif _get_origin(tp) is list:
+            lists.append(name)
+
+    def __new__(ro_cls, *args, **kwargs):
+        # Constructing the read-only class, as dataclasses.replace() does,
+        # yields a regular, modifiable object
+        return cls(*args, **kwargs)
+
+    def __setattr__(self, name, value):
+        raise dataclasses.FrozenInstanceError(
+            f"cannot assign to field {name!r} of a shared {cls.__name__}"
+        )
+
+    def __delattr__(self, name):
+        raise dataclasses.FrozenInstanceError(
+            f"cannot delete field {name!r} of a shared {cls.__name__}"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, cls):
+            return NotImplemented
+
+        return all(getattr(self, n) == getattr(other, n) for n in names)
+
+    def __reduce__(self):
+        # Pickle and copy as a regular, modifiable object. Calling the
+        # constructor would run __post_init__ again, and sanitize credits that
+        # were decoded as trusted.
+        return (_rebuild_dataclass, (cls, dict(self.__dict__)))
+
+    ro = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+            "__new__": __new__,
+            "__setattr__": __setattr__,
+            "__delattr__": __delattr__,
+            "__eq__": __eq__,
+            # Like the regular dataclasses, which aren't frozen
+            "__hash__": None,
+            "__reduce__": __reduce__,
+        },
+    )
+    _READ_ONLY_TYPES.add(ro)
+    info = _READ_ONLY_CLASSES[cls] = (ro, tuple(nested), tuple(lists))
+    return info
+
+
+def _make_read_only(obj):
+    """
+    Make a freshly decoded dataclass object, and the dataclass objects and
+    lists nested inside it, read-only.
+    """
+    if type(obj) in _READ_ONLY_TYPES:
+        return obj
+
+    ro, nested, lists = _read_only_class(type(obj))
+    d = obj.__dict__
+
+    for name in nested:
+        value = d.get(name)
+
+        if value is not None:
+            _make_read_only(value)
+
+    for name in lists:
+        value = d.get(name)
+
+        if value is not None:
+            d[name] = _ReadOnlyList(
+                [
+                    _make_read_only(v) if dataclasses.is_dataclass(v) else v
+                    for v in value
+                ]
+            )
+
+    obj.__class__ = ro
+    return obj
+
+
+# Lazy decoding of hydrated scenes.
+#
+# Most of the cost of decoding a hydrated scene is in its nested image
+# information, which many consumers never look at. A lazily-decoded scene
+# decodes its scalar fields and place up front, but holds on to the raw JSON for
+# the other sub-objects and only decodes them when they're first accessed.
+
+
+class _LazyField:
+    def __init__(self, name: str, convert: Callable, default: Any):
+        self.name = name
+        self.convert = convert
+        self.default = default
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+
+        d = obj.__dict__
+
+        try:
+            return d[self.name]
+        except KeyError:
+            pass
+
+        value = obj._lazy_raw.get(self.name, _MISSING)
+
+        if value is _MISSING:
+            if self.default is _MISSING:
+                raise AttributeError(f"scene {obj.id} has no {self.name!r} information")
+            value = self.default
+        else:
+            convert = self.convert
+
+            if obj._lazy_interner is not None:
+                convert = functools.partial(
+                    _call_with_interner, obj._lazy_interner, convert
+                )
+
+            value = _call_with_trust(obj._lazy_trusted, convert, value)
+
+        d[self.name] = value
+        obj._lazy_raw.pop(self.name, None)
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+        raw = obj.__dict__.get("_lazy_raw")
+
+        if raw is not None:
+            raw.pop(self.name, None)
+
+
+class _LazySceneHydrated(SceneHydrated):
+    """
+    A :class:`SceneHydrated` whose nested sub-objects are decoded on demand.
+
+    This class is an implementation detail, so constructing it, as
+    :func:`dataclasses.replace` does, yields a regular :class:`SceneHydrated`,
+    and its objects are copied and pickled as regular ones too.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return SceneHydrated(*args, **kwargs)
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{f.name}={getattr(self, f.name)!r}"
+            for f in dataclasses.fields(SceneHydrated)
+            if f.repr
+        )
+        return f"{SceneHydrated.__qualname__}({fields})"
+
+    def __eq__(self, other):
+        if not isinstance(other, SceneHydrated):
+            return NotImplemented
+
+        return all(
+            getattr(self, f.name) == getattr(other, f.name)
+            for f in dataclasses.fields(SceneHydrated)
+        )
+
+    def __reduce__(self):
+        # Pickle and copy as a regular, fully decoded scene
+        return (
+            SceneHydrated,
+            tuple(getattr(self, f.name) for f in dataclasses.fields(SceneHydrated)),
+        )
+
+
+_LAZY_SCENE_FIELDS = ("handle", "content", "previews", "astropix")
+
+
+def _init_lazy_scene_class():
+    hints = typing.get_type_hints(SceneHydrated)
+    eager = {}
+
+    for f in dataclasses.fields(SceneHydrated):
+        convert = _make_field_converter(f.name, hints[f.name])
+
+        if f.name in _LAZY_SCENE_FIELDS:
+            field_obj = _LazyField(f.name, convert, f.default)
+            setattr(_LazySceneHydrated, f.name, field_obj)
+        else:
+            eager[f.name] = convert
+
+    return eager
+
+
+_EAGER_SCENE_FIELDS = _init_lazy_scene_class()
+
+
+def _decode_eager_scene_fields(d: dict, data: dict):
+    for name, convert in _EAGER_SCENE_FIELDS.items():
+        d[name] = convert(data[name])
+
+
+def _decode_lazy_scene(
+    data: dict, trusted: bool = True, interner: Optional[Interner] = None
+) -> SceneHydrated:
+    """
+    Decode a JSON dictionary into a :class:`SceneHydrated` whose nested content
+    is only decoded when it is accessed.
+
+    The returned object behaves like a regular :class:`SceneHydrated`, except
+    that errors in the lazily-decoded fields are only detected when those
+    fields are accessed. If the eagerly-decoded fields can't be handled by the
+    fast path, a regular, fully decoded object is returned. If *interner* is
+    specified, it is used whenever the scene's fields are decoded.
+    """
+    obj = object.__new__(_LazySceneHydrated)
+    eager = functools.partial(_decode_eager_scene_fields, obj.__dict__)
+
+    try:
+        _call_with_interner(interner, eager, data)
+    except (_NeedsSlowPath, AttributeError, KeyError, TypeError, ValueError):
+        return _decode(SceneHydrated, data, trusted=trusted, interner=interner)
+
+    obj._lazy_raw = {k: data[k] for k in _LAZY_SCENE_FIELDS if k in data}
+    obj._lazy_trusted = trusted
+    obj._lazy_interner = interner
+    return obj
+
+
 @dataclass_json(undefined="EXCLUDE")
 @dataclass
 class SceneInfo:
@@ -7,24 +7,37 @@ API client support for WWT Constellations handles.
 Handles are publicly visible "user" or "channel" names in Constellations.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
+import functools
 import html
 import math
-from typing import List, Optional
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import urllib.parse
 
 from wwt_data_formats.enums import DataSetType
+from wwt_data_formats.folder import Folder
 from wwt_data_formats.imageset import ImageSet
 from wwt_data_formats.place import Place
 
-from . import CxClient, TimelineResponse
+from . import (
+    CxClient,
+    _check_page_num,
+    _check_page_size,
+    _crawl_timeline,
+    _decode_scene,
+    _decode_timeline,
+    _iter_paginated,
+)
 from .data import (
     HandleInfo,
     HandlePermissions,
     HandleStats,
     HandleUpdate,
     ImageWwt,
+    Interner,
     ImageContentPermissions,
     ImageStorage,
     ImageSummary,
@@ -34,12 +47,13 @@ from .data import (
     SceneImageLayer,
     SceneInfo,
     ScenePlace,
-    _strip_nulls_in_place,
+    _decode,
 )
 
 __all__ = """
 AddImageRequest
 AddSceneRequest
+BulkProgress
 HandleClient
 """.split()
 
@@ -97,6 +111,241 @@ class SceneInfoResponse:
     results: List[SceneInfo]
 
 
+def _image_request_from_set(
+    imageset: ImageSet,
+    copyright: str,
+    license_spdx_id: str,
+    note: Optional[str] = None,
+    credits: Optional[str] = None,
+    alt_text: Optional[str] = None,
+) -> AddImageRequest:
+    """
+    Build the API request to add a Constellations image derived from a WWT
+    imageset. See :meth:`HandleClient.add_image_from_set`.
+    """
+
+    if imageset.data_set_type != DataSetType.SKY:
+        raise ValueError(
+            f"Constellations imagesets must be of Sky type; this is {imageset.data_set_type}"
+        )
+    if imageset.base_tile_level != 0:
+        raise ValueError(f"Constellations imagesets must have base tile levels of 0")
+
+    api_wwt = ImageWwt(
+        base_degrees_per_tile=imageset.base_degrees_per_tile,
+        bottoms_up=imageset.bottoms_up,
+        center_x=imageset.center_x,
+        center_y=imageset.center_y,
+        file_type=imageset.file_type,
+        offset_x=imageset.offset_x,
+        offset_y=imageset.offset_y,
+        projection=imageset.projection.value,
+        quad_tree_map=imageset.quad_tree_map or "",
+        rotation=imageset.rotation_deg,
+        tile_levels=imageset.tile_levels,
+        width_factor=imageset.width_factor,
+        thumbnail_url=imageset.thumbnail_url,
+    )
+
+    storage = ImageStorage(
+        legacy_url_template=imageset.url,
+    )
+
+    if credits is None:
+        credits = html.escape(imageset.credits)
+
+    permissions = ImageContentPermissions(
+        copyright=copyright,
+        credits=credits,
+        license=license_spdx_id,
+    )
+
+    if note is None:
+        note = imageset.name
+
+        if imageset.credits_url:
+            note += f" — {imageset.credits_url}"
+
+    return AddImageRequest(
+        wwt=api_wwt,
+        permissions=permissions,
+        storage=storage,
+        note=note,
+        alt_text=alt_text,
+    )
+
+
+def _place_imagesets(place: Place) -> List[ImageSet]:
+    """
+    Get the imagesets referenced by a place, in the order that they should
+    appear as Constellations image layers.
+    """
+    return [
+        iset
+        for iset in [
+            place.background_image_set,
+            place.image_set,
+            place.foreground_image_set,
+        ]
+        if iset is not None
+    ]
+
+
+def _scene_request_from_place(
+    place: Place, image_ids: List[str], publish: bool
+) -> AddSceneRequest:
+    """
+    Build the API request to add a Constellations scene derived from a WWT
+    place. The *image_ids* are the Constellations IDs corresponding to each of
+    the imagesets returned by :func:`_place_imagesets`. See
+    :meth:`HandleClient.add_scene_from_place`.
+    """
+
+    image_layers = []
+    outgoing_url = None
+    text = None
+
+    for iset, image_id in zip(_place_imagesets(place), image_ids):
+        if iset.credits_url is not None:
+            outgoing_url = iset.credits_url
+
+        if iset.description:
+            # This field is not used by the stock WWT implementation but is
+            # referenced in the original docs, and provided by
+            # wwt_data_formats. So just in case one exists, we can start
+            # using it.
+            text = iset.description
+
+        image_layers.append(SceneImageLayer(image_id=image_id, opacity=1.0))
+
+    # Now we can build the rest
+
+    api_place = ScenePlace(
+        ra_rad=place.ra_hr * H2R,
+        dec_rad=place.dec_deg * D2R,
+        roll_rad=place.rotation_deg * D2R,
+        roi_height_deg=place.zoom_level / 6,
+        roi_aspect_ratio=1.0,
+    )
+
+    content = SceneContent(image_layers=image_layers)
+
+    if place.description:
+        text = place.description
+    elif not text:
+        text = place.name
+
+    return AddSceneRequest(
+        place=api_place,
+        content=content,
+        text=text,
+        outgoing_url=outgoing_url,
+        published=publish,
+    )
+
+
+def _folder_imagesets(folder: Folder, download: bool) -> List[ImageSet]:
+    """
+    Get all of the imagesets referenced in a folder, including ones referenced
+    by places, recursing into subfolders. Imagesets with duplicate URLs are
+    dropped.
+    """
+    isets = []
+    seen_urls = set()
+
+    for _depth, _path, item in folder.walk(download=download):
+        if isinstance(item, ImageSet):
+            candidates = [item]
+        elif isinstance(item, Place):
+            candidates = _place_imagesets(item)
+        else:
+            continue
+
+        for iset in candidates:
+            if iset.url not in seen_urls:
+                seen_urls.add(iset.url)
+                isets.append(iset)
+
+    return isets
+
+
+def _folder_places(folder: Folder, download: bool) -> List[Place]:
+    """
+    Get all of the places in a folder, recursing into subfolders.
+    """
+    return [
+        item
+        for _depth, _path, item in folder.walk(download=download)
+        if isinstance(item, Place)
+    ]
+
+
+@dataclass
+class BulkProgress:
+    """
+    Progress information about a bulk operation such as
+    :meth:`HandleClient.add_images_from_folder` or
+    :meth:`HandleClient.add_scenes_from_places`.
+    """
+
+    total: int
+    "The total number of items to be processed."
+
+    completed: int
+    "The number of items processed so far, including skips and failures."
+
+    skipped: int
+    "The number of items that were skipped because no work was needed."
+
+    failed: int
+    "The number of items whose processing failed."
+
+    elapsed: float
+    "The number of seconds since the operation started."
+
+    @property
+    def throughput(self) -> float:
+        "The number of items processed per second, not counting skips."
+        if self.elapsed <= 0:
+            return 0.0
+        return (self.completed - self.skipped) / self.elapsed
+
+
+class _BulkTracker:
+    def __init__(self, total: int, callback: Optional[Callable[[BulkProgress], None]]):
+        self._callback = callback
+        self._start = time.monotonic()
+        self.total = total
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def skip(self):
+        self.skipped += 1
+        self._advance()
+
+    def succeed(self):
+        self._advance()
+
+    def fail(self):
+        self.failed += 1
+        self._advance()
+
+    def _advance(self):
+        self.completed += 1
+
+        if self._callback is not None:
+            self._callback(
+                BulkProgress(
+                    total=self.total,
+                    completed=self.completed,
+                    skipped=self.skipped,
+                    failed=self.failed,
+                    elapsed=time.monotonic() - self._start,
+                )
+            )
+
+
 class HandleClient:
     """
     A client for the WWT Constellations APIs calls related to a specific handle.
@@ -110,6 +359,7 @@ class HandleClient:
     """
 
     client: CxClient
+    _handle: str
     _url_base: str
 
     def __init__(
@@ -118,6 +368,7 @@ class HandleClient:
         handle: str,
     ):
         self.client = client
+        self._handle = handle
         self._url_base = "/handle/" + urllib.parse.quote(handle)
 
     def get(self) -> HandleInfo:
@@ -133,10 +384,7 @@ class HandleClient:
         This method corresponds to the
         :ref:`endpoint-GET-handle-_handle` API endpoint.
         """
-        resp = self.client._send_and_check(self._url_base, http_method="GET")
-        resp = resp.json()
-        resp.pop("error")
-        return HandleInfo.schema().load(resp)
+        return self.client._get_metadata("handle", HandleInfo, self._url_base)
 
     def permissions(self) -> HandlePermissions:
         """
@@ -154,12 +402,9 @@ class HandleClient:
         and how to use this API. In most cases you should not use it, and just
         go ahead and attempt whatever operation wish to perform.
         """
-        resp = self.client._send_and_check(
-            self._url_base + "/permissions", http_method="GET"
+        return self.client._get_metadata(
+            "handle", HandlePermissions, self._url_base + "/permissions"
         )
-        resp = resp.json()
-        resp.pop("error")
-        return HandlePermissions.schema().load(resp)
 
     def stats(self) -> HandleStats:
         """
@@ -174,10 +419,8 @@ class HandleClient:
         This method corresponds to the :ref:`endpoint-GET-handle-_handle-stats`
         API endpoint. Only administrators of a handle can retrieve its stats.
         """
-        resp = self.client._send_and_check(self._url_base + "/stats", http_method="GET")
-        resp = resp.json()
-        resp.pop("error")
-        return HandleStats.schema().load(resp)
+        resp = self.client._send_and_parse(self._url_base + "/stats", http_method="GET")
+        return _decode(HandleStats, resp)
 
     def scene_info(
         self, page_num: int, page_size: Optional[int] = 10
@@ -205,27 +448,74 @@ class HandleClient:
         API endpoint. Only administrators of a handle can retrieve the scene info.
         This API returns paginated results.
         """
-        try:
-            use_page_num = int(page_num)
-            assert use_page_num >= 0
-        except Exception:
-            raise ValueError(f"invalid page_num argument {page_num!r}")
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+        return self._scene_info_page(use_page_num, use_page_size).results
 
-        try:
-            use_page_size = int(page_size)
-            assert use_page_size >= 1 and use_page_size <= 100
-        except Exception:
-            raise ValueError(f"invalid page_size argument {page_size!r}")
+    def _scene_info_page(self, page_num: int, page_size: int) -> SceneInfoResponse:
+        resp = self.client._send_and_parse(
+            self._url_base + "/sceneinfo",
+            http_method="GET",
+            params={"page": page_num, "pagesize": page_size},
+        )
+        return _decode(SceneInfoResponse, resp)
 
-        resp = self.client._send_and_check(
+    def scene_info_stream(
+        self, page_num: int, page_size: Optional[int] = 10
+    ) -> Iterator[SceneInfo]:
+        """
+        Get administrative info about scenes belonging to this handle, decoding
+        each item as soon as it is received.
+
+        This is the same as :meth:`scene_info`, except that it returns a
+        generator. The API call is made when iteration begins, and the
+        response is parsed incrementally, so that the whole page never needs
+        to be held in memory. See
+        :mod:`wwt_api_client.constellations.serialization`.
+        """
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+        items = self.client._send_and_stream(
             self._url_base + "/sceneinfo",
             http_method="GET",
             params={"page": use_page_num, "pagesize": use_page_size},
         )
-        resp = resp.json()
-        resp.pop("error")
-        # For now (?) we just throw away the total count field
-        return SceneInfoResponse.schema().load(resp).results
+        return (_decode(SceneInfo, item) for item in items)
+
+    def iter_scene_info(
+        self, page_size: int = 100, prefetch: bool = True
+    ) -> Iterator[SceneInfo]:
+        """
+        Iterate over administrative info about all scenes belonging to this
+        handle.
+
+        Parameters
+        ----------
+        page_size : optional int, defaults to 100
+            The number of items to retrieve per API call. Valid values are
+            between 1 and 100.
+        prefetch : optional bool, defaults to True
+            If true, each page of results is requested in a background thread
+            while the caller is processing the items of the previous page.
+
+        Returns
+        -------
+        A generator of :class:`~wwt_api_client.constellations.data.SceneInfo`
+        items, most recently created first.
+
+        Notes
+        -----
+        This method repeatedly calls the
+        :ref:`endpoint-GET-handle-_handle-sceneinfo` API endpoint, using the
+        total count of scenes that it reports to determine when to stop. See
+        :meth:`scene_info`.
+        """
+        use_page_size = _check_page_size(page_size)
+        return _iter_paginated(
+            lambda page_num: self._scene_info_page(page_num, use_page_size),
+            use_page_size,
+            prefetch,
+        )
 
     def image_info(
         self, page_num: int, page_size: Optional[int] = 10
@@ -253,27 +543,71 @@ class HandleClient:
         API endpoint. Only administrators of a handle can retrieve the image info.
         This API returns paginated results.
         """
-        try:
-            use_page_num = int(page_num)
-            assert use_page_num >= 0
-        except Exception:
-            raise ValueError(f"invalid page_num argument {page_num!r}")
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+        return self._image_info_page(use_page_num, use_page_size).results
 
-        try:
-            use_page_size = int(page_size)
-            assert use_page_size >= 1 and use_page_size <= 100
-        except Exception:
-            raise ValueError(f"invalid page_size argument {page_size!r}")
+    def _image_info_page(self, page_num: int, page_size: int) -> ImageInfoResponse:
+        resp = self.client._send_and_parse(
+            self._url_base + "/imageinfo",
+            http_method="GET",
+            params={"page": page_num, "pagesize": page_size},
+        )
+        return _decode(ImageInfoResponse, resp)
 
-        resp = self.client._send_and_check(
+    def image_info_stream(
+        self, page_num: int, page_size: Optional[int] = 10
+    ) -> Iterator[ImageSummary]:
+        """
+        Get administrative info about images belonging to this handle, decoding
+        each item as soon as it is received.
+
+        This is the same as :meth:`image_info`, except that it returns a
+        generator. See :meth:`scene_info_stream`.
+        """
+        use_page_num = _check_page_num(page_num)
+        use_page_size = _check_page_size(page_size)
+        items = self.client._send_and_stream(
             self._url_base + "/imageinfo",
             http_method="GET",
             params={"page": use_page_num, "pagesize": use_page_size},
         )
-        resp = resp.json()
-        resp.pop("error")
-        # For now (?) we just throw away the total count field
-        return ImageInfoResponse.schema().load(resp).results
+        return (_decode(ImageSummary, item) for item in items)
+
+    def iter_image_info(
+        self, page_size: int = 100, prefetch: bool = True
+    ) -> Iterator[ImageSummary]:
+        """
+        Iterate over administrative info about all images belonging to this
+        handle.
+
+        Parameters
+        ----------
+        page_size : optional int, defaults to 100
+            The number of items to retrieve per API call. Valid values are
+            between 1 and 100.
+        prefetch : optional bool, defaults to True
+            If true, each page of results is requested in a background thread
+            while the caller is processing the items of the previous page.
+
+        Returns
+        -------
+        A generator of :class:`~wwt_api_client.constellations.data.ImageSummary`
+        items, most recently created first.
+
+        Notes
+        -----
+        This method repeatedly calls the
+        :ref:`endpoint-GET-handle-_handle-imageinfo` API endpoint, using the
+        total count of images that it reports to determine when to stop. See
+        :meth:`image_info`.
+        """
+        use_page_size = _check_page_size(page_size)
+        return _iter_paginated(
+            lambda page_num: self._image_info_page(page_num, use_page_size),
+            use_page_size,
+            prefetch,
+        )
 
     def update(self, updates: HandleUpdate):
         """
@@ -288,13 +622,12 @@ class HandleClient:
         This method corresponds to the :ref:`endpoint-PATCH-handle-_handle` API
         endpoint.
         """
-        resp = self.client._send_and_check(
+        resp = self.client._send_and_parse(
             self._url_base,
             http_method="PATCH",
-            json=_strip_nulls_in_place(updates.to_dict()),
+            json=updates,
         )
-        resp = resp.json()
-        resp.pop("error")
+        self.client._invalidate_cached(self._url_base)
         # Might as well return the response, although it's currently vacuous
         return resp
 
@@ -311,14 +644,16 @@ class HandleClient:
         This method corresponds to the
         :ref:`endpoint-POST-handle-_handle-image` API endpoint.
         """
-        resp = self.client._send_and_check(
+        resp = self.client._send_and_parse(
             self._url_base + "/image",
             http_method="POST",
-            json=_strip_nulls_in_place(image.to_dict()),
+            json=image,
         )
-        resp = resp.json()
-        resp.pop("error")
-        resp = AddImageResponse.schema().load(resp)
+        resp = _decode(AddImageResponse, resp)
+
+        if image.storage.legacy_url_template is not None:
+            self.client._invalidate_wwt_url(image.storage.legacy_url_template)
+
         return resp.id
 
     def add_image_from_set(
@@ -381,59 +716,121 @@ class HandleClient:
         Not all of the imageset information is preserved.
         """
 
-        if imageset.data_set_type != DataSetType.SKY:
-            raise ValueError(
-                f"Constellations imagesets must be of Sky type; this is {imageset.data_set_type}"
-            )
-        if imageset.base_tile_level != 0:
-            raise ValueError(
-                f"Constellations imagesets must have base tile levels of 0"
-            )
-
-        api_wwt = ImageWwt(
-            base_degrees_per_tile=imageset.base_degrees_per_tile,
-            bottoms_up=imageset.bottoms_up,
-            center_x=imageset.center_x,
-            center_y=imageset.center_y,
-            file_type=imageset.file_type,
-            offset_x=imageset.offset_x,
-            offset_y=imageset.offset_y,
-            projection=imageset.projection.value,
-            quad_tree_map=imageset.quad_tree_map or "",
-            rotation=imageset.rotation_deg,
-            tile_levels=imageset.tile_levels,
-            width_factor=imageset.width_factor,
-            thumbnail_url=imageset.thumbnail_url,
-        )
-
-        storage = ImageStorage(
-            legacy_url_template=imageset.url,
-        )
-
-        if credits is None:
-            credits = html.escape(imageset.credits)
-
-        permissions = ImageContentPermissions(
-            copyright=copyright,
+        req = _image_request_from_set(
+            imageset,
+            copyright,
+            license_spdx_id,
+            note=note,
             credits=credits,
-            license=license_spdx_id,
+            alt_text=alt_text,
         )
+        return self.add_image(req)
 
-        if note is None:
-            note = imageset.name
+    def add_images_from_folder(
+        self,
+        folder: Folder,
+        copyright: str,
+        license_spdx_id: str,
+        skip_existing: bool = True,
+        max_workers: int = 4,
+        progress: Optional[Callable[[BulkProgress], None]] = None,
+        download: bool = False,
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Add Constellations images for all of the imagesets in a
+        :class:`wwt_data_formats.folder.Folder`.
 
-            if imageset.credits_url:
-                note += f" — {imageset.credits_url}"
+        Parameters
+        ----------
+        folder : :class:`wwt_data_formats.folder.Folder`
+            The WWT folder. Imagesets are gathered from its children, from
+            places among its children, and from subfolders, recursively.
+        copyright : str
+            The copyright statement to apply to all of the images. See
+            :meth:`add_image_from_set`.
+        license_spdx_id : str
+            The SPDX License Identifier of the license to apply to all of the
+            images. See :meth:`add_image_from_set`.
+        skip_existing : optional bool, defaults to True
+            If true, imagesets whose URLs are already associated with a
+            Constellations image are not imported again.
+        max_workers : optional int, defaults to 4
+            The maximum number of images to add simultaneously.
+        progress : optional callable, defaults to None
+            If specified, this function is called with a :class:`BulkProgress`
+            object every time that an imageset has been processed.
+        download : optional bool, defaults to False
+            If true, subfolders that are only linked by URL are downloaded and
+            searched for imagesets as well.
 
-        req = AddImageRequest(
-            wwt=api_wwt,
-            permissions=permissions,
-            storage=storage,
-            note=note,
-            alt_text=alt_text,
-        )
+        Returns
+        -------
+        A dictionary mapping the URL of each imageset to either the
+        Constellations ID of its image, as a string, or the exception that
+        occurred when trying to add it. If *skip_existing* is true, the IDs of
+        preexisting images are included.
 
-        return self.add_image(req)
+        Notes
+        -----
+        Images are created with :meth:`add_image_from_set`, using each
+        imageset's own credits and default note. Imagesets with duplicate URLs
+        are only imported once. The existence checks are performed up-front with
+        a single call to
+        :meth:`~wwt_api_client.constellations.CxClient.find_images_by_wwt_urls`.
+        If that call fails, each imageset is instead checked as it is processed,
+        and a failed check is reported as a failure of that imageset.
+        """
+        isets = _folder_imagesets(folder, download)
+        tracker = _BulkTracker(len(isets), progress)
+        results = {}
+        todo = []
+        existing = {}
+        check_each = False
+
+        if skip_existing:
+            try:
+                existing = self.client.find_images_by_wwt_urls(
+                    [iset.url for iset in isets]
+                )
+            except Exception:
+                check_each = True
+
+        def add(iset: ImageSet) -> Tuple[str, bool]:
+            if check_each:
+                hits = self.client.find_images_by_wwt_urls([iset.url])[iset.url]
+                if hits:
+                    return hits[0].id, True
+
+            return self.add_image_from_set(iset, copyright, license_spdx_id), False
+
+        for iset in isets:
+            hits = existing.get(iset.url)
+
+            if hits:
+                results[iset.url] = hits[0].id
+                tracker.skip()
+            else:
+                todo.append(iset)
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(add, iset): iset.url for iset in todo}
+
+                for future in as_completed(futures):
+                    url = futures[future]
+
+                    try:
+                        results[url], skipped = future.result()
+                    except Exception as e:
+                        results[url] = e
+                        tracker.fail()
+                    else:
+                        if skipped:
+                            tracker.skip()
+                        else:
+                            tracker.succeed()
+
+        return {iset.url: results[iset.url] for iset in isets}
 
     def add_scene(self, scene: AddSceneRequest) -> str:
         """
@@ -448,14 +845,12 @@ class HandleClient:
         This method corresponds to the
         :ref:`endpoint-POST-handle-_handle-scene` API endpoint.
         """
-        resp = self.client._send_and_check(
+        resp = self.client._send_and_parse(
             self._url_base + "/scene",
             http_method="POST",
-            json=_strip_nulls_in_place(scene.to_dict()),
+            json=scene,
         )
-        resp = resp.json()
-        resp.pop("error")
-        resp = AddSceneResponse.schema().load(resp)
+        resp = _decode(AddSceneResponse, resp)
         return resp.id
 
     def add_scene_from_place(self, place: Place, publish=True) -> str:
@@ -477,7 +872,9 @@ class HandleClient:
         Notes
         -----
         The imagesets referenced by the place must already have been imported
-        into the Constellations framework.
+        into the Constellations framework. They are looked up using
+        :meth:`~wwt_api_client.constellations.CxClient.find_images_by_wwt_urls`,
+        so repeated lookups of the same imageset are served from its cache.
 
         Not all of the Place information is preserved.
         """
@@ -485,64 +882,127 @@ class HandleClient:
         # The trick here is that we need to query the API to
         # get the ID(s) for the imageset(s)
 
-        image_layers = []
-        outgoing_url = None
-        text = None
-
-        for iset in [
-            place.background_image_set,
-            place.image_set,
-            place.foreground_image_set,
-        ]:
-            if iset is None:
-                continue
-
-            if iset.credits_url is not None:
-                outgoing_url = iset.credits_url
-
-            if iset.description:
-                # This field is not used by the stock WWT implementation but is
-                # referenced in the original docs, and provided by
-                # wwt_data_formats. So just in case one exists, we can start
-                # using it.
-                text = iset.description
+        isets = _place_imagesets(place)
+        lookups = self.client.find_images_by_wwt_urls([iset.url for iset in isets])
+        image_ids = []
 
-            hits = self.client.find_images_by_wwt_url(iset.url)
+        for iset in isets:
+            hits = lookups[iset.url]
             if not hits:
                 raise Exception(
                     f"unable to find Constellations record for image URL `{iset.url}`"
                 )
 
-            image_layers.append(SceneImageLayer(image_id=hits[0].id, opacity=1.0))
+            image_ids.append(hits[0].id)
 
-        # Now we can build the rest
+        req = _scene_request_from_place(place, image_ids, publish)
+        return self.add_scene(req)
 
-        api_place = ScenePlace(
-            ra_rad=place.ra_hr * H2R,
-            dec_rad=place.dec_deg * D2R,
-            roll_rad=place.rotation_deg * D2R,
-            roi_height_deg=place.zoom_level / 6,
-            roi_aspect_ratio=1.0,
-        )
+    def add_scenes_from_places(
+        self,
+        places: Union[Folder, Iterable[Place]],
+        publish: bool = True,
+        max_workers: int = 4,
+        progress: Optional[Callable[[BulkProgress], None]] = None,
+        download: bool = False,
+    ) -> List[Union[str, Exception]]:
+        """
+        Add new scenes derived from a batch of
+        :class:`wwt_data_formats.place.Place` objects.
 
-        content = SceneContent(image_layers=image_layers)
+        Parameters
+        ----------
+        places : :class:`wwt_data_formats.folder.Folder` or iterable of :class:`wwt_data_formats.place.Place`
+            The WWT places. If a folder is given, the places among its children
+            and in its subfolders, recursively, are used.
+        publish : optional bool, defaults to True
+            Whether or not to publish the newly-created scenes.
+        max_workers : optional int, defaults to 4
+            The maximum number of scenes to add simultaneously.
+        progress : optional callable, defaults to None
+            If specified, this function is called with a :class:`BulkProgress`
+            object every time that a place has been processed.
+        download : optional bool, defaults to False
+            If *places* is a folder and this is true, subfolders that are only
+            linked by URL are downloaded and searched for places as well.
 
-        if place.description:
-            text = place.description
-        elif not text:
-            text = place.name
+        Returns
+        -------
+        A list with one item for each place, in order. Each item is either the
+        Constellations ID of the newly-created scene, as a string, or the
+        exception that occurred when trying to create it.
 
-        req = AddSceneRequest(
-            place=api_place,
-            content=content,
-            text=text,
-            outgoing_url=outgoing_url,
-            published=publish,
-        )
+        Notes
+        -----
+        The imagesets referenced by the places must already have been imported
+        into the Constellations framework. All of them are looked up in a
+        single batched call to
+        :meth:`~wwt_api_client.constellations.CxClient.find_images_by_wwt_urls`
+        before any scenes are created. If that call fails, the imagesets of each
+        place are instead looked up as it is processed, and a failed lookup is
+        reported as a failure of that place. See :meth:`add_scene_from_place`.
+        """
+        if isinstance(places, Folder):
+            places = _folder_places(places, download)
+        else:
+            places = list(places)
 
-        return self.add_scene(req)
+        tracker = _BulkTracker(len(places), progress)
+        results = [None] * len(places)
+        lookups = {}
+        lookup_each = False
 
-    def get_timeline(self, page_num: int) -> List[SceneHydrated]:
+        try:
+            lookups = self.client.find_images_by_wwt_urls(
+                [iset.url for place in places for iset in _place_imagesets(place)]
+            )
+        except Exception:
+            lookup_each = True
+
+        def add(place: Place) -> str:
+            isets = _place_imagesets(place)
+            image_ids = []
+
+            if lookup_each:
+                place_lookups = self.client.find_images_by_wwt_urls(
+                    [iset.url for iset in isets]
+                )
+            else:
+                place_lookups = lookups
+
+            for iset in isets:
+                hits = place_lookups[iset.url]
+                if not hits:
+                    raise Exception(
+                        f"unable to find Constellations record for image URL `{iset.url}`"
+                    )
+
+                image_ids.append(hits[0].id)
+
+            req = _scene_request_from_place(place, image_ids, publish)
+            return self.add_scene(req)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(add, place): index for index, place in enumerate(places)
+            }
+
+            for future in as_completed(futures):
+                index = futures[future]
+
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = e
+                    tracker.fail()
+                else:
+                    tracker.succeed()
+
+        return results
+
+    def get_timeline(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> List[SceneHydrated]:
         """
         Get information about a group of scenes on this handle's timeline.
 
@@ -551,6 +1011,16 @@ class HandleClient:
         page_num : int
             Which page to retrieve. Page zero gives the top items on the
             timeline, page one gives the next set, etc.
+        lazy : optional bool, defaults to False
+            If true, the nested content of each scene (its handle, content,
+            previews, and AstroPix information) is only decoded when it is
+            first accessed. This makes decoding faster for callers that only
+            look at top-level fields such as ``id``, ``text``, ``place``, and
+            ``likes``.
+        interner : optional :class:`~wwt_api_client.constellations.data.Interner`
+            If specified, identical handle and image information objects are
+            shared among the returned scenes, and with any other scenes decoded
+            using the same interner.
 
         Returns
         -------
@@ -566,18 +1036,72 @@ class HandleClient:
         This method corresponds to the
         :ref:`endpoint-GET-handle-_handle-timeline` API endpoint.
         """
-        try:
-            use_page_num = int(page_num)
-            assert use_page_num >= 0
-        except Exception:
-            raise ValueError(f"invalid page_num argument {page_num!r}")
+        use_page_num = _check_page_num(page_num)
+
+        resp = self.client._send_and_parse(
+            self._url_base + "/timeline",
+            http_method="GET",
+            params={"page": use_page_num},
+        )
+        return _decode_timeline(resp, lazy, interner)
 
-        resp = self.client._send_and_check(
+    def get_timeline_stream(
+        self, page_num: int, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> Iterator[SceneHydrated]:
+        """
+        Get information about a group of scenes on this handle's timeline,
+        decoding each scene as soon as it is received.
+
+        This is the same as :meth:`get_timeline`, except that it returns a
+        generator. Fully hydrated scenes are large, so streaming a page of
+        them saves a good deal of memory. See :meth:`scene_info_stream`.
+        """
+        use_page_num = _check_page_num(page_num)
+        items = self.client._send_and_stream(
             self._url_base + "/timeline",
             http_method="GET",
             params={"page": use_page_num},
         )
-        resp = resp.json()
-        resp.pop("error")
-        resp = TimelineResponse.schema().load(resp)
-        return resp.results
+        return (_decode_scene(item, lazy, interner) for item in items)
+
+    def crawl_timeline(
+        self,
+        max_workers: int = 4,
+        max_pages: Optional[int] = None,
+        lazy: bool = False,
+        interner: Optional[Interner] = None,
+    ) -> Iterator[SceneHydrated]:
+        """
+        Iterate over the scenes on this handle's timeline, fetching several
+        pages in parallel.
+
+        Parameters
+        ----------
+        max_workers : optional int, defaults to 4
+            The maximum number of timeline pages to request simultaneously.
+        max_pages : optional int, defaults to None
+            If specified, stop after this many pages of the timeline. Otherwise,
+            the crawl continues until the server returns an empty page.
+        lazy : optional bool, defaults to False
+            If true, decode scenes lazily. See :meth:`get_timeline`.
+        interner : optional :class:`~wwt_api_client.constellations.data.Interner`
+            If specified, share identical nested objects among the scenes. If
+            you crawl the whole timeline, this can save a great deal of memory.
+            See :meth:`get_timeline`.
+
+        Returns
+        -------
+        A generator of
+        :class:`~wwt_api_client.constellations.data.SceneHydrated` items, in
+        timeline order.
+
+        Notes
+        -----
+        Each scene is yielded at most once, even if it appears on more than one
+        page of the timeline. See :meth:`get_timeline`.
+        """
+        return _crawl_timeline(
+            functools.partial(self.get_timeline, lazy=lazy, interner=interner),
+            max_workers,
+            max_pages,
+        )
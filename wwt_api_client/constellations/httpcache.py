@@ -0,0 +1,296 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+Caching of WWT Constellations metadata lookups.
+
+Metadata lookups such as
+:meth:`~wwt_api_client.constellations.handles.HandleClient.get` or
+:meth:`~wwt_api_client.constellations.CxClient.get_builtin_backgrounds` often
+return the same data over and over. The
+:class:`~wwt_api_client.constellations.CxClient` therefore remembers the parsed
+response of each such call along with its ``ETag`` and ``Last-Modified``
+validators. WTML documents, such as those fetched by
+:meth:`~wwt_api_client.constellations.images.ImageClient.imageset_folder`, are
+remembered in the same way. When the call is repeated, the client sends
+``If-None-Match`` and ``If-Modified-Since`` headers, and if the server answers
+with ``304 Not Modified``, the remembered response is reused rather than being
+downloaded again.
+
+If a response comes without any validators, it can't be revalidated. By
+default, such responses are not reused at all. If the client is configured with
+a time-to-live for them, they are instead reused without contacting the server
+until it expires, which means that changes made by others may go unnoticed for
+that long. Parsed WTML documents are remembered as well, and reused without
+contacting the server for as long as the client's *wtml_cache_ttl*. After that,
+they are revalidated, and only parsed again if they have changed.
+:class:`HttpCacheStats` reports how well the cache is working.
+
+The cache is configured when the client is created. It is held in memory, and
+can optionally be saved to disk as well, so that it persists across program
+invocations. Since the cached responses may include information specific to the
+logged-in user, such as their permissions on an item, on-disk caches should not
+be shared between users.
+
+Conditional requests still cost a round trip to the server. Programs that look
+up the same handles, images, and scenes over and over, and can tolerate
+slightly out-of-date information about items that others modify, can also
+enable a cache of decoded metadata objects by passing a
+:class:`MetadataCacheConfig` to the client. Lookups answered from this cache do
+not touch the network at all.
+"""
+
+from dataclasses import dataclass
+import json
+import threading
+from typing import Any, Callable, Hashable, Optional, Tuple, TypeVar
+import urllib.parse
+
+from ..caching import CacheStats, DiskCache, LRUCache
+from .data import _make_read_only
+
+__all__ = """
+HttpCacheStats
+MetadataCacheConfig
+""".split()
+
+T = TypeVar("T")
+
+
+@dataclass
+class HttpCacheStats:
+    """
+    Statistics about the conditional-request cache of a WWT Constellations
+    client.
+    """
+
+    fresh_hits: int
+    """The number of calls answered from the cache without contacting the server,
+    because the cached response had no validators, or was a WTML document, and
+    had not yet expired."""
+
+    revalidated: int
+    """The number of calls for which the server answered ``304 Not Modified``,
+    so that the cached response was reused."""
+
+    misses: int
+    """The number of calls for which a complete response had to be downloaded,
+    either because nothing was cached or because the cached response was
+    stale."""
+
+    entries: int
+    "The number of responses currently held in memory."
+
+
+@dataclass
+class _HttpCacheEntry:
+    body: Any  # parsed JSON, or WTML text
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class _HttpCache:
+    """
+    The storage behind a client's conditional-request cache.
+
+    Entries that have validators are kept until they are evicted, since they are
+    always revalidated before use. Entries that don't are kept for *ttl*
+    seconds, or indefinitely if *ttl* is None, and not at all if *ttl* is zero.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float], path: Optional[str]):
+        self.ttl = ttl
+        self._memory = LRUCache(max_entries)
+        self._disk = None if path is None else DiskCache(path)
+        self._lock = threading.Lock()
+        self._fresh_hits = 0
+        self._revalidated = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[dict]) -> str:
+        if params:
+            url += "?" + urllib.parse.urlencode(sorted(params.items()))
+        return url
+
+    def get(self, key: str) -> Tuple[Optional[_HttpCacheEntry], bool]:
+        """
+        Look up a cached response.
+
+        Returns ``(entry, fresh)``. If *fresh* is true, the entry can be used
+        without contacting the server. Otherwise, if *entry* is not None, it
+        should be revalidated.
+        """
+        entry = self._memory.get(key)
+
+        if entry is None and self._disk is not None:
+            text = self._disk.get(key)
+
+            if text is not None:
+                entry = _HttpCacheEntry(**json.loads(text))
+                self._memory.put(key, entry, self._entry_ttl(entry))
+
+        if entry is None:
+            return None, False
+
+        if entry.has_validators:
+            return entry, False
+
+        self._count("_fresh_hits")
+        return entry, True
+
+    def put(self, key: str, entry: _HttpCacheEntry):
+        ttl = self._entry_ttl(entry)
+
+        if ttl is not None and ttl <= 0:
+            # The entry would be stale immediately, and never be used
+            self.invalidate(key)
+            return
+
+        self._memory.put(key, entry, ttl)
+
+        if self._disk is not None:
+            text = json.dumps(
+                {
+                    "body": entry.body,
+                    "etag": entry.etag,
+                    "last_modified": entry.last_modified,
+                }
+            )
+            self._disk.put(key, text, ttl)
+
+    def record_fresh_hit(self):
+        self._count("_fresh_hits")
+
+    def record_revalidated(self):
+        self._count("_revalidated")
+
+    def record_miss(self):
+        self._count("_misses")
+
+    def invalidate(self, key: str):
+        self._memory.invalidate(key)
+
+        if self._disk is not None:
+            self._disk.invalidate(key)
+
+    def clear(self):
+        self._memory.clear()
+
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> HttpCacheStats:
+        with self._lock:
+            return HttpCacheStats(
+                fresh_hits=self._fresh_hits,
+                revalidated=self._revalidated,
+                misses=self._misses,
+                entries=self._memory.stats().entries,
+            )
+
+    def _entry_ttl(self, entry: _HttpCacheEntry) -> Optional[float]:
+        # LRUCache and DiskCache treat a TTL of None as "use the default", and
+        # their default is to never expire.
+        return None if entry.has_validators else self.ttl
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+@dataclass
+class MetadataCacheConfig:
+    """
+    Settings for the cache of decoded handle, image, and scene metadata kept by
+    a WWT Constellations client.
+
+    The cache covers the ``get()`` and ``permissions()`` methods of
+    :class:`~wwt_api_client.constellations.handles.HandleClient`,
+    :class:`~wwt_api_client.constellations.images.ImageClient`, and
+    :class:`~wwt_api_client.constellations.scenes.SceneClient`. Calling the
+    ``update()`` method of one of those clients discards the cached information
+    about its item, so that a program always sees its own changes. Changes
+    made by others may not be seen until the relevant TTL expires. After that,
+    lookups go through the client's conditional-request cache as usual.
+
+    Objects returned from the cache are shared among all callers, so they are
+    read-only, like those produced by an
+    :class:`~wwt_api_client.constellations.data.Interner`. This extends to the
+    objects and lists nested inside them, such as the ``image_layers`` of a
+    scene's content. Use :func:`copy.deepcopy` to obtain a modifiable copy.
+    """
+
+    max_entries: int = 4096
+    """The maximum number of objects to hold. Once it is exceeded, the
+    least-recently-used objects are discarded."""
+
+    handle_ttl: Optional[float] = 300.0
+    """The number of seconds for which handle information is cached. If None,
+    it is cached until it is evicted or invalidated."""
+
+    image_ttl: Optional[float] = 300.0
+    """The number of seconds for which image information is cached. If None,
+    it is cached until it is evicted or invalidated."""
+
+    scene_ttl: Optional[float] = 60.0
+    """The number of seconds for which scene information is cached. If None, it
+    is cached until it is evicted or invalidated. Scenes include their like and
+    impression counts, which change often, so the default is shorter than for
+    handles and images."""
+
+    def _ttl(self, kind: str) -> Optional[float]:
+        return getattr(self, kind + "_ttl")
+
+
+class _MetadataCache:
+    """
+    The storage behind a client's cache of decoded metadata.
+    """
+
+    def __init__(self, config: MetadataCacheConfig):
+        self.config = config
+        self._cache = LRUCache(config.max_entries)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def lookup(self, kind: str, key: Hashable, fetch: Callable[[], T]) -> T:
+        obj = self._cache.get(key)
+        if obj is not None:
+            return obj
+
+        # If an invalidation happens while we're fetching, what we fetched may
+        # predate it, so it must not be cached. Tracking this with one counter
+        # for the whole cache is conservative, but invalidations are rare.
+        generation = self._generation
+        obj = _make_read_only(fetch())
+
+        with self._lock:
+            if generation == self._generation:
+                self._cache.put(key, obj, self.config._ttl(kind))
+
+        return obj
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            self._generation += 1
+
+            for key in keys:
+                self._cache.invalidate(key)
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
@@ -11,7 +11,11 @@ from wwt_data_formats.folder import Folder
 from wwt_data_formats.imageset import ImageSet
 
 from . import CxClient
-from .data import ImageApiPermissions, ImageInfo, ImageUpdate, _strip_nulls_in_place
+from .data import (
+    ImageApiPermissions,
+    ImageInfo,
+    ImageUpdate,
+)
 
 __all__ = """
 ImageClient
@@ -48,10 +52,7 @@ class ImageClient:
         This method corresponds to the
         :ref:`endpoint-GET-image-_id` API endpoint.
         """
-        resp = self.client._send_and_check(self._url_base, http_method="GET")
-        resp = resp.json()
-        resp.pop("error")
-        return ImageInfo.schema().load(resp)
+        return self.client._get_metadata("image", ImageInfo, self._url_base)
 
     def permissions(self) -> ImageApiPermissions:
         """
@@ -63,12 +64,9 @@ class ImageClient:
         and how to use this API. In most cases you should not use it, and just
         go ahead and attempt whatever operation wish to perform.
         """
-        resp = self.client._send_and_check(
-            self._url_base + "/permissions", http_method="GET"
+        return self.client._get_metadata(
+            "image", ImageApiPermissions, self._url_base + "/permissions"
         )
-        resp = resp.json()
-        resp.pop("error")
-        return ImageApiPermissions.schema().load(resp)
 
     def imageset_wtml_url(self) -> str:
         """
@@ -92,11 +90,18 @@ class ImageClient:
         -------
         :class:`wwt_data_formats.folder.Folder`
 
+        Notes
+        -----
+        The WTML is cached by the client, which only checks it for changes
+        once its *wtml_cache_ttl* has expired, and only parses it again if it
+        has changed. Each call returns a new copy of the folder, so it may be
+        modified freely. See :mod:`wwt_api_client.constellations.httpcache`.
+
         See Also
         --------
         imageset_wtml_url, imageset_object
         """
-        return Folder.from_url(self.imageset_wtml_url())
+        return self.client._get_wtml_folder(self.imageset_wtml_url())
 
     def imageset_object(self) -> ImageSet:
         """
@@ -119,12 +124,11 @@ class ImageClient:
         This method corresponds to the :ref:`endpoint-PATCH-image-_id` API
         endpoint.
         """
-        resp = self.client._send_and_check(
+        resp = self.client._send_and_parse(
             self._url_base,
             http_method="PATCH",
-            json=_strip_nulls_in_place(updates.to_dict()),
+            json=updates,
         )
-        resp = resp.json()
-        resp.pop("error")
+        self.client._invalidate_cached(self._url_base, self._url_base + "/img.wtml")
         # Might as well return the response, although it's currently vacuous
         return resp
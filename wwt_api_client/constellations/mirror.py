@@ -0,0 +1,472 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+A local, SQLite-backed mirror of the contents of a WWT Constellations handle.
+
+Analyses that look at every image or scene belonging to a handle would
+otherwise have to download all of them, page by page, every time that they
+run. A :class:`HandleMirror` saves that information in a local database, and
+keeps it up-to-date incrementally: since the listing APIs return the most
+recently created items first, a sync only needs to walk pages until it reaches
+an item that it already has. Resyncing an unchanged handle costs one API call
+for each kind of information mirrored.
+
+The mirror can hold three kinds of information, named after the
+:class:`~wwt_api_client.constellations.handles.HandleClient` methods that
+retrieve them:
+
+- ``"image_info"``: the :class:`~wwt_api_client.constellations.data.ImageSummary`
+  records returned by
+  :meth:`~wwt_api_client.constellations.handles.HandleClient.image_info`
+- ``"scene_info"``: the :class:`~wwt_api_client.constellations.data.SceneInfo`
+  records returned by
+  :meth:`~wwt_api_client.constellations.handles.HandleClient.scene_info`
+- ``"timeline"``: the :class:`~wwt_api_client.constellations.data.SceneHydrated`
+  records returned by
+  :meth:`~wwt_api_client.constellations.handles.HandleClient.get_timeline`
+
+The first two are only available to administrators of the handle.
+
+An incremental sync only picks up newly created items. Information about
+existing items that can change, such as the number of times that a scene has
+been liked, is only refreshed, and deleted items are only removed, by a full
+sync. See :meth:`HandleMirror.sync`.
+"""
+
+from dataclasses import dataclass
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from . import _check_page_size, _decode_scene
+from .data import ImageSummary, Interner, SceneHydrated, SceneInfo, _decode
+
+__all__ = """
+HandleMirror
+MirrorSyncStats
+""".split()
+
+_MIRROR_KINDS = ("image_info", "scene_info", "timeline")
+
+# The number of rows to load from the database at a time when iterating
+_QUERY_BATCH_SIZE = 1000
+
+# The name of the ID field in the raw JSON of each kind of item
+_ID_KEYS = {
+    "image_info": "_id",
+    "scene_info": "_id",
+    "timeline": "id",
+}
+
+
+@dataclass
+class MirrorSyncStats:
+    """
+    Statistics about a sync of a :class:`HandleMirror`.
+    """
+
+    pages: int
+    "The number of pages of results that were fetched from the API."
+
+    stored: int
+    "The number of items that were added to the mirror or refreshed in it."
+
+    removed: int
+    "The number of items that were removed from the mirror."
+
+
+class HandleMirror:
+    """
+    A local mirror of the images and scenes belonging to a Constellations
+    handle.
+
+    Parameters
+    ----------
+    handle_client : :class:`~wwt_api_client.constellations.handles.HandleClient`
+        The client for the handle to mirror.
+    path : str
+        The path of the SQLite database file in which to store the mirror. It
+        will be created if it does not exist. Mirrors of several handles can
+        share the same file.
+    page_size : optional int, defaults to 100
+        The number of items to request per API call when syncing image and
+        scene info. Valid values are between 1 and 100.
+
+    Notes
+    -----
+    The mirror is empty until :meth:`sync` is called. Queries such as
+    :meth:`iter_image_info` or :meth:`get_scene_info` only consult the local
+    database, and never make API calls.
+    """
+
+    def __init__(
+        self, handle_client: "handles.HandleClient", path: str, page_size: int = 100
+    ):
+        self.handle_client = handle_client
+        self.path = path
+        self.page_size = _check_page_size(page_size)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "handle TEXT NOT NULL, "
+                "kind TEXT NOT NULL, "
+                "id TEXT NOT NULL, "
+                "creation_date TEXT NOT NULL, "
+                "data BLOB NOT NULL, "
+                "PRIMARY KEY (handle, kind, id))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS items_by_date "
+                "ON items (handle, kind, creation_date, id)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "handle TEXT NOT NULL, "
+                "kind TEXT NOT NULL, "
+                "complete INTEGER NOT NULL, "
+                "synced_at REAL NOT NULL, "
+                "PRIMARY KEY (handle, kind))"
+            )
+
+    @property
+    def handle(self) -> str:
+        "The handle being mirrored."
+        return self.handle_client._handle
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+    # Syncing
+
+    def sync(
+        self, kinds: Optional[Iterable[str]] = None, full: bool = False
+    ) -> MirrorSyncStats:
+        """
+        Bring the mirror up-to-date with the API.
+
+        Parameters
+        ----------
+        kinds : optional iterable of str
+            Which kinds of information to sync: any of ``"image_info"``,
+            ``"scene_info"``, and ``"timeline"``. Defaults to all three.
+        full : optional bool, defaults to False
+            If true, walk through every page of results, refreshing all of the
+            stored items and removing any that no longer exist. Otherwise, only
+            fetch pages until reaching an item that is already stored.
+
+        Returns
+        -------
+        A :class:`MirrorSyncStats` object describing the work done.
+
+        Notes
+        -----
+        If a sync of a kind of information is interrupted, the next one is
+        automatically a full sync, so that the mirror does not remain
+        incomplete.
+        """
+        if kinds is None:
+            kinds = _MIRROR_KINDS
+
+        kinds = list(kinds)
+
+        for kind in kinds:
+            if kind not in _MIRROR_KINDS:
+                raise ValueError(f"unknown mirror kind {kind!r}")
+
+        stats = MirrorSyncStats(pages=0, stored=0, removed=0)
+
+        for kind in kinds:
+            self._sync_kind(kind, full, stats)
+
+        return stats
+
+    def _sync_kind(self, kind: str, full: bool, stats: MirrorSyncStats):
+        # An incremental sync relies on the mirror holding every item older
+        # than the newest one that it has. That only holds if the previous sync
+        # ran to completion, since items are stored page by page.
+        walk_all = full or not self._is_complete(kind)
+        self._set_complete(kind, False)
+
+        fetch_page = self._page_fetcher(kind)
+        id_key = _ID_KEYS[kind]
+        seen = set()
+        page_num = 0
+
+        while True:
+            items, has_next = fetch_page(page_num)
+            stats.pages += 1
+            ids = [item[id_key] for item in items]
+
+            if walk_all:
+                reached_known = False
+            else:
+                # If items shift across page boundaries while we're walking,
+                # ones stored earlier in this sync can show up again. Only
+                # items stored by a previous sync mean that we can stop.
+                known = self._known_ids(kind, ids) - seen
+                n_new = next(
+                    (i for i, ident in enumerate(ids) if ident in known), len(ids)
+                )
+                reached_known = n_new < len(ids)
+                items = items[:n_new]
+                ids = ids[:n_new]
+
+            seen.update(ids)
+            self._store(kind, items)
+            stats.stored += len(items)
+
+            if reached_known or not has_next:
+                break
+
+            page_num += 1
+
+        if walk_all:
+            stats.removed += self._remove_unseen(kind, seen)
+
+        self._set_complete(kind, True)
+
+    def _page_fetcher(self, kind: str) -> Callable[[int], Tuple[List[dict], bool]]:
+        hc = self.handle_client
+
+        if kind == "timeline":
+
+            def fetch_page(page_num):
+                resp = hc.client._send_and_parse(
+                    hc._url_base + "/timeline",
+                    http_method="GET",
+                    params={"page": page_num},
+                )
+                items = resp["results"]
+                return items, bool(items)
+
+            return fetch_page
+
+        rel_url = hc._url_base + (
+            "/imageinfo" if kind == "image_info" else "/sceneinfo"
+        )
+        page_size = self.page_size
+
+        def fetch_page(page_num):
+            resp = hc.client._send_and_parse(
+                rel_url,
+                http_method="GET",
+                params={"page": page_num, "pagesize": page_size},
+            )
+            items = resp["results"]
+            has_next = bool(items) and (page_num + 1) * page_size < resp["total_count"]
+            return items, has_next
+
+        return fetch_page
+
+    def _is_complete(self, kind: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT complete FROM sync_state WHERE handle = ? AND kind = ?",
+                (self.handle, kind),
+            ).fetchone()
+
+        return row is not None and bool(row[0])
+
+    def _set_complete(self, kind: str, complete: bool):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (handle, kind, complete, synced_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.handle, kind, int(complete), time.time()),
+            )
+
+    def _known_ids(self, kind: str, ids: List[str]) -> set:
+        if not ids:
+            return set()
+
+        marks = ",".join("?" * len(ids))
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM items WHERE handle = ? AND kind = ? AND id IN ({marks})",
+                (self.handle, kind, *ids),
+            ).fetchall()
+
+        return set(r[0] for r in rows)
+
+    def _store(self, kind: str, items: List[dict]):
+        dumps = self.handle_client.client._json.dumps
+        id_key = _ID_KEYS[kind]
+        rows = [
+            (self.handle, kind, item[id_key], item["creation_date"], dumps(item))
+            for item in items
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items (handle, kind, id, creation_date, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _remove_unseen(self, kind: str, seen: set) -> int:
+        with self._lock, self._conn:
+            stored = self._conn.execute(
+                "SELECT id FROM items WHERE handle = ? AND kind = ?",
+                (self.handle, kind),
+            ).fetchall()
+            gone = [(self.handle, kind, r[0]) for r in stored if r[0] not in seen]
+            self._conn.executemany(
+                "DELETE FROM items WHERE handle = ? AND kind = ? AND id = ?", gone
+            )
+
+        return len(gone)
+
+    # Queries
+
+    def count(self, kind: str) -> int:
+        """
+        Get the number of items of the specified kind in the mirror.
+
+        Parameters
+        ----------
+        kind : str
+            ``"image_info"``, ``"scene_info"``, or ``"timeline"``.
+        """
+        if kind not in _MIRROR_KINDS:
+            raise ValueError(f"unknown mirror kind {kind!r}")
+
+        with self._lock:
+            (n,) = self._conn.execute(
+                "SELECT COUNT(*) FROM items WHERE handle = ? AND kind = ?",
+                (self.handle, kind),
+            ).fetchone()
+
+        return n
+
+    def _iter_raw(self, kind: str) -> Iterator[dict]:
+        loads = self.handle_client.client._json.loads
+        select = (
+            "SELECT creation_date, id, data FROM items WHERE handle = ? AND kind = ?"
+        )
+        order = " ORDER BY creation_date DESC, id DESC LIMIT ?"
+        where = ""
+        args = (self.handle, kind)
+
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    select + where + order, args + (_QUERY_BATCH_SIZE,)
+                ).fetchall()
+
+            for row in rows:
+                yield loads(row[2])
+
+            if len(rows) < _QUERY_BATCH_SIZE:
+                return
+
+            # Resume after the last row, so that no cursor is held open while
+            # the caller processes the items
+            where = " AND (creation_date, id) < (?, ?)"
+            args = (self.handle, kind, row[0], row[1])
+
+    def _get_raw(self, kind: str, id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM items WHERE handle = ? AND kind = ? AND id = ?",
+                (self.handle, kind, id),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return self.handle_client.client._json.loads(row[0])
+
+    def iter_image_info(self) -> Iterator[ImageSummary]:
+        """
+        Iterate over the mirrored information about the handle's images.
+
+        Returns
+        -------
+        A generator of :class:`~wwt_api_client.constellations.data.ImageSummary`
+        items, most recently created first.
+        """
+        return (_decode(ImageSummary, item) for item in self._iter_raw("image_info"))
+
+    def get_image_info(self, id: str) -> Optional[ImageSummary]:
+        """
+        Look up the mirrored information about one of the handle's images.
+
+        Returns
+        -------
+        An :class:`~wwt_api_client.constellations.data.ImageSummary`, or None
+        if the mirror has no image with the specified ID.
+        """
+        item = self._get_raw("image_info", id)
+        return None if item is None else _decode(ImageSummary, item)
+
+    def iter_scene_info(self) -> Iterator[SceneInfo]:
+        """
+        Iterate over the mirrored administrative information about the handle's
+        scenes.
+
+        Returns
+        -------
+        A generator of :class:`~wwt_api_client.constellations.data.SceneInfo`
+        items, most recently created first.
+        """
+        return (_decode(SceneInfo, item) for item in self._iter_raw("scene_info"))
+
+    def get_scene_info(self, id: str) -> Optional[SceneInfo]:
+        """
+        Look up the mirrored administrative information about one of the
+        handle's scenes.
+
+        Returns
+        -------
+        A :class:`~wwt_api_client.constellations.data.SceneInfo`, or None if
+        the mirror has no scene with the specified ID.
+        """
+        item = self._get_raw("scene_info", id)
+        return None if item is None else _decode(SceneInfo, item)
+
+    def iter_timeline(
+        self, lazy: bool = False, interner: Optional[Interner] = None
+    ) -> Iterator[SceneHydrated]:
+        """
+        Iterate over the mirrored scenes of the handle's timeline.
+
+        Parameters
+        ----------
+        lazy : optional bool, defaults to False
+            If true, the nested content of each scene is only decoded when it is
+            first accessed. See
+            :meth:`~wwt_api_client.constellations.handles.HandleClient.get_timeline`.
+        interner : optional :class:`~wwt_api_client.constellations.data.Interner`
+            If specified, identical handle and image information objects are
+            shared among the returned scenes.
+
+        Returns
+        -------
+        A generator of :class:`~wwt_api_client.constellations.data.SceneHydrated`
+        items, most recently created first.
+        """
+        return (
+            _decode_scene(item, lazy, interner) for item in self._iter_raw("timeline")
+        )
+
+    def get_timeline_scene(self, id: str) -> Optional[SceneHydrated]:
+        """
+        Look up one of the mirrored scenes of the handle's timeline.
+
+        Returns
+        -------
+        A :class:`~wwt_api_client.constellations.data.SceneHydrated`, or None
+        if the mirror's copy of the timeline has no scene with the specified ID.
+        """
+        item = self._get_raw("timeline", id)
+        return None if item is None else _decode_scene(item, False)
@@ -13,7 +13,11 @@ from wwt_data_formats.folder import Folder
 from wwt_data_formats.place import Place
 
 from . import CxClient
-from .data import SceneHydrated, ScenePermissions, SceneUpdate, _strip_nulls_in_place
+from .data import (
+    SceneHydrated,
+    ScenePermissions,
+    SceneUpdate,
+)
 
 __all__ = """
 SceneClient
@@ -50,10 +54,7 @@ class SceneClient:
         This method corresponds to the
         :ref:`endpoint-GET-scene-_id` API endpoint.
         """
-        resp = self.client._send_and_check(self._url_base, http_method="GET")
-        resp = resp.json()
-        resp.pop("error")
-        return SceneHydrated.schema().load(resp)
+        return self.client._get_metadata("scene", SceneHydrated, self._url_base)
 
     def permissions(self) -> ScenePermissions:
         """
@@ -65,12 +66,9 @@ class SceneClient:
         and how to use this API. In most cases you should not use it, and just
         go ahead and attempt whatever operation wish to perform.
         """
-        resp = self.client._send_and_check(
-            self._url_base + "/permissions", http_method="GET"
+        return self.client._get_metadata(
+            "scene", ScenePermissions, self._url_base + "/permissions"
         )
-        resp = resp.json()
-        resp.pop("error")
-        return ScenePermissions.schema().load(resp)
 
     def place_wtml_url(self) -> str:
         """
@@ -106,11 +104,16 @@ class SceneClient:
         The API request will return a 404 error if the scene cannot be
         represented as a WWT Place (as well as if the scene ID is unrecognized).
 
+        The WTML is cached by the client, which only checks it for changes
+        once its *wtml_cache_ttl* has expired, and only parses it again if it
+        has changed. Each call returns a new copy of the folder, so it may be
+        modified freely. See :mod:`wwt_api_client.constellations.httpcache`.
+
         See Also
         --------
         place_wtml_url, place_object
         """
-        return Folder.from_url(self.place_wtml_url())
+        return self.client._get_wtml_folder(self.place_wtml_url())
 
     def place_object(self) -> Place:
         """
@@ -138,12 +141,11 @@ class SceneClient:
         This method corresponds to the :ref:`endpoint-PATCH-scene-_id` API
         endpoint.
         """
-        resp = self.client._send_and_check(
+        resp = self.client._send_and_parse(
             self._url_base,
             http_method="PATCH",
-            json=_strip_nulls_in_place(updates.to_dict()),
+            json=updates,
         )
-        resp = resp.json()
-        resp.pop("error")
+        self.client._invalidate_cached(self._url_base, self._url_base + "/place.wtml")
         # Might as well return the response, although it's currently vacuous
         return resp
@@ -0,0 +1,237 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+JSON encoding and decoding backends for the WWT Constellations client.
+
+The client parses API responses directly from the raw response bytes and
+encodes request bodies to bytes using a :class:`JsonBackend`. By default, it
+uses `orjson`_ if it is installed, since it is several times faster than the
+standard library's :mod:`json` module on large payloads such as timeline pages,
+and falls back to :mod:`json` otherwise. Pass a backend name or a custom
+:class:`JsonBackend` to :class:`~wwt_api_client.constellations.CxClient` to
+override this choice.
+
+The streaming methods of the clients, such as
+:meth:`~wwt_api_client.constellations.handles.HandleClient.get_timeline_stream`,
+parse responses incrementally with `ijson`_ if it is installed, so that only one
+result item needs to be held in memory at a time. Otherwise, they parse each
+complete response with the :class:`JsonBackend` and then yield its items.
+
+.. _orjson: https://github.com/ijl/orjson
+.. _ijson: https://github.com/ICRAR/ijson
+"""
+
+import dataclasses
+from dataclasses import dataclass
+import functools
+import importlib
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+from .data import _encode
+
+# The optional JSON libraries are only imported once they're needed, since
+# importing them takes a noticeable amount of time. These are replaced with the
+# modules, or None if they're not installed.
+_NOT_LOADED = object()
+orjson = _NOT_LOADED
+ijson = _NOT_LOADED
+
+
+def _optional_module(name: str):
+    module = globals()[name]
+
+    if module is _NOT_LOADED:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            module = None
+
+        globals()[name] = module
+
+    return module
+
+
+__all__ = """
+JsonBackend
+get_json_backend
+""".split()
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """
+    A pair of functions for encoding and decoding JSON.
+    """
+
+    name: str
+    "A short name for this backend."
+
+    loads: Callable[[bytes], Any]
+    "Parse JSON from UTF-8 encoded bytes."
+
+    dumps: Callable[[Any], bytes]
+    "Serialize an object to UTF-8 encoded JSON bytes."
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+_STDLIB_BACKEND = JsonBackend(name="json", loads=json.loads, dumps=_stdlib_dumps)
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson_backend() -> Optional[JsonBackend]:
+    orjson = _optional_module("orjson")
+
+    if orjson is None:
+        return None
+
+    return JsonBackend(name="orjson", loads=orjson.loads, dumps=orjson.dumps)
+
+
+def get_json_backend(backend: Union[str, JsonBackend, None] = None) -> JsonBackend:
+    """
+    Look up a JSON backend.
+
+    Parameters
+    ----------
+    backend : optional str or :class:`JsonBackend`
+        Either ``"orjson"``, ``"json"``, ``"auto"``, or an existing
+        :class:`JsonBackend`, which is returned unchanged. If None or
+        ``"auto"``, the fastest available backend is used.
+
+    Returns
+    -------
+    A :class:`JsonBackend`.
+
+    Raises
+    ------
+    ValueError
+        If the named backend is unknown or is not installed.
+    """
+    if isinstance(backend, JsonBackend):
+        return backend
+
+    if backend is None or backend == "auto":
+        return _orjson_backend() or _STDLIB_BACKEND
+
+    if backend == "json":
+        return _STDLIB_BACKEND
+
+    if backend == "orjson":
+        orjson_backend = _orjson_backend()
+
+        if orjson_backend is None:
+            raise ValueError("the `orjson` JSON backend is not installed")
+        return orjson_backend
+
+    raise ValueError(f"unknown JSON backend {backend!r}")
+
+
+def _parse_response(backend: JsonBackend, content: bytes) -> dict:
+    """
+    Parse an API response body, removing the ``error`` flag that all responses
+    carry.
+    """
+    resp = backend.loads(content)
+    resp.pop("error")
+    return resp
+
+
+def _encode_body(backend: JsonBackend, body: Any) -> bytes:
+    """
+    Encode a request body to bytes.
+
+    If *body* is one of the ``dataclass_json`` request classes, its None-valued
+    fields are omitted, following the API convention that unset values should
+    be missing rather than null.
+    """
+    if dataclasses.is_dataclass(body):
+        body = _encode(body)
+
+    return backend.dumps(body)
+
+
+def _encode_json_kwarg(backend: JsonBackend, kwargs: dict, body_key="data") -> dict:
+    """
+    If an HTTP request's keyword arguments include a ``json`` body, encode it
+    with *backend* and pass it as the raw *body_key* argument instead. The body
+    may be a request object or a JSON-compatible value.
+    """
+    if "json" not in kwargs:
+        return kwargs
+
+    kwargs = dict(kwargs)
+    headers = dict(kwargs.get("headers") or {})
+    headers.setdefault("Content-Type", "application/json")
+    kwargs["headers"] = headers
+    kwargs[body_key] = _encode_body(backend, kwargs.pop("json"))
+    return kwargs
+
+
+def _iter_response_items(backend: JsonBackend, fp, key: str = "results") -> Iterator:
+    """
+    Iterate over the items of the array *key* in an API response that is read
+    from the binary file-like object *fp*.
+
+    With ijson, the response is parsed incrementally, so that only one item is
+    held in memory at a time.
+    """
+    ijson = _optional_module("ijson")
+
+    if ijson is None:
+        yield from backend.loads(fp.read())[key]
+    else:
+        yield from ijson.items(fp, key + ".item", use_float=True)
+
+
+class _AsyncByteReader:
+    """
+    Adapt an asynchronous iterator of byte chunks to the asynchronous file-like
+    interface that ijson expects.
+    """
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with a zero-sized read
+        if size == 0:
+            return b""
+
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def _aiter_response_items(
+    backend: JsonBackend, chunks: AsyncIterable[bytes], key: str = "results"
+) -> AsyncIterator:
+    """
+    The asynchronous equivalent of :func:`_iter_response_items`, reading the
+    response from an asynchronous iterator of byte chunks.
+    """
+    ijson = _optional_module("ijson")
+
+    if ijson is None:
+        content = b"".join([chunk async for chunk in chunks])
+
+        for item in backend.loads(content)[key]:
+            yield item
+    else:
+        async for item in ijson.items(
+            _AsyncByteReader(chunks), key + ".item", use_float=True
+        ):
+            yield item
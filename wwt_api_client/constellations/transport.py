@@ -0,0 +1,405 @@
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+"""
+HTTP transport settings for the WWT Constellations client.
+
+By default, :class:`~wwt_api_client.constellations.CxClient` uses the same
+connection pooling behavior as a stock ``requests`` session. Programs that
+issue many API calls from multiple threads may want to make the pool larger, so
+that connections are kept alive and reused rather than being torn down and
+reestablished. A :class:`TransportConfig` controls those settings, and
+:class:`PoolStats` reports how well the pool is working.
+
+The client can also automatically retry API calls that fail for transient
+reasons, such as a server that is temporarily overloaded. A
+:class:`RetryPolicy` controls that behavior.
+
+Finally, when several threads make the same read-only API call at the same
+time, the client only sends one request, and shares its result among all of
+them. See
+:attr:`~wwt_api_client.constellations.CxClient.coalesced_requests`.
+"""
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+import random
+import re
+import socket
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+__all__ = """
+CircuitOpenError
+PoolStats
+RetryPolicy
+TransportConfig
+""".split()
+
+
+@dataclass
+class TransportConfig:
+    """
+    Connection pooling settings for a WWT Constellations client.
+    """
+
+    pool_connections: int = 10
+    """The number of per-host connection pools to keep. The client generally
+    only talks to one host, so this rarely needs changing."""
+
+    max_connections_per_host: int = 10
+    """The maximum number of idle connections to keep alive for each host. If
+    more threads than this issue requests simultaneously, the extra connections
+    are discarded after use unless :attr:`block_when_full` is true."""
+
+    block_when_full: bool = False
+    """If true, requests will wait for a pooled connection to become available
+    rather than opening more than :attr:`max_connections_per_host`
+    connections."""
+
+    tcp_keepalive: bool = True
+    """Whether to enable TCP keepalive probes on the client's sockets, which
+    helps long-idle pooled connections survive NAT and load-balancer
+    timeouts."""
+
+    socket_options: Optional[List[Tuple[int, int, int]]] = None
+    """Additional ``(level, option, value)`` socket options to apply to new
+    connections, on top of the ``urllib3`` defaults."""
+
+    def _all_socket_options(self) -> List[Tuple[int, int, int]]:
+        options = list(HTTPConnection.default_socket_options)
+
+        if self.tcp_keepalive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+        if self.socket_options:
+            options.extend(self.socket_options)
+
+        return options
+
+
+@dataclass
+class PoolStats:
+    """
+    Statistics about the HTTP connections used by a WWT Constellations client.
+    """
+
+    opened: int
+    "The number of new connections that have been established."
+
+    reused: int
+    "The number of requests that were sent over an already-open connection."
+
+    discarded: int
+    """The number of connections that were closed after use because the pool
+    was already full."""
+
+
+class _PoolCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                opened=self.opened, reused=self.reused, discarded=self.discarded
+            )
+
+
+def _counting_pool_class(base, counters: _PoolCounters):
+    class CountingConnectionPool(base):
+        def _make_request(self, conn, *args, **kwargs):
+            if getattr(conn, "sock", None) is None:
+                counters.incr("opened")
+            else:
+                counters.incr("reused")
+
+            return super()._make_request(conn, *args, **kwargs)
+
+        def _put_conn(self, conn):
+            if conn is not None and (self.pool is None or self.pool.full()):
+                counters.incr("discarded")
+
+            return super()._put_conn(conn)
+
+    return CountingConnectionPool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    A ``requests`` transport adapter that applies a :class:`TransportConfig` and
+    keeps track of how its connections are used.
+    """
+
+    def __init__(self, config: TransportConfig):
+        self._config = config
+        self.counters = _PoolCounters()
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.max_connections_per_host,
+            pool_block=config.block_when_full,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self._config._all_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self.counters),
+            "https": _counting_pool_class(HTTPSConnectionPool, self.counters),
+        }
+
+
+def _make_session(config: TransportConfig) -> Tuple[requests.Session, _PooledAdapter]:
+    session = requests.Session()
+    adapter = _PooledAdapter(config)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised when an API call is refused without being attempted, because recent
+    calls indicate that the API server is down.
+    """
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Settings for automatically retrying failed WWT Constellations API calls.
+
+    Calls are retried if they fail with a connection error or with one of the
+    :attr:`retry_statuses` HTTP status codes, as long as their HTTP method is
+    one of the :attr:`retry_methods`. The delay before each retry grows
+    exponentially, with random jitter, unless the server requests a specific
+    delay with a ``Retry-After`` header.
+
+    If many consecutive calls fail because the server appears to be down, a
+    "circuit breaker" opens and further calls fail immediately with a
+    :exc:`CircuitOpenError` until a cooldown period has passed.
+    """
+
+    max_retries: int = 3
+    "The maximum number of times to retry a single call. Zero disables retries."
+
+    backoff_base: float = 0.5
+    "The nominal delay before the first retry, in seconds."
+
+    backoff_max: float = 30.0
+    "The maximum delay before any retry, in seconds."
+
+    jitter: bool = True
+    """If true, each delay is drawn uniformly between zero and its nominal
+    value, so that many clients do not retry in lockstep."""
+
+    respect_retry_after: bool = True
+    "If true, honor ``Retry-After`` headers sent by the server."
+
+    max_retry_after: float = 120.0
+    """If the server asks the client to wait longer than this many seconds, the
+    call is not retried."""
+
+    retry_statuses: FrozenSet[int] = field(
+        default_factory=lambda: frozenset([429, 502, 503, 504])
+    )
+    "The HTTP status codes that cause a call to be retried."
+
+    retry_methods: FrozenSet[str] = field(
+        default_factory=lambda: frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    )
+    """The HTTP methods that may be retried. By default only idempotent methods
+    are retried, although some read-only API calls that use ``POST`` are
+    treated as idempotent as well."""
+
+    breaker_threshold: int = 5
+    """The number of consecutive failed attempts, due to connection errors or
+    5xx gateway errors, that cause the circuit breaker to open. Zero disables
+    the circuit breaker."""
+
+    breaker_cooldown: float = 30.0
+    """The number of seconds that the circuit breaker stays open before a single
+    trial call is allowed through. Other calls made while the trial is in
+    progress still fail with :exc:`CircuitOpenError`."""
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def _retry_after(self, resp: requests.Response) -> Optional[float]:
+        value = resp.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _delay(
+        self, attempt: int, resp: Optional[requests.Response]
+    ) -> Optional[float]:
+        """
+        Get the number of seconds to wait before retrying, given that *attempt*
+        retries have already been made and the most recent attempt got the
+        response *resp*, which is None for a connection error. Returns None if
+        the call should not be retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if resp is not None and self.respect_retry_after:
+            delay = self._retry_after(resp)
+
+            if delay is not None:
+                if delay > self.max_retry_after:
+                    return None
+                return delay
+
+        return self._backoff(attempt)
+
+
+_BREAKER_STATUSES = frozenset([502, 503, 504])
+
+
+class _CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def check(self):
+        if self._threshold <= 0:
+            return
+
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            if (
+                self._trial_in_flight
+                or time.monotonic() - self._opened_at < self._cooldown
+            ):
+                raise CircuitOpenError(
+                    "not contacting the WWT Constellations API because recent "
+                    "calls indicate that it is down"
+                )
+
+            # Half-open: let this one call through as a trial, and keep refusing
+            # others until it concludes. If it fails, the breaker will reopen
+            # immediately, since the failure count is still at the threshold.
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """
+        Record a failed attempt, returning True if the breaker is now open.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+            self._failures += 1
+
+            if self._threshold > 0 and self._failures >= self._threshold:
+                self._opened_at = time.monotonic()
+                return True
+
+            return False
+
+    def record_abandoned(self):
+        """
+        Record an attempt that failed in a way that says nothing about the
+        server's health, such as an error obtaining an access token.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+
+T = TypeVar("T")
+
+
+class _SingleFlight:
+    """
+    Coalesces concurrent calls that would do the same work, so that only the
+    first of them actually does it and the rest wait for and share its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Call *func* and return its result, unless a call with the same *key* is
+        already in progress, in which case wait for that one to finish and
+        return its result (or raise its exception) instead.
+
+        A *func* must not itself make a call with the same *key*, or it will
+        wait forever.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+
+            if flight is None:
+                flight = self._flights[key] = Future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            return flight.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+
+_ENDPOINT_ID_SEGMENTS = re.compile(r"^/(handle|image|scene)/[^/]+")
+
+
+def _endpoint_key(http_method: str, rel_url: str) -> str:
+    """
+    Get a label for the API endpoint that a request corresponds to, by
+    replacing the handle or ID embedded in its URL with a placeholder.
+    """
+    return http_method.upper() + " " + _ENDPOINT_ID_SEGMENTS.sub(r"/\1/:id", rel_url)
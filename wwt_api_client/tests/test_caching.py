@@ -0,0 +1,67 @@
+# -*- mode: python; coding: utf-8 -*-
+# Copyright 2023 the .NET Foundation
+# Distributed under the MIT license
+
+import time
+
+from ..caching import DiskCache, LRUCache
+
+
+def test_lru_eviction():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    stats = cache.stats()
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert stats.entries == 2
+
+
+def test_lru_ttl(mocker):
+    now = time.time()
+    mocker.patch("time.time", return_value=now)
+    cache = LRUCache(10, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=600)
+
+    mocker.patch("time.time", return_value=now + 120)
+    assert cache.get("a", "missing") == "missing"
+    assert cache.get("b") == 2
+
+
+def test_disk_cache(tmp_path):
+    path = str(tmp_path / "sub" / "cache.sqlite")
+    cache = DiskCache(path, max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    cache.close()
+
+    cache = DiskCache(path, max_entries=2)
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats().entries == 2
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_disk_cache_ttl(tmp_path, mocker):
+    now = time.time()
+    mocker.patch("time.time", return_value=now)
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.put("a", "1")
+
+    mocker.patch("time.time", return_value=now + 120)
+    assert cache.get("a") is None
+    assert cache.stats().entries == 0
+    cache.close()
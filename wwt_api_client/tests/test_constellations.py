@@ -1,7 +1,57 @@
+import asyncio
+import copy
+import dataclasses
+import http.server
+import io
+import json
+import pickle
 from license_expression import ExpressionError
+from marshmallow import ValidationError
+from mock import Mock
 import pytest
+import requests
+import subprocess
+import sys
+import threading
+import time
+from wwt_data_formats.enums import DataSetType
+from wwt_data_formats.folder import Folder
+from wwt_data_formats.imageset import ImageSet
+from wwt_data_formats.place import Place
 
-from ..constellations.data import ImageContentPermissions
+from ..constellations import ClientConfig, CxClient
+from ..constellations.compact import CompactSceneHydrated, compact_class, to_compact
+from ..constellations.data import (
+    HandleImageStats,
+    HandleInfo,
+    HandleUpdate,
+    ImageContentPermissions,
+    ImageDisplayInfo,
+    ImageSummary,
+    ImageUpdate,
+    Interner,
+    SceneContentHydrated,
+    SceneHydrated,
+    SceneInfo,
+    SceneContent,
+    SceneImageLayer,
+    ScenePlace,
+    SceneUpdate,
+    CX_SANITIZER,
+    _decode,
+    _encode,
+    _license_errors,
+    _make_read_only,
+    _sanitize_credits,
+    _sanitize_plain_text,
+    _strip_nulls_in_place,
+)
+from ..constellations.handles import AddSceneRequest
+from ..constellations.httpcache import MetadataCacheConfig
+from ..constellations.mirror import HandleMirror, MirrorSyncStats
+from ..constellations import handles, serialization
+from ..constellations.serialization import get_json_backend
+from ..constellations.transport import CircuitOpenError, RetryPolicy, TransportConfig
 
 
 @pytest.fixture
@@ -28,6 +78,28 @@ def test_invalid_permissions_license(valid_permissions_data):
         ImageContentPermissions(**permissions_data)
 
 
+def test_license_validation_memoized(valid_permissions_data):
+    _license_errors.cache_clear()
+
+    for _ in range(3):
+        ImageContentPermissions(**valid_permissions_data)
+
+        with pytest.raises(ExpressionError):
+            ImageContentPermissions(**dict(valid_permissions_data, license="NOPE"))
+
+    info = _license_errors.cache_info()
+    assert info.misses == 2
+    assert info.hits == 4
+
+
+def test_licensing_loaded_lazily():
+    code = (
+        "import sys, wwt_api_client.constellations as cx; "
+        "sys.exit(cx.data._licensing is not None)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 def test_sanitize_permissions_html(valid_permissions_data):
     permissions_data = valid_permissions_data.copy()
     permissions_data["credits"] = "<script>Some JS here</script><a>Credits Link</a>"
@@ -36,3 +108,1759 @@ def test_sanitize_permissions_html(valid_permissions_data):
     assert permissions.copyright == permissions_data["copyright"]
     assert permissions.license == permissions_data["license"]
     assert permissions.credits == "<a>Credits Link</a>"
+
+
+CREDITS_CORPUS = [
+    "",
+    " ",
+    "\t\n",
+    "plain text",
+    "  leading and   internal  whitespace  ",
+    "line\r\nbreaks",
+    "NASA/JPL-Caltech; ESA",
+    "no\xa0break\u2003spaces",
+    "ﬁ ligature",
+    "＜b＞fullwidth＜/b＞",
+    "zero\u200bwidth",
+    "control\x01char",
+    "nul\x00char",
+    "café ünïcödé 中文",
+    "\"quotes\" and 'apostrophes'",
+    "a & b",
+    "a &amp; b &copy;",
+    "x > y < z",
+    "<b>bold</b> and <i>italic</i>",
+    "<strong>a</strong><strong>b</strong>",
+    "<em></em>empty",
+    "line<br>break<br/>s",
+    '<a href="https://example.com/?a=1&b=2">link</a>',
+    '<a href="javascript:alert(1)" onclick="x()">bad</a>',
+    '<a href="http://x" target="_blank">blank</a>',
+    "<script>alert(1)</script>after",
+    "<p>para</p><div>div</div>",
+    "<span style='font-weight: bold'>span</span>",
+]
+
+
+@pytest.mark.parametrize("credits", CREDITS_CORPUS)
+def test_sanitize_credits_matches_sanitizer(credits):
+    expected = CX_SANITIZER.sanitize(credits)
+    assert _sanitize_credits(credits) == expected
+
+    fast = _sanitize_plain_text(credits)
+    assert fast is None or fast == expected
+
+
+def test_decode_trusts_server_credits(valid_permissions_data):
+    data = dict(valid_permissions_data, credits="<b>raw</b>")
+    assert _decode(ImageContentPermissions, data).credits == "<b>raw</b>"
+    assert ImageContentPermissions(**data).credits == "<strong>raw</strong>"
+
+    untrusted = _decode(ImageContentPermissions, data, trusted=False)
+    assert untrusted.credits == "<strong>raw</strong>"
+
+
+def test_decode_matches_schema():
+    image = {
+        "id": "0123456789abcdef01234567",
+        "wwt": {
+            "base_degrees_per_tile": 1,
+            "bottoms_up": False,
+            "center_x": 0,
+            "center_y": 0.5,
+            "file_type": ".png",
+            "offset_x": 0,
+            "offset_y": 0,
+            "projection": "tan",
+            "quad_tree_map": "",
+            "rotation": 0,
+            "tile_levels": 3,
+            "width_factor": 2,
+            "thumbnail_url": "",
+            "unknown_field": "ignored",
+        },
+        "permissions": {"copyright": "c", "license": "CC-BY-4.0"},
+        "storage": {},
+    }
+    scene = dict(SCENE_HYDRATED_JSON, extra=123)
+    scene["content"] = {
+        "background": image,
+        "image_layers": [{"image": image, "opacity": 1}],
+    }
+
+    for cls, data in [
+        (SceneHydrated, scene),
+        (ImageSummary, IMAGE_SUMMARY_JSON),
+        (SceneInfo, {**IMAGE_SUMMARY_JSON, **SCENE_HYDRATED_JSON}),
+    ]:
+        assert _decode(cls, data) == cls.schema().load(data)
+
+    decoded = _decode(SceneHydrated, scene)
+    assert decoded.astropix is None
+    assert decoded.content.image_layers[0].opacity == 1.0
+    assert type(decoded.content.image_layers[0].opacity) is float
+    assert _decode(ImageSummary, IMAGE_SUMMARY_JSON).id == IMAGE_SUMMARY_JSON["_id"]
+
+    # Data needing coercion or validation go through the marshmallow path
+    assert _decode(HandleImageStats, {"count": "3"}).count == 3
+
+    with pytest.raises(ValidationError):
+        _decode(HandleInfo, {"handle": "test"})
+
+
+def test_encode_omits_nulls():
+    update = SceneUpdate(text="hello", place=ScenePlace(0.1, 0.2, 0.0, 1.0, 1.5))
+    assert _encode(update) == _strip_nulls_in_place(update.to_dict())
+    assert _encode(HandleUpdate()) == {}
+
+    # Unlike the two-pass approach, nulls inside lists are removed too
+    req = AddSceneRequest(
+        place=ScenePlace(0.1, 0.2, 0.0, 1.0, 1.5),
+        content=SceneContent(image_layers=[SceneImageLayer("a" * 24, None)]),
+        text="hello",
+        published=True,
+    )
+    d = _encode(req)
+    assert "outgoing_url" not in d
+    assert d["content"] == {"image_layers": [{"image_id": "a" * 24}]}
+
+    # Compact variants encode the same way
+    assert _encode(to_compact(update)) == _encode(update)
+
+
+def test_compact_round_trip():
+    scene = _decode(SceneHydrated, SCENE_HYDRATED_JSON)
+    compact = to_compact(scene)
+
+    assert isinstance(compact, CompactSceneHydrated)
+    assert isinstance(compact.place, compact_class(ScenePlace))
+    assert not hasattr(compact, "__dict__")
+    assert compact.to_dict() == scene.to_dict()
+    assert CompactSceneHydrated.from_dict(scene.to_dict()) == compact
+    assert pickle.loads(pickle.dumps(compact)) == compact
+
+    summaries = to_compact([_decode(ImageSummary, IMAGE_SUMMARY_JSON)] * 2)
+    assert summaries[1].id == IMAGE_SUMMARY_JSON["_id"]
+    assert summaries[1].to_dict()["_id"] == IMAGE_SUMMARY_JSON["_id"]
+
+
+def _scene_infos(n):
+    for i in range(n):
+        yield SceneInfo(
+            _id=f"{i:024x}",
+            creation_date="2023-03-28T16:53:18.364Z",
+            impressions=i,
+            likes=1,
+            clicks=None if i % 3 else i,
+            shares=2,
+            text="scene",
+            published=i % 2 == 0,
+        )
+
+
+def test_scene_info_to_numpy():
+    np = pytest.importorskip("numpy")
+    from ..constellations.columnar import scene_info_to_numpy
+
+    arr = scene_info_to_numpy(_scene_infos(10), chunk_size=4)
+
+    assert len(arr) == 10
+    assert arr["impressions"].sum() == 45
+    assert list(arr.valid["clicks"]) == [i % 3 == 0 for i in range(10)]
+    assert arr["clicks"].sum() == 0 + 3 + 6 + 9
+    assert arr["clicks"][arr.valid["clicks"]].mean() == 4.5
+    assert arr["published"].sum() == 5
+    assert arr["id"][3] == f"{3:024x}"
+    assert arr["creation_date"][0] == np.datetime64("2023-03-28T16:53:18.364")
+    assert "impressions" not in arr.valid
+
+    # Columns are plain arrays that can be aggregated at full speed
+    assert type(arr["likes"]) is np.ndarray
+    assert arr["likes"].flags.c_contiguous
+
+    empty = scene_info_to_numpy([])
+    assert len(empty) == 0
+    assert empty["clicks"].dtype == np.int64
+
+
+def test_scene_info_to_arrow():
+    pytest.importorskip("pyarrow")
+    from ..constellations.columnar import scene_info_to_arrow
+
+    table = scene_info_to_arrow(_scene_infos(10), chunk_size=4)
+
+    assert table.num_rows == 10
+    assert table.column("clicks").null_count == 6
+    assert table.column("impressions").to_pylist() == list(range(10))
+
+
+# Client-level tests. These never touch the network: we feed the OpenID Connect
+# layer a fake token and intercept the HTTP requests that the client issues.
+FAKE_API_URL = "http://cx.invalid"
+
+SCENE_HYDRATED_JSON = {
+    "id": "0123456789abcdef01234567",
+    "handle_id": "89abcdef0123456789abcdef",
+    "handle": {"handle": "test", "display_name": "Test Handle"},
+    "creation_date": "2023-03-28T16:53:18.364Z",
+    "likes": 1,
+    "liked": False,
+    "impressions": 10,
+    "clicks": None,
+    "shares": 2,
+    "place": {
+        "ra_rad": 1.0,
+        "dec_rad": 0.5,
+        "roll_rad": 0.0,
+        "roi_height_deg": 1.0,
+        "roi_aspect_ratio": 1.0,
+    },
+    "content": {"image_layers": []},
+    "text": "A scene",
+    "previews": {},
+    "published": True,
+}
+
+
+def fake_response(status_code=200, payload=None, headers=None):
+    resp = Mock()
+    resp.status_code = status_code
+    resp.headers = dict(headers or {})
+    resp.ok = status_code < 400
+    resp.json.side_effect = lambda: dict(payload or {}, error=False)
+    resp.content = json.dumps(dict(payload or {}, error=False)).encode("utf8")
+    resp.raw = io.BytesIO(resp.content)
+    resp.text = "fake response"
+
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(
+            f"{status_code} Error", response=resp
+        )
+
+    return resp
+
+
+FAKE_CONFIG = ClientConfig(
+    id_provider_url="http://idp.invalid/realms/constellations",
+    client_id="testing",
+    api_url=FAKE_API_URL,
+)
+
+
+def fake_oidcc(oidcc, mocker):
+    """
+    Set up an OpenIDCClient so that it hands out fake tokens without any I/O.
+    """
+    oidcc._cache = {
+        "fake_uuid": {
+            "access_token": "fake_access_token",
+            "expires_at": time.time() + 3600,
+        }
+    }
+
+    def fake_get_token(scopes, new_token=True):
+        oidcc.last_returned_uuid = "fake_uuid"
+        return oidcc._cache["fake_uuid"]["access_token"]
+
+    def fake_refresh_token(uuid):
+        info = oidcc._cache[uuid]
+        info["access_token"] = "refreshed_access_token"
+        info["expires_at"] = time.time() + 3600
+        return True
+
+    mocker.patch.object(oidcc, "get_token", side_effect=fake_get_token)
+    mocker.patch.object(oidcc, "_refresh_token", side_effect=fake_refresh_token)
+    mocker.patch.object(oidcc, "_delete_token")
+
+
+@pytest.fixture
+def cx_client(mocker):
+    client = CxClient(FAKE_CONFIG, oidcc_cache_identifier="wwt_api_client_tests")
+    fake_oidcc(client._oidcc, mocker)
+    return client
+
+
+@pytest.fixture
+def fake_session(cx_client, mocker):
+    m = mocker.patch.object(cx_client._session, "request")
+    m.return_value = fake_response(payload={"results": []})
+    return m
+
+
+def test_token_reused(cx_client, fake_session):
+    # Make sure that every call is actually sent
+    cx_client._http_cache = None
+
+    for _ in range(3):
+        assert cx_client.get_builtin_backgrounds() == []
+
+    for call in fake_session.call_args_list:
+        assert call.kwargs["headers"]["Authorization"] == "Bearer fake_access_token"
+
+    stats = cx_client.token_stats
+    assert stats.hits == 2
+    assert stats.refreshes == 0
+    assert cx_client._oidcc.get_token.call_count == 1
+
+
+def test_token_refreshed_before_expiry(cx_client, fake_session):
+    cx_client._oidcc._cache["fake_uuid"]["expires_at"] = time.time() + 10
+    cx_client.get_builtin_backgrounds()
+
+    headers = fake_session.call_args.kwargs["headers"]
+    assert headers["Authorization"] == "Bearer refreshed_access_token"
+    assert cx_client.token_stats.refreshes == 1
+
+
+def test_token_forced_refresh_after_401(cx_client, fake_session):
+    fake_session.side_effect = [
+        fake_response(401),
+        fake_response(payload={"results": []}),
+    ]
+    assert cx_client.get_builtin_backgrounds() == []
+
+    headers = fake_session.call_args.kwargs["headers"]
+    assert headers["Authorization"] == "Bearer refreshed_access_token"
+    assert cx_client.token_stats.forced_refreshes == 1
+
+
+def test_token_401_after_refresh_raises(cx_client, fake_session):
+    fake_session.return_value = fake_response(401)
+
+    with pytest.raises(requests.HTTPError):
+        cx_client.get_builtin_backgrounds()
+
+    assert fake_session.call_count == 2
+
+
+def test_token_rejected_response_closed(cx_client, fake_session):
+    rejected = fake_response(401)
+    fake_session.side_effect = [rejected, fake_response(payload={"results": []})]
+    assert cx_client.get_builtin_backgrounds() == []
+    assert rejected.close.call_count == 1
+
+
+def test_token_invalid_refresh_token(cx_client, fake_session):
+    cx_client._oidcc._cache["fake_uuid"]["expires_at"] = time.time() + 10
+    cx_client._oidcc._refresh_token.side_effect = requests.HTTPError(
+        "400 Client Error: invalid_grant"
+    )
+
+    # Rather than failing, the client starts over with a new token
+    cx_client.get_builtin_backgrounds()
+
+    assert cx_client._oidcc._delete_token.call_count == 1
+    assert cx_client._oidcc.get_token.call_count == 2
+
+
+@pytest.fixture
+def fake_sleep(mocker):
+    return mocker.patch("time.sleep")
+
+
+def test_retry_transient_errors(cx_client, fake_session, fake_sleep):
+    fake_session.side_effect = [
+        fake_response(503),
+        requests.ConnectionError("connection reset"),
+        fake_response(429, headers={"Retry-After": "7"}),
+        fake_response(payload={"results": []}),
+    ]
+    assert cx_client.get_builtin_backgrounds() == []
+
+    assert fake_session.call_count == 4
+    assert fake_sleep.call_count == 3
+    assert fake_sleep.call_args_list[2].args == (7.0,)
+    assert cx_client.retry_stats == {"GET /images/builtin-backgrounds": 3}
+
+
+def test_retry_gives_up(cx_client, fake_session, fake_sleep):
+    cx_client._retry.max_retries = 2
+    fake_session.return_value = fake_response(502)
+
+    with pytest.raises(requests.HTTPError):
+        cx_client.get_builtin_backgrounds()
+
+    assert fake_session.call_count == 3
+
+    # Retry-After delays that are too long are not waited out
+    fake_session.reset_mock()
+    fake_session.return_value = fake_response(503, headers={"Retry-After": "3600"})
+
+    with pytest.raises(requests.HTTPError):
+        cx_client.get_builtin_backgrounds()
+
+    assert fake_session.call_count == 1
+
+
+def test_retry_only_idempotent(cx_client, fake_session, fake_sleep):
+    fake_session.return_value = fake_response(503)
+
+    with pytest.raises(requests.HTTPError):
+        cx_client.handle_client("test").update(HandleUpdate(display_name="x"))
+
+    assert fake_session.call_count == 1
+    assert fake_sleep.call_count == 0
+
+    # This POST is a read-only query, so it is retried
+    fake_session.side_effect = [
+        fake_response(503),
+        fake_response(payload={"results": []}),
+    ]
+    assert cx_client.find_images_by_wwt_url("http://example.com/") == []
+    assert cx_client.retry_stats == {"POST /images/find-by-legacy-url": 1}
+
+
+def test_circuit_breaker(mocker, fake_sleep):
+    policy = RetryPolicy(max_retries=1, breaker_threshold=3, breaker_cooldown=60)
+    client = CxClient(FAKE_CONFIG, oidcc_cache_identifier="test", retry=policy)
+    fake_oidcc(client._oidcc, mocker)
+    request = mocker.patch.object(client._session, "request")
+    request.side_effect = requests.ConnectionError("down")
+    hc = client.handle_client("test")
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            hc.get()
+
+    assert request.call_count == 3
+
+    with pytest.raises(CircuitOpenError):
+        hc.get()
+
+    assert request.call_count == 3
+    assert client.retry_stats == {"GET /handle/:id": 1}
+
+    # After the cooldown, a trial call is let through
+    client._breaker._opened_at -= 120
+    request.side_effect = None
+    request.return_value = fake_response(
+        payload={"handle": "test", "display_name": "Test"}
+    )
+    assert hc.get().handle == "test"
+
+
+def test_circuit_breaker_single_trial(mocker):
+    policy = RetryPolicy(max_retries=0, breaker_threshold=1, breaker_cooldown=60)
+    client = CxClient(FAKE_CONFIG, oidcc_cache_identifier="test", retry=policy)
+    fake_oidcc(client._oidcc, mocker)
+    request = mocker.patch.object(client._session, "request")
+    request.side_effect = requests.ConnectionError("down")
+    hc = client.handle_client("test")
+
+    with pytest.raises(requests.ConnectionError):
+        hc.get()
+
+    client._breaker._opened_at -= 120
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_request(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return fake_response(payload={"handle": "test", "display_name": "Test"})
+
+    request.side_effect = fake_request
+    results = []
+
+    def get(handle):
+        # Distinct handles, so that the calls are not coalesced
+        try:
+            client.handle_client(handle).get()
+            results.append(handle)
+        except CircuitOpenError:
+            results.append("open")
+
+    trial = threading.Thread(target=get, args=("test",))
+    trial.start()
+    assert started.wait(5)
+
+    others = [threading.Thread(target=get, args=(f"other{i}",)) for i in range(4)]
+    for t in others:
+        t.start()
+    for t in others:
+        t.join()
+
+    release.set()
+    trial.join()
+
+    assert request.call_count == 2
+    assert sorted(results) == ["open"] * 4 + ["test"]
+
+    # Once the trial succeeds, the breaker is closed again
+    assert hc.get().handle == "test"
+    assert request.call_count == 3
+
+
+def test_circuit_breaker_failed_trial(mocker):
+    policy = RetryPolicy(max_retries=0, breaker_threshold=3, breaker_cooldown=60)
+    client = CxClient(FAKE_CONFIG, oidcc_cache_identifier="test", retry=policy)
+    fake_oidcc(client._oidcc, mocker)
+    request = mocker.patch.object(client._session, "request")
+    request.side_effect = requests.ConnectionError("down")
+    hc = client.handle_client("test")
+
+    for _ in range(3):
+        with pytest.raises(requests.ConnectionError):
+            hc.get()
+
+    # A failed trial reopens the breaker straight away
+    client._breaker._opened_at -= 120
+    with pytest.raises(requests.ConnectionError):
+        hc.get()
+
+    with pytest.raises(CircuitOpenError):
+        hc.get()
+
+    assert request.call_count == 4
+
+    # A trial that fails before reaching the server does not wedge the breaker
+    client._breaker._opened_at -= 120
+    mocker.patch.object(client, "_send_authorized", side_effect=RuntimeError("token"))
+    with pytest.raises(RuntimeError):
+        hc.get()
+
+    mocker.stopall()
+    fake_oidcc(client._oidcc, mocker)
+    request = mocker.patch.object(client._session, "request")
+    request.return_value = fake_response(
+        payload={"handle": "test", "display_name": "Test"}
+    )
+    assert hc.get().handle == "test"
+
+
+def _fake_scene_info_pages(total_count):
+    def fake_request(http_method, url, params=None, **kwargs):
+        page, pagesize = params["page"], params["pagesize"]
+        start = page * pagesize
+        ids = range(start, min(start + pagesize, total_count))
+        results = [
+            {
+                "_id": f"{i:024x}",
+                "creation_date": "2023-03-28T16:53:18.364Z",
+                "impressions": i,
+                "likes": 0,
+                "clicks": None,
+                "shares": None,
+                "text": f"scene {i}",
+                "published": True,
+            }
+            for i in ids
+        ]
+        return fake_response(payload={"total_count": total_count, "results": results})
+
+    return fake_request
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_scene_info(cx_client, fake_session, prefetch):
+    fake_session.side_effect = _fake_scene_info_pages(25)
+    hc = cx_client.handle_client("test")
+    items = list(hc.iter_scene_info(page_size=10, prefetch=prefetch))
+
+    assert [s.impressions for s in items] == list(range(25))
+    pages = sorted(c.kwargs["params"]["page"] for c in fake_session.call_args_list)
+    assert pages == [0, 1, 2]
+
+
+def test_iter_scene_info_early_exit(cx_client, fake_session):
+    fake_session.side_effect = _fake_scene_info_pages(1000)
+    hc = cx_client.handle_client("test")
+
+    for item in hc.iter_scene_info():
+        break
+
+    # The first page, and at most one prefetched page
+    assert fake_session.call_count <= 2
+    assert fake_session.call_args_list[0].kwargs["params"]["pagesize"] == 100
+
+
+def _fake_timeline_pages(n_pages, page_size=3):
+    def fake_request(http_method, url, params=None, **kwargs):
+        page = params["page"]
+
+        if page >= n_pages:
+            return fake_response(payload={"results": []})
+
+        # Each page repeats the last scene of the previous one, as happens when
+        # new scenes are posted during a crawl.
+        start = max(page * page_size - 1, 0)
+        results = [
+            dict(SCENE_HYDRATED_JSON, id=f"{i:024x}", text=f"scene {i}")
+            for i in range(start, (page + 1) * page_size)
+        ]
+        return fake_response(payload={"results": results})
+
+    return fake_request
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_streaming(cx_client, fake_session, mocker, incremental):
+    if incremental:
+        pytest.importorskip("ijson")
+    else:
+        mocker.patch.object(serialization, "ijson", None)
+
+    fake_session.side_effect = _fake_scene_info_pages(25)
+    stream = cx_client.handle_client("test").scene_info_stream(1, page_size=10)
+    assert fake_session.call_count == 0
+
+    infos = list(stream)
+    assert [s._id for s in infos] == [f"{i:024x}" for i in range(10, 20)]
+    assert fake_session.call_args.kwargs["stream"]
+
+    fake_session.side_effect = _fake_timeline_pages(1)
+    stream = cx_client.handle_client("test").get_timeline_stream(0)
+    first = next(stream)
+    assert isinstance(first, SceneHydrated)
+    assert first.place.ra_rad == 1.0
+    assert [s.text for s in stream] == ["scene 1", "scene 2"]
+
+    with pytest.raises(ValueError):
+        cx_client.get_home_timeline_stream(-1)
+
+
+def test_crawl_home_timeline(cx_client, fake_session):
+    fake_session.side_effect = _fake_timeline_pages(5)
+    scenes = list(cx_client.crawl_home_timeline(max_workers=3))
+
+    assert [s.text for s in scenes] == [f"scene {i}" for i in range(15)]
+    pages = {c.kwargs["params"]["page"] for c in fake_session.call_args_list}
+    assert 5 in pages
+    assert max(pages) <= 5 + 2
+
+
+def test_lazy_timeline(cx_client, fake_session):
+    fake_session.side_effect = _fake_timeline_pages(1)
+    scenes = cx_client.handle_client("test").get_timeline(0, lazy=True)
+    eager = _decode(
+        SceneHydrated, dict(SCENE_HYDRATED_JSON, id=f"{0:024x}", text="scene 0")
+    )
+
+    assert isinstance(scenes[0], SceneHydrated)
+    assert "content" not in scenes[0].__dict__
+    assert scenes[0].place == eager.place
+    assert scenes[0].handle.display_name == "Test Handle"
+    assert scenes[0].astropix is None
+    assert scenes[0] == eager
+    assert scenes[0].to_dict() == eager.to_dict()
+    assert pickle.loads(pickle.dumps(scenes[0])) == eager
+
+    scenes[1].content = None
+    assert scenes[1].content is None
+
+    # Copies are regular scenes
+    assert repr(scenes[0]) == repr(eager)
+    assert repr(scenes[0]).startswith("SceneHydrated(")
+
+    for copied in [
+        dataclasses.replace(scenes[2], text="changed"),
+        copy.copy(scenes[2]),
+        copy.deepcopy(scenes[2]),
+    ]:
+        assert type(copied) is SceneHydrated
+        assert copied.content == scenes[2].content
+
+    assert dataclasses.replace(scenes[2], text="changed").text == "changed"
+    assert to_compact(scenes[2]) == to_compact(
+        _decode(
+            SceneHydrated, dict(SCENE_HYDRATED_JSON, id=f"{2:024x}", text="scene 2")
+        )
+    )
+
+
+def test_json_backends(mocker, fake_session):
+    assert get_json_backend("json").name == "json"
+
+    with pytest.raises(ValueError):
+        get_json_backend("simplejson")
+
+    backends = ["json"]
+    try:
+        import orjson  # noqa: F401
+
+        backends.append("orjson")
+    except ImportError:
+        pass
+
+    for name in backends:
+        client = CxClient(
+            FAKE_CONFIG,
+            oidcc_cache_identifier="wwt_api_client_tests",
+            json_backend=name,
+        )
+        fake_oidcc(client._oidcc, mocker)
+        mocker.patch.object(client._session, "request", fake_session)
+        fake_session.side_effect = _fake_timeline_pages(1)
+
+        scenes = client.handle_client("test").get_timeline(0)
+        assert scenes[0].text == "scene 0"
+
+        fake_session.side_effect = None
+        fake_session.return_value = fake_response(payload={"id": "x", "rel_url": "y"})
+        client.handle_client("test").update(HandleUpdate(display_name="Ünïcode"))
+        kwargs = fake_session.call_args.kwargs
+        assert "json" not in kwargs
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert json.loads(kwargs["data"]) == {"display_name": "Ünïcode"}
+
+
+IMAGE_DISPLAY_JSON = {
+    "id": "0123456789abcdef01234567",
+    "wwt": {
+        "base_degrees_per_tile": 0.1,
+        "bottoms_up": False,
+        "center_x": 10.0,
+        "center_y": -5.0,
+        "file_type": ".png",
+        "offset_x": 0,
+        "offset_y": 0,
+        "projection": "tan",
+        "quad_tree_map": "",
+        "rotation": 0.0,
+        "tile_levels": 4,
+        "width_factor": 2,
+        "thumbnail_url": "https://example.com/thumb.jpg",
+    },
+    "permissions": {"copyright": "Someone", "license": "CC-BY-4.0"},
+    "storage": {"legacy_url_template": "https://example.com/{1}/{2}"},
+}
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_interned_timeline(cx_client, fake_session, lazy):
+    fake_session.side_effect = _fake_timeline_pages(3)
+    interner = Interner()
+    scenes = list(
+        cx_client.crawl_home_timeline(max_workers=2, lazy=lazy, interner=interner)
+    )
+    eager = _decode(
+        SceneHydrated, dict(SCENE_HYDRATED_JSON, id=f"{0:024x}", text="scene 0")
+    )
+
+    assert len(scenes) == 9
+    assert all(s.handle is scenes[0].handle for s in scenes)
+    assert all(s.handle_id is scenes[0].handle_id for s in scenes)
+    assert len(interner) == 1
+    assert scenes[0] == eager
+    assert eager.handle == scenes[0].handle
+
+    with pytest.raises(TypeError):
+        hash(scenes[0].handle)
+
+    assert scenes[0].to_dict() == eager.to_dict()
+
+    # Shared objects are read-only, but copies aren't
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        scenes[0].handle.display_name = "Changed"
+
+    changed = dataclasses.replace(scenes[0].handle, display_name="Changed")
+    assert changed.display_name == "Changed"
+    assert scenes[1].handle.display_name == "Test Handle"
+
+    for copied in [
+        changed,
+        pickle.loads(pickle.dumps(scenes[0].handle)),
+        copy.copy(scenes[0].handle),
+        copy.deepcopy(scenes[0].handle),
+    ]:
+        assert type(copied) is HandleInfo
+        copied.display_name = "Changed again"
+
+    assert scenes[0].handle.display_name == "Test Handle"
+    assert pickle.loads(pickle.dumps(scenes[0])) == scenes[0]
+    assert to_compact(scenes[0].handle).display_name == "Test Handle"
+    assert to_compact(scenes[0]) == to_compact(eager)
+
+    # Different contents are never merged
+    other = dict(SCENE_HYDRATED_JSON["handle"], display_name="Other")
+    assert _decode(HandleInfo, other, interner=interner).display_name == "Other"
+    assert len(interner) == 2
+
+    # ... even if their hashes collide
+    images = [
+        dict(IMAGE_DISPLAY_JSON, wwt=dict(IMAGE_DISPLAY_JSON["wwt"], rotation=r))
+        for r in [-1.0, -2.0]
+    ]
+    assert hash(-1.0) == hash(-2.0)
+    decoded = [_decode(ImageDisplayInfo, d, interner=interner) for d in images]
+    assert [d.wwt.rotation for d in decoded] == [-1.0, -2.0]
+
+
+def test_read_only_copies_keep_credits(valid_permissions_data):
+    data = dict(valid_permissions_data, credits="<b>x</b> <script>y</script>")
+    shared = _make_read_only(_decode(ImageContentPermissions, data))
+
+    for copied in [
+        copy.copy(shared),
+        copy.deepcopy(shared),
+        pickle.loads(pickle.dumps(shared)),
+    ]:
+        assert type(copied) is ImageContentPermissions
+        assert copied.credits == data["credits"]
+        assert copied == shared
+
+
+def test_interned_images():
+    interner = Interner()
+    content = {"background": IMAGE_DISPLAY_JSON, "image_layers": []}
+    first = _decode(SceneContentHydrated, content, interner=interner)
+    second = _decode(SceneContentHydrated, content, interner=interner)
+    plain = _decode(SceneContentHydrated, content)
+
+    assert first.background is second.background
+    assert first.background == plain.background
+    assert first.background is not plain.background
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.background.wwt.rotation = 1.0
+
+    interner.clear()
+    assert len(interner) == 0
+    assert _decode(SceneContentHydrated, content, interner=interner) == first
+
+
+def test_crawl_handle_timeline_max_pages(cx_client, fake_session):
+    fake_session.side_effect = _fake_timeline_pages(5)
+    hc = cx_client.handle_client("test")
+    scenes = list(hc.crawl_timeline(max_workers=2, max_pages=2))
+
+    assert len(scenes) == 6
+    assert fake_session.call_count == 2
+    assert fake_session.call_args.args[1] == FAKE_API_URL + "/handle/test/timeline"
+
+
+IMAGE_SUMMARY_JSON = {
+    "_id": "0123456789abcdef01234567",
+    "handle_id": "89abcdef0123456789abcdef",
+    "creation_date": "2023-03-28T16:53:18.364Z",
+    "note": "An image",
+    "storage": {"legacy_url_template": "http://example.com/image.png"},
+}
+
+
+def _fake_find_by_legacy_url(http_method, url, data=None, **kwargs):
+    if json.loads(data)["wwt_legacy_url"] == "http://example.com/image.png":
+        return fake_response(payload={"results": [IMAGE_SUMMARY_JSON]})
+
+    return fake_response(payload={"results": []})
+
+
+def test_find_images_by_wwt_urls(cx_client, fake_session):
+    fake_session.side_effect = _fake_find_by_legacy_url
+    urls = [
+        "http://example.com/image.png",
+        " HTTP://Example.COM/image.png",
+        "http://example.com/missing.png",
+    ]
+
+    results = cx_client.find_images_by_wwt_urls(urls)
+    assert results[urls[0]][0].id == IMAGE_SUMMARY_JSON["_id"]
+    assert results[urls[1]][0].id == IMAGE_SUMMARY_JSON["_id"]
+    assert results[urls[2]] == []
+    assert fake_session.call_count == 2
+
+    # Both hits and misses are cached
+    results = cx_client.find_images_by_wwt_urls(urls)
+    assert results[urls[2]] == []
+    assert fake_session.call_count == 2
+
+
+def test_find_images_by_wwt_urls_partial_failure(cx_client, fake_session):
+    def fake_request(http_method, url, data=None, **kwargs):
+        if json.loads(data)["wwt_legacy_url"] == "http://example.com/bad.png":
+            return fake_response(400)
+
+        return _fake_find_by_legacy_url(http_method, url, data=data, **kwargs)
+
+    fake_session.side_effect = fake_request
+    urls = [
+        "http://example.com/image.png",
+        "http://example.com/bad.png",
+        "http://example.com/missing.png",
+    ]
+
+    with pytest.raises(requests.HTTPError):
+        cx_client.find_images_by_wwt_urls(urls)
+
+    assert fake_session.call_count == 3
+
+    # The lookups that succeeded were kept, so only the failed one is repeated
+    fake_session.side_effect = _fake_find_by_legacy_url
+    results = cx_client.find_images_by_wwt_urls(urls)
+    assert results[urls[0]][0].id == IMAGE_SUMMARY_JSON["_id"]
+    assert results[urls[1]] == []
+    assert results[urls[2]] == []
+    assert fake_session.call_count == 4
+
+
+def test_find_images_by_wwt_urls_disk(fake_session, mocker, tmp_path):
+    fake_session.side_effect = _fake_find_by_legacy_url
+    path = str(tmp_path / "wwturls.sqlite")
+
+    for _ in range(2):
+        client = CxClient(
+            FAKE_CONFIG,
+            oidcc_cache_identifier="wwt_api_client_tests",
+            wwt_url_cache_path=path,
+        )
+        fake_oidcc(client._oidcc, mocker)
+        mocker.patch.object(client._session, "request", fake_session)
+        results = client.find_images_by_wwt_urls(["http://example.com/image.png"])
+        assert results["http://example.com/image.png"][0].note == "An image"
+
+    assert fake_session.call_count == 1
+
+
+def test_find_images_by_wwt_urls_misses(cx_client, fake_session, mocker):
+    fake_session.side_effect = _fake_find_by_legacy_url
+    urls = ["http://example.com/image.png", "http://example.com/missing.png"]
+    cx_client.find_images_by_wwt_urls(urls)
+    assert fake_session.call_count == 2
+
+    # Misses are forgotten much sooner than hits
+    mocker.patch("time.time", return_value=time.time() + 120)
+    cx_client.find_images_by_wwt_urls(urls)
+    assert fake_session.call_count == 3
+
+    # Creating an image forgets the miss for its URL right away
+    fake_session.side_effect = None
+    fake_session.return_value = fake_response(payload={"id": "new", "rel_url": "x"})
+    cx_client.handle_client("test").add_image_from_set(
+        _make_imageset(urls[1]), "Public domain", "CC-PDDC"
+    )
+    assert cx_client._get_cached_wwt_url(urls[1]) is None
+
+
+HANDLE_INFO_JSON = {"handle": "test", "display_name": "Test Handle"}
+
+
+def test_http_cache_revalidates(cx_client, fake_session):
+    hc = cx_client.handle_client("test")
+    fake_session.return_value = fake_response(
+        payload=HANDLE_INFO_JSON, headers={"ETag": '"v1"'}
+    )
+    info = hc.get()
+    assert info.display_name == "Test Handle"
+
+    fake_session.return_value = fake_response(304)
+    assert hc.get() == info
+    assert fake_session.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+    stats = cx_client.http_cache_stats
+    assert stats.revalidated == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+
+    # Updates invalidate the cached response
+    fake_session.return_value = fake_response()
+    hc.update(HandleUpdate(display_name="New Name"))
+
+    fake_session.return_value = fake_response(
+        payload=dict(HANDLE_INFO_JSON, display_name="New Name")
+    )
+    assert hc.get().display_name == "New Name"
+    assert "If-None-Match" not in fake_session.call_args.kwargs["headers"]
+
+
+def test_http_cache_ttl(cx_client, fake_session, mocker):
+    # By default, responses without validators are never reused
+    for _ in range(2):
+        assert cx_client.get_builtin_backgrounds() == []
+
+    assert fake_session.call_count == 2
+    assert cx_client.http_cache_stats.entries == 0
+
+    now = time.time()
+    mocker.patch("time.time", return_value=now)
+    client = CxClient(
+        FAKE_CONFIG, oidcc_cache_identifier="wwt_api_client_tests", http_cache_ttl=60
+    )
+    fake_oidcc(client._oidcc, mocker)
+    mocker.patch.object(client._session, "request", fake_session)
+    fake_session.reset_mock()
+
+    for _ in range(3):
+        assert client.get_builtin_backgrounds() == []
+
+    assert fake_session.call_count == 1
+    assert client.http_cache_stats.fresh_hits == 2
+
+    time.time.return_value = now + 61
+    assert client.get_builtin_backgrounds() == []
+    assert fake_session.call_count == 2
+
+
+def test_http_cache_disk(fake_session, mocker, tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    fake_session.return_value = fake_response(
+        payload={"handle": "test", "view_dashboard": True},
+        headers={"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+    )
+
+    for _ in range(2):
+        client = CxClient(
+            FAKE_CONFIG,
+            oidcc_cache_identifier="wwt_api_client_tests",
+            http_cache_path=path,
+        )
+        fake_oidcc(client._oidcc, mocker)
+        mocker.patch.object(client._session, "request", fake_session)
+        assert client.handle_client("test").permissions().view_dashboard
+        fake_session.return_value = fake_response(304)
+
+    headers = fake_session.call_args.kwargs["headers"]
+    assert headers["If-Modified-Since"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert client.http_cache_stats.revalidated == 1
+
+
+def test_metadata_cache(fake_session, mocker):
+    now = time.time()
+    mocker.patch("time.time", return_value=now)
+    client = CxClient(
+        FAKE_CONFIG,
+        oidcc_cache_identifier="wwt_api_client_tests",
+        http_cache_size=0,
+        metadata_cache=MetadataCacheConfig(handle_ttl=None, scene_ttl=10.0),
+    )
+    fake_oidcc(client._oidcc, mocker)
+    mocker.patch.object(client._session, "request", fake_session)
+
+    hc = client.handle_client("test")
+    fake_session.return_value = fake_response(payload=HANDLE_INFO_JSON)
+    info = hc.get()
+    assert hc.get() is info
+    assert fake_session.call_count == 1
+
+    # Cached objects are shared, so they can't be modified
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        info.display_name = "Changed"
+
+    # Our own updates are seen immediately
+    fake_session.return_value = fake_response()
+    hc.update(HandleUpdate(display_name="New Name"))
+    fake_session.return_value = fake_response(
+        payload=dict(HANDLE_INFO_JSON, display_name="New Name")
+    )
+    assert hc.get().display_name == "New Name"
+
+    stats = client.metadata_cache_stats
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.entries == 1
+
+    # Scenes expire after their own TTL
+    sc = client.scene_client("s1")
+    scene_json = dict(
+        SCENE_HYDRATED_JSON,
+        content={"image_layers": [{"image": IMAGE_DISPLAY_JSON, "opacity": 1.0}]},
+    )
+    fake_session.return_value = fake_response(payload=scene_json)
+    scene = sc.get()
+    assert sc.get() is scene
+    n_calls = fake_session.call_count
+
+    time.time.return_value = now + 11
+    assert sc.get() == scene
+    assert fake_session.call_count == n_calls + 1
+
+    # Lists and the objects inside them are read-only too
+    scene = sc.get()
+    layers = scene.content.image_layers
+
+    with pytest.raises(TypeError):
+        layers.append(layers[0])
+
+    with pytest.raises(TypeError):
+        layers[0] = None
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        layers[0].opacity = 0.5
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        layers[0].image.wwt.rotation = 1.0
+
+    assert scene == _decode(SceneHydrated, scene_json)
+    assert to_compact(scene) == to_compact(_decode(SceneHydrated, scene_json))
+
+    copied = copy.deepcopy(scene)
+    copied.content.image_layers.append(copied.content.image_layers[0])
+    copied.content.image_layers[0].opacity = 0.5
+    assert type(copied.content.image_layers) is list
+    assert sc.get().content.image_layers[0].opacity == 1.0
+    assert len(sc.get().content.image_layers) == 1
+
+
+def test_coalesce_requests(cx_client, fake_session):
+    release = threading.Event()
+
+    def slow_request(http_method, url, **kwargs):
+        release.wait(10)
+        return fake_response(payload={"results": [IMAGE_SUMMARY_JSON]})
+
+    fake_session.side_effect = slow_request
+    n_threads = 8
+    results = []
+
+    def worker():
+        results.append(cx_client.get_builtin_backgrounds())
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+
+    for t in threads:
+        t.start()
+
+    deadline = time.time() + 10
+    while cx_client.coalesced_requests < n_threads - 1 and time.time() < deadline:
+        time.sleep(0.01)
+
+    release.set()
+
+    for t in threads:
+        t.join()
+
+    assert fake_session.call_count == 1
+    assert cx_client.coalesced_requests == n_threads - 1
+    assert len(results) == n_threads
+
+    # Each caller still gets its own decoded objects
+    assert results[0] == results[1]
+    assert results[0][0] is not results[1][0]
+
+
+def test_coalesce_requires_same_credentials(cx_client, fake_session):
+    release = threading.Event()
+
+    def slow_request(http_method, url, headers=None, **kwargs):
+        release.wait(10)
+        return fake_response(payload={"tag": headers.get("X-Tag")})
+
+    fake_session.side_effect = slow_request
+    calls = [
+        dict(scopes=["profile", "offline_access"]),
+        dict(scopes=["offline_access", "profile"]),
+        dict(scopes=["profile"]),
+        dict(headers={"X-Tag": "a"}),
+        dict(headers={"x-tag": "a"}),
+        dict(headers={"X-Tag": "b"}),
+    ]
+    results = [None] * len(calls)
+
+    def worker(i):
+        results[i] = cx_client._send_and_parse("/thing", http_method="GET", **calls[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(calls))]
+
+    for t in threads:
+        t.start()
+
+    deadline = time.time() + 10
+    while (
+        fake_session.call_count < 4 or cx_client.coalesced_requests < 2
+    ) and time.time() < deadline:
+        time.sleep(0.01)
+
+    release.set()
+
+    for t in threads:
+        t.join()
+
+    # Only calls with the same scopes and headers, up to ordering and case, are
+    # merged
+    assert fake_session.call_count == 4
+    assert cx_client.coalesced_requests == 2
+    assert [r["tag"] for r in results] == [None, None, None, "a", "a", "b"]
+
+
+def _fake_wtml_response(name, etag):
+    folder = Folder()
+    folder.children = [_make_imageset(f"http://example.com/{name}.png")]
+    resp = fake_response(headers=None if etag is None else {"ETag": etag})
+    resp.text = folder.to_xml_string()
+    return resp
+
+
+def test_wtml_cache(cx_client, fake_session, mocker):
+    now = time.time()
+    mocker.patch("time.time", return_value=now)
+    ic = cx_client.image_client("i1")
+    fake_session.return_value = _fake_wtml_response("first", '"v1"')
+    iset = ic.imageset_object()
+    assert iset.name == "first.png"
+
+    # Recently fetched WTML is reused without contacting the server, but each
+    # call gets its own objects
+    fake_session.reset_mock()
+    folder = ic.imageset_folder()
+    assert folder.children[0] is not iset
+    assert folder.children[0].name == "first.png"
+    folder.children.append(Folder())
+    iset.name = "changed.png"
+    assert len(ic.imageset_folder().children) == 1
+    assert ic.imageset_object().name == "first.png"
+    assert fake_session.call_count == 0
+    assert cx_client.http_cache_stats.fresh_hits == 3
+
+    # Once the TTL expires, it is revalidated, but not parsed again
+    time.time.return_value = now + 61
+    fake_session.return_value = fake_response(304)
+    from_text = mocker.spy(Folder, "from_text")
+    assert ic.imageset_object().name == "first.png"
+    assert from_text.call_count == 0
+
+    args, kwargs = fake_session.call_args
+    assert args == ("GET", FAKE_API_URL + "/image/i1/img.wtml")
+    assert kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert cx_client.http_cache_stats.revalidated == 1
+
+    # Updating the image discards its cached WTML
+    fake_session.return_value = fake_response()
+    ic.update(ImageUpdate(note="new"))
+    fake_session.return_value = _fake_wtml_response("second", '"v2"')
+    assert ic.imageset_object().name == "second.png"
+    assert "If-None-Match" not in fake_session.call_args.kwargs["headers"]
+
+
+def test_wtml_cache_without_validators(cx_client, fake_session, mocker):
+    # The WTML TTL applies even though other responses without validators
+    # aren't cached by default
+    fake_session.return_value = _fake_wtml_response("first", None)
+    sc = cx_client.scene_client("s1")
+    sc.place_folder()
+    sc.place_folder()
+    assert fake_session.call_count == 1
+
+    # With a zero TTL, every call goes to the server, but unchanged WTML still
+    # isn't parsed again
+    cx_client._wtml_cache_ttl = 0
+    from_text = mocker.spy(Folder, "from_text")
+    sc.place_folder()
+    sc.place_folder()
+    assert fake_session.call_count == 3
+    assert from_text.call_count == 0
+
+
+def _mirror_api(images, scenes):
+    """
+    Make a fake request function that serves paginated image info and timeline
+    results from the given lists, which should be ordered newest-first.
+    """
+
+    def fake_request(http_method, url, params=None, **kwargs):
+        page = params["page"]
+
+        if url.endswith("/imageinfo"):
+            size = params["pagesize"]
+            return fake_response(
+                payload={
+                    "total_count": len(images),
+                    "results": images[page * size : (page + 1) * size],
+                }
+            )
+
+        assert url.endswith("/timeline")
+        return fake_response(payload={"results": scenes[page * 8 : (page + 1) * 8]})
+
+    return fake_request
+
+
+def _mirror_items(start, stop):
+    images = []
+    scenes = []
+
+    for i in reversed(range(start, stop)):
+        date = f"2023-03-28T16:53:{i:02d}.000Z"
+        ident = f"{i:024x}"
+        images.append(dict(IMAGE_SUMMARY_JSON, _id=ident, creation_date=date))
+        scenes.append(dict(SCENE_HYDRATED_JSON, id=ident, creation_date=date))
+
+    return images, scenes
+
+
+def test_mirror_sync(cx_client, fake_session, tmp_path):
+    images, scenes = _mirror_items(0, 25)
+    fake_session.side_effect = _mirror_api(images, scenes)
+    mirror = HandleMirror(
+        cx_client.handle_client("test"), str(tmp_path / "mirror.sqlite"), page_size=10
+    )
+    kinds = ["image_info", "timeline"]
+
+    stats = mirror.sync(kinds)
+    assert stats.pages == 3 + 5  # the timeline ends with an empty page
+    assert stats.stored == 50
+    assert mirror.count("image_info") == 25
+    assert [i.id for i in mirror.iter_image_info()] == [i["_id"] for i in images]
+    assert mirror.get_timeline_scene(scenes[3]["id"]).creation_date == (
+        scenes[3]["creation_date"]
+    )
+    assert mirror.get_image_info("nope") is None
+
+    # Resyncing an unchanged handle costs one page per kind
+    assert mirror.sync(kinds) == MirrorSyncStats(pages=2, stored=0, removed=0)
+
+    # New items are picked up; an incremental sync doesn't notice deletions
+    new_images, new_scenes = _mirror_items(25, 27)
+    images[:] = new_images + images[:-1]
+    scenes[:] = new_scenes + scenes
+    assert mirror.sync(kinds) == MirrorSyncStats(pages=2, stored=4, removed=0)
+    assert mirror.count("image_info") == 27
+    assert next(mirror.iter_timeline(lazy=True)).id == new_scenes[0]["id"]
+
+    # But a full sync does
+    stats = mirror.sync(["image_info"], full=True)
+    assert stats.removed == 1
+    assert mirror.count("image_info") == 26
+
+    with pytest.raises(ValueError):
+        mirror.sync(["images"])
+
+
+def test_mirror_resumes_interrupted_sync(cx_client, fake_session, tmp_path):
+    images, scenes = _mirror_items(0, 25)
+    serve = _mirror_api(images, scenes)
+
+    def flaky_request(http_method, url, params=None, **kwargs):
+        if params["page"] == 1:
+            raise requests.ConnectionError("connection reset")
+        return serve(http_method, url, params=params, **kwargs)
+
+    cx_client._retry.max_retries = 0
+    fake_session.side_effect = flaky_request
+    mirror = HandleMirror(
+        cx_client.handle_client("test"), str(tmp_path / "mirror.sqlite"), page_size=10
+    )
+
+    with pytest.raises(requests.ConnectionError):
+        mirror.sync(["image_info"])
+
+    assert mirror.count("image_info") == 10
+
+    fake_session.side_effect = serve
+    assert mirror.sync(["image_info"]).pages == 3
+    assert mirror.count("image_info") == 25
+
+
+def test_mirror_interrupted_incremental_sync(cx_client, fake_session, tmp_path):
+    images, scenes = _mirror_items(0, 25)
+    serve = _mirror_api(images, scenes)
+    fake_session.side_effect = serve
+    mirror = HandleMirror(
+        cx_client.handle_client("test"), str(tmp_path / "mirror.sqlite"), page_size=10
+    )
+    mirror.sync(["image_info"])
+
+    def flaky_request(http_method, url, params=None, **kwargs):
+        if params["page"] == 1:
+            raise requests.ConnectionError("connection reset")
+        return serve(http_method, url, params=params, **kwargs)
+
+    images[:0] = _mirror_items(25, 40)[0]
+    cx_client._retry.max_retries = 0
+    fake_session.side_effect = flaky_request
+
+    with pytest.raises(requests.ConnectionError):
+        mirror.sync(["image_info"])
+
+    assert mirror.count("image_info") == 35
+
+    # The items stored before the interruption mustn't end the next sync early
+    fake_session.side_effect = serve
+    assert mirror.sync(["image_info"]).pages == 4
+    assert mirror.count("image_info") == 40
+
+
+def test_mirror_sync_items_shift(cx_client, fake_session, tmp_path):
+    images, scenes = _mirror_items(0, 25)
+    serve = _mirror_api(images, scenes)
+    fake_session.side_effect = serve
+    mirror = HandleMirror(
+        cx_client.handle_client("test"), str(tmp_path / "mirror.sqlite"), page_size=10
+    )
+    mirror.sync(["image_info"])
+    images[:0] = _mirror_items(25, 40)[0]
+
+    def shifting_request(http_method, url, params=None, **kwargs):
+        resp = serve(http_method, url, params=params, **kwargs)
+
+        # Items created while we're walking push the ones that we've already
+        # seen onto the next page
+        if params["page"] == 0:
+            images[:0] = _mirror_items(40, 45)[0]
+
+        return resp
+
+    fake_session.side_effect = shifting_request
+    assert mirror.sync(["image_info"]).pages == 3
+    assert mirror.count("image_info") == 40
+
+    fake_session.side_effect = serve
+    mirror.sync(["image_info"])
+    assert mirror.count("image_info") == 45
+
+
+def _make_imageset(url, **kwargs):
+    iset = ImageSet(url=url, name=url.rsplit("/", 1)[-1], **kwargs)
+    iset.credits = "Credits & stuff"
+    return iset
+
+
+def test_add_images_from_folder(cx_client, fake_session):
+    posted = []
+
+    def fake_request(http_method, url, data=None, **kwargs):
+        if url.endswith("/find-by-legacy-url"):
+            return _fake_find_by_legacy_url(http_method, url, data=data)
+
+        assert url == FAKE_API_URL + "/handle/test/image"
+        posted.append(json.loads(data))
+        return fake_response(payload={"id": f"new{len(posted)}", "rel_url": "x"})
+
+    fake_session.side_effect = fake_request
+
+    folder = Folder()
+    subfolder = Folder()
+    place = Place()
+    place.foreground_image_set = _make_imageset("http://example.com/new1.png")
+    subfolder.children = [
+        _make_imageset("http://example.com/new2.png"),
+        _make_imageset(
+            "http://example.com/planet.png", data_set_type=DataSetType.PLANET
+        ),
+    ]
+    folder.children = [
+        _make_imageset("http://example.com/image.png"),
+        place,
+        subfolder,
+        _make_imageset("http://example.com/new1.png"),
+    ]
+
+    progress = []
+    results = cx_client.handle_client("test").add_images_from_folder(
+        folder, "Public domain", "CC-PDDC", max_workers=2, progress=progress.append
+    )
+
+    assert list(results.keys()) == [
+        "http://example.com/image.png",
+        "http://example.com/new1.png",
+        "http://example.com/new2.png",
+        "http://example.com/planet.png",
+    ]
+    assert results["http://example.com/image.png"] == IMAGE_SUMMARY_JSON["_id"]
+    assert {
+        results["http://example.com/new1.png"],
+        results["http://example.com/new2.png"],
+    } == {"new1", "new2"}
+    assert isinstance(results["http://example.com/planet.png"], ValueError)
+
+    assert len(posted) == 2
+    assert posted[0]["permissions"]["credits"] == "Credits &amp; stuff"
+
+    final = progress[-1]
+    assert final.total == final.completed == 4
+    assert final.skipped == 1
+    assert final.failed == 1
+
+
+def test_add_images_from_folder_lookup_fails(cx_client, fake_session):
+    failures = ["http://example.com/new.png"]
+
+    def fake_request(http_method, url, data=None, **kwargs):
+        if url.endswith("/find-by-legacy-url"):
+            if json.loads(data)["wwt_legacy_url"] in failures:
+                failures.pop()
+                return fake_response(400)
+
+            return _fake_find_by_legacy_url(http_method, url, data=data)
+
+        return fake_response(payload={"id": "new", "rel_url": "x"})
+
+    fake_session.side_effect = fake_request
+    folder = Folder()
+    folder.children = [
+        _make_imageset("http://example.com/image.png"),
+        _make_imageset("http://example.com/new.png"),
+    ]
+
+    # The batched existence check fails, so each imageset is checked separately
+    progress = []
+    results = cx_client.handle_client("test").add_images_from_folder(
+        folder, "Public domain", "CC-PDDC", progress=progress.append
+    )
+
+    assert results == {
+        "http://example.com/image.png": IMAGE_SUMMARY_JSON["_id"],
+        "http://example.com/new.png": "new",
+    }
+    assert progress[-1].skipped == 1
+    assert progress[-1].failed == 0
+
+
+def test_add_scenes_from_places(cx_client, fake_session):
+    posted = []
+
+    def fake_request(http_method, url, data=None, **kwargs):
+        if url.endswith("/find-by-legacy-url"):
+            return _fake_find_by_legacy_url(http_method, url, data=data)
+
+        assert url == FAKE_API_URL + "/handle/test/scene"
+        posted.append(json.loads(data))
+        return fake_response(payload={"id": f"scene{len(posted)}", "rel_url": "x"})
+
+    fake_session.side_effect = fake_request
+
+    places = []
+    for i, url in enumerate(
+        [
+            "http://example.com/image.png",
+            "http://example.com/missing.png",
+            "http://example.com/image.png",
+        ]
+    ):
+        place = Place(name=f"place {i}", ra_hr=1.0, dec_deg=2.0, zoom_level=6.0)
+        place.foreground_image_set = _make_imageset(url)
+        places.append(place)
+
+    folder = Folder()
+    folder.children = places
+    results = cx_client.handle_client("test").add_scenes_from_places(
+        folder, publish=False, max_workers=2
+    )
+
+    assert isinstance(results[1], Exception)
+    assert {results[0], results[2]} == {"scene1", "scene2"}
+    assert len(posted) == 2
+    assert all(not p["published"] for p in posted)
+    layers = posted[0]["content"]["image_layers"]
+    assert layers == [{"image_id": IMAGE_SUMMARY_JSON["_id"], "opacity": 1.0}]
+
+    # One lookup per distinct URL, made up-front
+    lookups = [c for c in fake_session.call_args_list if "legacy" in c.args[1]]
+    assert len(lookups) == 2
+
+
+def test_add_scenes_from_places_lookup_fails(cx_client, fake_session):
+    def fake_request(http_method, url, data=None, **kwargs):
+        if url.endswith("/find-by-legacy-url"):
+            if json.loads(data)["wwt_legacy_url"] == "http://example.com/broken.png":
+                return fake_response(400)
+
+            return _fake_find_by_legacy_url(http_method, url, data=data)
+
+        return fake_response(payload={"id": "scene", "rel_url": "x"})
+
+    fake_session.side_effect = fake_request
+    places = []
+
+    for url in ["image.png", "broken.png", "image.png"]:
+        place = Place(name=url, ra_hr=1.0, dec_deg=2.0, zoom_level=6.0)
+        place.foreground_image_set = _make_imageset("http://example.com/" + url)
+        places.append(place)
+
+    # The batched lookup fails, so each place's imagesets are looked up
+    # separately, and only the place with the failing lookup fails
+    progress = []
+    results = cx_client.handle_client("test").add_scenes_from_places(
+        places, progress=progress.append
+    )
+
+    assert results[0] == results[2] == "scene"
+    assert isinstance(results[1], requests.HTTPError)
+    assert progress[-1].completed == 3
+    assert progress[-1].failed == 1
+
+
+def test_add_scenes_from_places_malformed(cx_client, fake_session, mocker):
+    def fake_request(http_method, url, data=None, **kwargs):
+        if url.endswith("/find-by-legacy-url"):
+            return _fake_find_by_legacy_url(http_method, url, data=data)
+
+        return fake_response(payload={"id": "scene", "rel_url": "x"})
+
+    fake_session.side_effect = fake_request
+    places = []
+
+    for name in ["good", "bad", "good"]:
+        place = Place(name=name, ra_hr=1.0, dec_deg=2.0, zoom_level=6.0)
+        place.foreground_image_set = _make_imageset("http://example.com/image.png")
+        places.append(place)
+
+    real_request_from_place = handles._scene_request_from_place
+
+    def fake_request_from_place(place, image_ids, publish):
+        if place.name == "bad":
+            raise TypeError("malformed place")
+
+        return real_request_from_place(place, image_ids, publish)
+
+    mocker.patch.object(
+        handles, "_scene_request_from_place", side_effect=fake_request_from_place
+    )
+
+    # A place that can't be converted only fails its own item
+    progress = []
+    results = cx_client.handle_client("test").add_scenes_from_places(
+        places, progress=progress.append
+    )
+
+    assert results[0] == results[2] == "scene"
+    assert isinstance(results[1], TypeError)
+    assert progress[-1].failed == 1
+
+
+class _JsonHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"error": False, "results": []}).encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_api_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_reuses_connections(local_api_url, mocker):
+    config = ClientConfig(
+        id_provider_url=FAKE_CONFIG.id_provider_url,
+        client_id="testing",
+        api_url=local_api_url,
+        transport=TransportConfig(max_connections_per_host=2),
+    )
+    client = CxClient(
+        config, oidcc_cache_identifier="wwt_api_client_tests", http_cache_size=0
+    )
+    fake_oidcc(client._oidcc, mocker)
+
+    for _ in range(5):
+        assert client.get_builtin_backgrounds() == []
+
+    stats = client.pool_stats
+    assert stats.opened == 1
+    assert stats.reused == 4
+    assert stats.discarded == 0
+
+
+def test_pool_discards_overflow(local_api_url, mocker):
+    transport = TransportConfig(max_connections_per_host=1)
+    config = ClientConfig(
+        id_provider_url=FAKE_CONFIG.id_provider_url,
+        client_id="testing",
+        api_url=local_api_url,
+    )
+    client = CxClient(
+        config, oidcc_cache_identifier="wwt_api_client_tests", transport=transport
+    )
+    fake_oidcc(client._oidcc, mocker)
+
+    # Hold one connection checked out while making another request, forcing
+    # the pool to open a second connection that it has no room to keep.
+    resp = client._session.get(local_api_url + "/held", stream=True)
+    client.get_builtin_backgrounds()
+    resp.close()
+
+    stats = client.pool_stats
+    assert stats.opened == 2
+    assert stats.discarded == 1
+
+
+# Async client tests
+
+
+@pytest.fixture
+def async_client_factory(mocker):
+    httpx = pytest.importorskip("httpx")
+    from ..constellations.aio import AsyncCxClient
+
+    def factory(handler):
+        client = AsyncCxClient(
+            FAKE_CONFIG, oidcc_cache_identifier="wwt_api_client_tests"
+        )
+        fake_oidcc(client._oidcc, mocker)
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    return factory
+
+
+def test_async_timeline(async_client_factory):
+    import httpx
+
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(
+            200, json={"error": False, "results": [SCENE_HYDRATED_JSON]}
+        )
+
+    async def go():
+        async with async_client_factory(handler) as client:
+            hc = client.handle_client("test")
+            return await asyncio.gather(*[hc.get_timeline(i) for i in range(5)])
+
+    pages = asyncio.run(go())
+    assert len(pages) == 5
+    assert pages[0][0].handle.display_name == "Test Handle"
+    assert {r.url.params["page"] for r in seen} == {"0", "1", "2", "3", "4"}
+    assert all(r.url.path == "/handle/test/timeline" for r in seen)
+    assert all(r.headers["Authorization"] == "Bearer fake_access_token" for r in seen)
+
+
+def test_async_streaming(async_client_factory):
+    import httpx
+
+    def handler(request):
+        scenes = [
+            dict(SCENE_HYDRATED_JSON, id=f"{i:024x}", text=f"scene {i}")
+            for i in range(3)
+        ]
+        body = json.dumps({"error": False, "results": scenes}).encode("utf8")
+
+        # Deliver the response in small pieces
+        async def chunks():
+            for i in range(0, len(body), 100):
+                yield body[i : i + 100]
+
+        return httpx.Response(200, content=chunks())
+
+    async def go():
+        async with async_client_factory(handler) as client:
+            stream = client.handle_client("test").get_timeline_stream(0, lazy=True)
+            return [s async for s in stream]
+
+    scenes = asyncio.run(go())
+    assert [s.text for s in scenes] == ["scene 0", "scene 1", "scene 2"]
+    assert scenes[2].handle.display_name == "Test Handle"
+
+
+def test_async_401_refresh(async_client_factory):
+    import httpx
+
+    def handler(request):
+        if request.headers["Authorization"] == "Bearer fake_access_token":
+            return httpx.Response(401, text="nope")
+
+        return httpx.Response(
+            200, json={"error": False, "handle": "test", "edit": True, "id": "x"}
+        )
+
+    async def go():
+        async with async_client_factory(handler) as client:
+            perms = await client.scene_client("x").permissions()
+            return perms, client.token_stats
+
+    perms, stats = asyncio.run(go())
+    assert perms.edit
+    assert stats.forced_refreshes == 1
@@ -8,7 +8,7 @@
 import pytest
 from xml.etree import ElementTree
 
-from .. import Client
+from .. import Client, _normalize_request_url
 
 
 INF = float("inf")
@@ -339,3 +339,30 @@ def test_tileimage_valid_settings(tileimage, attrs, expected):
     found_text = tileimage.send()
     found = ElementTree.fromstring(found_text)
     assert_xml_trees_equal(expected, found, TILEIMAGE_CARE_TEXT_TAGS)
+
+
+def test_result_cache(tmp_path, mocker):
+    client = Client(cache_path=str(tmp_path / "results.sqlite"))
+    resp = mocker.Mock(ok=True, text="<Folder />")
+    send = mocker.patch.object(client.session, "send", return_value=resp)
+
+    for _ in range(2):
+        req = client.tile_image("http://localhost/image.jpg", credits="Me")
+        assert req.send() == "<Folder />"
+
+    assert send.call_count == 1
+    assert client.cache.stats().hits == 1
+
+    resp.text = "<Folder Name='new' />"
+    assert req.send(refresh=True) == "<Folder Name='new' />"
+    assert req.send() == "<Folder Name='new' />"
+    assert send.call_count == 2
+
+    # Login requests are never cached
+    client.login().send()
+    client.login().send()
+    assert send.call_count == 4
+
+    assert _normalize_request_url(
+        "HTTP://Example.COM/x?b=2&a=1"
+    ) == _normalize_request_url("http://example.com/x?a=1&b=2")